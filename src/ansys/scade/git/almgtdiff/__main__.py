@@ -0,0 +1,71 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Entry point."""
+
+from argparse import ArgumentParser
+import json
+import sys
+
+from lxml import etree as et
+
+from ansys.scade.git import __version__
+from ansys.scade.git.almgtdiff.almgtdiff import ADDED, CHANGED, diff
+
+# prefix of the changes in text mode
+prefixes = {ADDED: '+', CHANGED: '~'}
+
+
+def main():
+    """Entry point."""
+    parser = ArgumentParser(description='semantic diff for almgt files %s' % __version__)
+    parser.add_argument('old', metavar='<old>', help='initial file')
+    parser.add_argument('new', metavar='<new>', help='final file')
+    parser.add_argument('-j', '--json', action='store_true', help='json output')
+    options = parser.parse_args()
+
+    keys = 'change', 'id', 'pathName', 'requirement', 'old', 'new'
+    count = 0
+    try:
+        if options.json:
+            # stream the array, the changes are not stored
+            sys.stdout.write('[')
+        for change in diff(options.old, options.new):
+            if options.json:
+                sys.stdout.write(',\n' if count else '\n')
+                sys.stdout.write('  ' + json.dumps(dict(zip(keys, change))))
+            else:
+                kind, _, path, req, old, new = change
+                trace_type = '%s -> %s' % (old, new) if kind == CHANGED else (new or old)
+                print('%s %s %s %s' % (prefixes.get(kind, '-'), path, req, trace_type))
+            count += 1
+        if options.json:
+            sys.stdout.write('\n]\n' if count else ']\n')
+    except (OSError, et.XMLSyntaxError) as e:
+        print(e, file=sys.stderr)
+        exit(2)
+    exit(1 if count else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Semantic diff for SCADE ALMGW not exported traceability files (ALMGT)."""
+
+from itertools import zip_longest
+from typing import Dict, Iterator, Optional, Tuple
+
+from ansys.scade.git.almgtmerge.almgtmerge3 import GTFile
+
+# kinds of changes
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# change: kind, object id, object path, requirement id, old trace type, new trace type
+Change = Tuple[str, str, str, str, Optional[str], Optional[str]]
+# model element: object id, object path, trace type for each requirement id
+Links = Tuple[str, str, Dict[str, str]]
+
+
+def files_identical(old: str, new: str, bufsize: int = 1 << 20) -> bool:
+    """
+    Return whether two files have the same content.
+
+    The comparison stops at the first difference.
+
+    Parameters
+    ----------
+    old : str
+        Path of the first file.
+    new : str
+        Path of the second file.
+    bufsize : int
+        Size of the chunks to compare.
+    """
+    with open(old, 'rb') as fold, open(new, 'rb') as fnew:
+        while True:
+            bold = fold.read(bufsize)
+            bnew = fnew.read(bufsize)
+            if bold != bnew:
+                return False
+            if not bold:
+                return True
+
+
+def iter_links(filename: str) -> Iterator[Links]:
+    """
+    Yield the traceability links of each model element of a file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the ALMGT file.
+    """
+    for llr in GTFile.iterparse(filename):
+        yield llr.id, llr.path, {req: elem.get('traceType') for req, elem in llr.edits.items()}
+
+
+def diff_links(old: Optional[Links], new: Optional[Links]) -> Iterator[Change]:
+    """
+    Yield the changes between two versions of a model element.
+
+    Parameters
+    ----------
+    old : Optional[Links]
+        Initial version of the model element, if any.
+    new : Optional[Links]
+        Final version of the model element, if any.
+    """
+    assert old or new  # nosec B101  # addresses linter
+    oid, path, _ = new if new else old  # type: ignore
+    old_links = old[2] if old else {}
+    new_links = new[2] if new else {}
+    for req, trace_type in old_links.items():
+        new_type = new_links.get(req)
+        if new_type is None:
+            yield REMOVED, oid, path, req, trace_type, None
+        elif new_type != trace_type:
+            yield CHANGED, oid, path, req, trace_type, new_type
+    for req, trace_type in new_links.items():
+        if req not in old_links:
+            yield ADDED, oid, path, req, None, trace_type
+
+
+def diff(old: str, new: str) -> Iterator[Change]:
+    """
+    Yield the traceability changes between two ALMGT files.
+
+    Both files are read in parallel: the model elements are released as soon as
+    they are matched, so that the memory usage depends on the differences
+    between the files rather than on their size. Nothing is parsed when the
+    files are identical.
+
+    Parameters
+    ----------
+    old : str
+        Path of the initial file.
+    new : str
+        Path of the final file.
+    """
+    if files_identical(old, new):
+        return
+    # model elements not matched yet
+    pending_old = {}
+    pending_new = {}
+    for lold, lnew in zip_longest(iter_links(old), iter_links(new)):
+        if lold and lnew and lold[0] == lnew[0]:
+            # same order in both files: nominal case
+            if lold[2] != lnew[2]:
+                yield from diff_links(lold, lnew)
+            continue
+        if lold:
+            match = pending_new.pop(lold[0], None)
+            if match:
+                yield from diff_links(lold, match)
+            else:
+                pending_old[lold[0]] = lold
+        if lnew:
+            match = pending_old.pop(lnew[0], None)
+            if match:
+                yield from diff_links(match, lnew)
+            else:
+                pending_new[lnew[0]] = lnew
+    # remaining elements have been removed or added
+    for lold in pending_old.values():
+        yield from diff_links(lold, None)
+    for lnew in pending_new.values():
+        yield from diff_links(None, lnew)
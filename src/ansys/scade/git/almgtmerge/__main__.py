@@ -23,21 +23,111 @@
 """Entry point."""
 
 from argparse import ArgumentParser
+import json
+import sys
+import time
+from typing import Iterator, List, Optional, TextIO
 
 from ansys.scade.git import __version__
-from ansys.scade.git.almgtmerge.almgtmerge3 import merge3
+from ansys.scade.git.almgtmerge.almgtmerge3 import BatchItem, merge3, merge3_batch
+
+
+def read_manifest(stream: TextIO, errors: Optional[List[int]] = None) -> Iterator[BatchItem]:
+    """
+    Read the merges to perform from a manifest.
+
+    Each non-empty line is either a JSON object with the keys ``base``, ``local``,
+    ``remote`` and ``merged``, or these four paths separated by tabulations.
+    The malformed lines are reported and skipped.
+
+    Parameters
+    ----------
+    stream : TextIO
+        Input manifest.
+    errors : Optional[List[int]]
+        List completed with the numbers of the malformed lines.
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            if line.startswith('{'):
+                entry = json.loads(line)
+                base, local, remote, merged = (
+                    entry['base'],
+                    entry['local'],
+                    entry['remote'],
+                    entry['merged'],
+                )
+            else:
+                base, local, remote, merged = line.split('\t')
+        except (ValueError, KeyError, TypeError) as e:
+            print('line %d: malformed entry: %s' % (number, e))
+            if errors is not None:
+                errors.append(number)
+            continue
+        yield local, remote, base, merged
+
+
+def batch(manifest: str, jobs: int) -> bool:
+    """
+    Perform the merges listed in a manifest and report the results.
+
+    Parameters
+    ----------
+    manifest : str
+        Path of the manifest, ``-`` for the standard input.
+    jobs : int
+        Number of threads, default when 0.
+    """
+    start = time.perf_counter()
+    failures = 0
+    count = 0
+    errors = []
+    stream = sys.stdin if manifest == '-' else open(manifest, encoding='utf-8')
+    try:
+        for item, status, duration, error in merge3_batch(read_manifest(stream, errors), jobs):
+            if error:
+                print('%s: %s' % (item[3], error))
+            print('%s %.3fs %s' % ('ok' if status else 'failed', duration, item[3]))
+            count += 1
+            failures += 0 if status else 1
+    finally:
+        # the standard input is not owned by the function
+        if stream is not sys.stdin:
+            stream.close()
+    for number in errors:
+        print('failed line %d' % number)
+    count += len(errors)
+    failures += len(errors)
+    print(
+        '%d merged, %d failed in %.3fs' % (count - failures, failures, time.perf_counter() - start)
+    )
+    return failures == 0
 
 
 def main():
     """Entry point."""
     parser = ArgumentParser(description='merge3 for almgt files %s' % __version__)
-    parser.add_argument('-l', '--local', metavar='<local>', help='local file', required=True)
-    parser.add_argument('-r', '--remote', metavar='<remote>', help='remote file', required=True)
-    parser.add_argument('-b', '--base', metavar='<base>', help='base file', required=True)
-    parser.add_argument('-m', '--merged', metavar='<merged>', help='merged file', required=True)
+    parser.add_argument('-l', '--local', metavar='<local>', help='local file')
+    parser.add_argument('-r', '--remote', metavar='<remote>', help='remote file')
+    parser.add_argument('-b', '--base', metavar='<base>', help='base file')
+    parser.add_argument('-m', '--merged', metavar='<merged>', help='merged file')
+    parser.add_argument(
+        '--batch', metavar='<manifest>', help='manifest of the files to merge, - for stdin'
+    )
+    parser.add_argument(
+        '-j', '--jobs', metavar='<n>', type=int, default=0, help='number of threads in batch mode'
+    )
     options = parser.parse_args()
 
-    status = merge3(options.local, options.remote, options.base, options.merged)
+    if options.batch:
+        status = batch(options.batch, options.jobs)
+    else:
+        if not (options.local and options.remote and options.base and options.merged):
+            parser.error('the arguments -l, -r, -b and -m are required')
+        status = merge3(options.local, options.remote, options.base, options.merged)
     exit(0 if status else 1)
 
 
@@ -22,8 +22,28 @@
 
 """Merge3 for SCADE ALMGW not exported traceability files (ALMGT)."""
 
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Iterable, Iterator, Tuple
+
 from lxml import etree as et
 
+# configuration of the XML parsers
+parser_options = {'remove_blank_text': True}
+
+# lxml parsers can't be used concurrently: one instance per thread
+_parsers = threading.local()
+
+
+def get_parser() -> et.XMLParser:
+    """Return the XML parser of the current thread, created on first use."""
+    parser = getattr(_parsers, 'parser', None)
+    if parser is None:
+        parser = et.XMLParser(**parser_options)
+        _parsers.parser = parser
+    return parser
+
 
 class LLR:
     """
@@ -100,17 +120,41 @@ class GTFile:
         filename : str
             Input filename.
         """
-        parser = et.XMLParser(remove_blank_text=True)
         try:
-            self.tree = et.parse(filename, parser)
+            return self._load(filename)
         except OSError as e:
             print(e)
             return None
+
+    def _load(self, filename: str) -> 'GTFile':
+        """Parse the file and let the errors propagate."""
+        self.tree = et.parse(filename, get_parser())
         for elem in self.tree.getroot().findall('object'):
             llr = LLR().parse(elem)
             self.llrs[llr.id] = llr
         return self
 
+    @staticmethod
+    def iterparse(filename: str) -> Iterator[LLR]:
+        """
+        Parse the file incrementally and yield its model elements.
+
+        The XML elements are released once the next one is read so that the
+        memory usage does not depend on the size of the file: the yielded
+        instances must not be used after the iteration moved to the next one.
+
+        Parameters
+        ----------
+        filename : str
+            Input filename.
+        """
+        for _, elem in et.iterparse(filename, events=('end',), tag='object'):
+            yield LLR().parse(elem)
+            elem.clear()
+            # remove the processed siblings from the root element
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
     def save(self, filename: str):
         """
         Save the modified file.
@@ -195,15 +239,60 @@ def merge3(local: str, remote: str, base: str, merged: str) -> bool:
     merged : str
         Path of the result file.
     """
-    gtbase = GTFile().parse(base)
-    gtremote = GTFile().parse(remote)
-    gtlocal = GTFile().parse(local)
-    if not gtbase or not gtremote or not gtlocal:
-        # error already reported
-        status = False
-    else:
-        status = gtlocal.merge(gtremote, gtbase)
+    try:
+        return _merge3(local, remote, base, merged)
+    except OSError as e:
+        print(e)
+        return False
+
+
+def _merge3(local: str, remote: str, base: str, merged: str) -> bool:
+    """Merge `remote` and `local` into `merged` and let the errors propagate."""
+    gtbase = GTFile()._load(base)
+    gtremote = GTFile()._load(remote)
+    gtlocal = GTFile()._load(local)
+    status = gtlocal.merge(gtremote, gtbase)
     if status:
-        assert gtlocal is not None  # nosec B101  # addresses linter
         gtlocal.save(merged)
     return status
+
+
+# item of a batch: local, remote, base and merged paths
+BatchItem = Tuple[str, str, str, str]
+
+
+def merge3_batch(
+    items: Iterable[BatchItem], jobs: int = 0
+) -> Iterator[Tuple[BatchItem, bool, float, str]]:
+    """
+    Merge several sets of files in a pool of threads.
+
+    The workers do not print anything: the errors are returned with the
+    results so that the caller reports them from its own thread.
+
+    Parameters
+    ----------
+    items : Iterable[BatchItem]
+        Local, remote, base and merged paths of each merge.
+    jobs : int
+        Number of threads, default when 0.
+
+    Returns
+    -------
+    Iterator[Tuple[BatchItem, bool, float, str]]
+        Status, duration in seconds and error message, empty when none,
+        of each merge, in the order of the inputs.
+    """
+
+    def run(item: BatchItem) -> Tuple[BatchItem, bool, float, str]:
+        start = time.perf_counter()
+        error = ''
+        try:
+            status = _merge3(*item)
+        except (OSError, et.XMLSyntaxError) as e:
+            error = str(e)
+            status = False
+        return item, status, time.perf_counter() - start, error
+
+    with ThreadPoolExecutor(max_workers=jobs if jobs > 0 else None) as executor:
+        yield from executor.map(run, items)
@@ -0,0 +1,62 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Entry point."""
+
+from argparse import ArgumentParser
+import json
+
+from ansys.scade.git import __version__
+from ansys.scade.git.almgtquery.almgtindex import TraceQuery
+
+
+def main():
+    """Entry point."""
+    parser = ArgumentParser(description='traceability queries for almgt files %s' % __version__)
+    parser.add_argument('files', metavar='<file>', nargs='+', help='almgt files')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        '-r', '--requirement', metavar='<id>', help='list the model elements of a requirement'
+    )
+    group.add_argument('-o', '--object', metavar='<oid>', help='list the requirements of an object')
+    parser.add_argument('-j', '--json', action='store_true', help='json output')
+    parser.add_argument('--no-persist', action='store_true', help='do not save the indexes')
+    options = parser.parse_args()
+
+    query = TraceQuery(options.files, persist=not options.no_persist)
+    if options.requirement:
+        keys = 'file', 'id', 'pathName', 'traceType'
+        results = query.get_objects(options.requirement)
+    else:
+        keys = 'file', 'requirement', 'traceType'
+        results = query.get_requirements(options.object)
+    if options.json:
+        print(json.dumps([dict(zip(keys, _)) for _ in results], indent=2))
+    else:
+        for result in results:
+            print('\t'.join(result))
+    exit(0 if len(query.indexes) == len(options.files) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Forward and reverse traceability indexes for ALMGT files."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree as et
+
+from ansys.scade.git.almgtmerge.almgtmerge3 import GTFile
+
+# version of the persisted index format
+INDEX_VERSION = 1
+# suffix of the persisted index, added to the name of the ALMGT file
+INDEX_SUFFIX = '.idx'
+
+
+def get_file_hash(filename: str) -> str:
+    """
+    Return the SHA-256 digest of a file's content.
+
+    Parameters
+    ----------
+    filename : str
+        Input filename.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the file.
+    """
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_index_path(filename: str) -> Path:
+    """
+    Return the path of the persisted index of an ALMGT file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the ALMGT file.
+    """
+    path = Path(filename)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class TraceIndex:
+    """
+    Traceability indexes of an ALMGT file.
+
+    * ``objects``: forward index, object id -> ``{'pathName': ..., 'requirements': {id: type}}``
+    * ``requirements``: reverse index, requirement id -> ``[[object id, pathName, traceType]]``
+
+    Parameters
+    ----------
+    filename : str
+        Path of the indexed ALMGT file.
+    """
+
+    def __init__(self, filename: str = ''):
+        self.filename = filename
+        self.hash = ''
+        self.objects = {}
+        self.requirements = {}
+
+    def build(self, gtfile: GTFile, hash: str = ''):
+        """
+        Build the indexes from a parsed ALMGT file.
+
+        Parameters
+        ----------
+        gtfile : GTFile
+            Parsed ALMGT file.
+        hash : str
+            Digest of the file's content.
+        """
+        self.hash = hash
+        self.objects = {}
+        self.requirements = {}
+        for llr in gtfile.llrs.values():
+            links = {}
+            for req, elem in llr.edits.items():
+                trace_type = elem.get('traceType', '')
+                links[req] = trace_type
+                self.requirements.setdefault(req, []).append([llr.id, llr.path, trace_type])
+            self.objects[llr.id] = {'pathName': llr.path, 'requirements': links}
+        return self
+
+    def get_requirements(self, oid: str) -> Dict[str, str]:
+        """
+        Return the requirements linked to a model element.
+
+        Parameters
+        ----------
+        oid : str
+            Oid of the model element.
+
+        Returns
+        -------
+        Dict[str, str]
+            Trace type for each requirement id.
+        """
+        entry = self.objects.get(oid)
+        return entry['requirements'] if entry else {}
+
+    def get_objects(self, req: str) -> List[Tuple[str, str, str]]:
+        """
+        Return the model elements linked to a requirement.
+
+        Parameters
+        ----------
+        req : str
+            Id of the requirement.
+
+        Returns
+        -------
+        List[Tuple[str, str, str]]
+            Oid, path and trace type of the model elements.
+        """
+        return [tuple(_) for _ in self.requirements.get(req, [])]
+
+    def save(self, path: Path) -> bool:
+        """
+        Persist the indexes to a JSON file.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the index file.
+        """
+        data = {
+            'version': INDEX_VERSION,
+            'hash': self.hash,
+            'objects': self.objects,
+            'requirements': self.requirements,
+        }
+        try:
+            with path.open('w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError:
+            # the index is a cache: the directory may be read-only
+            return False
+        return True
+
+    def read(self, path: Path) -> bool:
+        """
+        Load persisted indexes from a JSON file.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the index file.
+        """
+        try:
+            with path.open(encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        self.hash = data['hash']
+        self.objects = data['objects']
+        self.requirements = data['requirements']
+        return True
+
+
+def load_index(filename: str, persist: bool = True) -> Optional[TraceIndex]:
+    """
+    Return the indexes of an ALMGT file.
+
+    The indexes are read from the file ``<filename>.idx`` when its digest matches
+    the content of the ALMGT file. Otherwise, they are built from the ALMGT file
+    and saved, when ``persist`` is set.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the ALMGT file.
+    persist : bool
+        Whether the indexes must be saved next to the ALMGT file when rebuilt.
+
+    Returns
+    -------
+    Optional[TraceIndex]
+        Indexes of the file, ``None`` if the file can't be read or parsed.
+    """
+    try:
+        hash = get_file_hash(filename)
+    except OSError as e:
+        print(e)
+        return None
+    index_path = get_index_path(filename)
+    index = TraceIndex(filename)
+    if index.read(index_path) and index.hash == hash:
+        return index
+    try:
+        gtfile = GTFile().parse(filename)
+    except et.XMLSyntaxError as e:
+        print(f'{filename}: {e}')
+        return None
+    if not gtfile:
+        # error already reported
+        return None
+    index.build(gtfile, hash)
+    if persist:
+        index.save(index_path)
+    return index
+
+
+class TraceQuery:
+    """
+    Queries over the indexes of several ALMGT files.
+
+    Parameters
+    ----------
+    filenames : Iterable[str]
+        Paths of the ALMGT files.
+    persist : bool
+        Whether the indexes must be saved next to the ALMGT files when rebuilt.
+    """
+
+    def __init__(self, filenames: Iterable[str] = (), persist: bool = True):
+        self.indexes = []
+        for filename in filenames:
+            self.add_file(filename, persist)
+
+    def add_file(self, filename: str, persist: bool = True) -> bool:
+        """
+        Add the indexes of an ALMGT file to the query.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the ALMGT file.
+        persist : bool
+            Whether the indexes must be saved next to the ALMGT file when rebuilt.
+        """
+        index = load_index(filename, persist)
+        if index:
+            self.indexes.append(index)
+        return index is not None
+
+    def get_requirements(self, oid: str) -> List[Tuple[str, str, str]]:
+        """
+        Return the requirements linked to a model element.
+
+        Parameters
+        ----------
+        oid : str
+            Oid of the model element.
+
+        Returns
+        -------
+        List[Tuple[str, str, str]]
+            ALMGT file, requirement id and trace type of the links.
+        """
+        return [
+            (index.filename, req, trace_type)
+            for index in self.indexes
+            for req, trace_type in index.get_requirements(oid).items()
+        ]
+
+    def get_objects(self, req: str) -> List[Tuple[str, str, str, str]]:
+        """
+        Return the model elements linked to a requirement.
+
+        Parameters
+        ----------
+        req : str
+            Id of the requirement.
+
+        Returns
+        -------
+        List[Tuple[str, str, str, str]]
+            ALMGT file, oid, path and trace type of the model elements.
+        """
+        return [
+            (index.filename, oid, path, trace_type)
+            for index in self.indexes
+            for oid, path, trace_type in index.get_objects(req)
+        ]
@@ -0,0 +1,291 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Cache of the branches of the Git repositories.
+
+Listing the branches decodes all the references of a repository, which is
+slow for repositories with thousands of branches. The cache keeps the sorted
+names of the local and remote-tracking branches until the references change,
+detected with the modification times of ``packed-refs`` and of the
+directories under ``refs/heads`` and ``refs/remotes``: updating a loose
+reference renames a file in its directory. The top-level directories are
+checked on each access, the nested ones at most once per ``REFS_WALK_TTL``.
+
+The metadata of the last commits are computed on demand, for the displayed
+branches only, and cached per commit.
+"""
+
+import bisect
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dulwich.objects import Commit
+from dulwich.repo import Repo
+
+# namespaces of the branches
+HEADS = b'refs/heads/'
+REMOTES = b'refs/remotes/'
+
+Signature = Tuple[Tuple[str, int], ...]
+
+# delay, in seconds, during which the nested directories of the references are not checked again
+REFS_WALK_TTL = 2.0
+
+
+class BranchInfo:
+    """
+    Metadata of the last commit of a branch.
+
+    Parameters
+    ----------
+    sha : str
+        Identifier of the commit.
+    author : str
+        Author of the commit.
+    time : int
+        Commit time, in seconds since the epoch.
+    summary : str
+        First line of the commit message.
+    """
+
+    def __init__(self, sha: str, author: str, time: int, summary: str):
+        self.sha = sha
+        self.author = author
+        self.time = time
+        self.summary = summary
+
+    def __repr__(self) -> str:
+        """Return a representation of the metadata, for debugging."""
+        return 'BranchInfo({0!r}, {1!r}, {2!r}, {3!r})'.format(
+            self.sha, self.author, self.time, self.summary
+        )
+
+
+def get_refs_signature(commondir: str, nested: bool = True) -> Signature:
+    """
+    Return the modification times of the files storing the branches.
+
+    Parameters
+    ----------
+    commondir : str
+        Git directory shared by the worktrees of the repository.
+    nested : bool, default: True
+        Whether to consider all the directories of the references, else only
+        ``refs/heads``, ``refs/remotes`` and the directories of the remotes.
+
+    Returns
+    -------
+    Signature
+    """
+    paths = [os.path.join(commondir, 'packed-refs')]
+    for namespace in 'heads', 'remotes':
+        directory = os.path.join(commondir, 'refs', namespace)
+        if nested:
+            paths.extend(root for root, _, _ in os.walk(directory))
+            continue
+        paths.append(directory)
+        if namespace == 'remotes':
+            try:
+                with os.scandir(directory) as it:
+                    paths.extend(_.path for _ in it if _.is_dir())
+            except OSError:
+                pass
+    signature = []
+    for path in paths:
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+    return tuple(signature)
+
+
+def read_branches(repo: Repo) -> Tuple[List[str], List[str]]:
+    """
+    Return the sorted names of the branches of a repository.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+
+    Returns
+    -------
+    Tuple[List[str], List[str]]
+        Local branches and remote-tracking branches, for example ``origin/main``.
+    """
+    local = sorted(_.decode('utf-8') for _ in repo.refs.keys(base=HEADS))
+    # the symbolic references, such as origin/HEAD, are not branches
+    remote = sorted(
+        _.decode('utf-8')
+        for _ in repo.refs.keys(base=REMOTES)
+        if not _.endswith(b'/HEAD') and _ != b'HEAD'
+    )
+    return local, remote
+
+
+class BranchCache:
+    """Branches of the repositories, indexed by path."""
+
+    def __init__(self):
+        # signatures of the top-level and of all the directories of the references,
+        # time of the last check of all the directories and branches, indexed by path
+        self.entries: Dict[
+            str, Tuple[Signature, Signature, float, Tuple[List[str], List[str]]]
+        ] = {}
+        self.infos: Dict[bytes, BranchInfo] = {}
+        # delay during which the nested directories of the references are not checked again
+        self.ttl = REFS_WALK_TTL
+
+    def get(self, repo: Repo, remotes: bool = True) -> List[str]:
+        """
+        Return the sorted names of the branches, read again when the references change.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+        remotes : bool, default: True
+            Whether to add the remote-tracking branches.
+
+        Returns
+        -------
+        List[str]
+        """
+        local, remote = self._get_lists(repo)
+        return local + remote if remotes else local
+
+    def _get_lists(self, repo: Repo) -> Tuple[List[str], List[str]]:
+        """Return the cached local and remote-tracking branches of a repository."""
+        commondir = os.path.normpath(repo.commondir())
+        top = get_refs_signature(commondir, nested=False)
+        now = time.monotonic()
+        entry = self.entries.get(repo.path)
+        if entry is not None and entry[0] == top and now - entry[2] < self.ttl:
+            return entry[3]
+        # walking the nested directories is slow for repositories with many namespaces
+        signature = get_refs_signature(commondir)
+        if entry is None or entry[1] != signature:
+            branches = read_branches(repo)
+        else:
+            branches = entry[3]
+        self.entries[repo.path] = top, signature, now, branches
+        return branches
+
+    def filter(
+        self,
+        repo: Repo,
+        prefix: str = '',
+        start: int = 0,
+        count: Optional[int] = None,
+        remotes: bool = True,
+    ) -> Tuple[List[str], int]:
+        """
+        Return a page of the branches starting with a prefix.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+        prefix : str, default: ''
+            Prefix of the branches, all the branches when empty.
+        start : int, default: 0
+            Index of the first branch of the page, in the filtered branches.
+        count : Optional[int]
+            Maximum number of branches of the page, all the remaining branches when ``None``.
+        remotes : bool, default: True
+            Whether to consider the remote-tracking branches.
+
+        Returns
+        -------
+        Tuple[List[str], int]
+            Branches of the page and total number of branches starting with the prefix.
+        """
+        lists = self._get_lists(repo)
+        if not remotes:
+            lists = lists[:1]
+        matches = []
+        for branches in lists:
+            # the branches starting with the prefix are contiguous in a sorted list
+            first = bisect.bisect_left(branches, prefix)
+            last = first
+            while last < len(branches) and branches[last].startswith(prefix):
+                last += 1
+            matches.extend(branches[first:last])
+        end = len(matches) if count is None else start + count
+        return matches[start:end], len(matches)
+
+    def get_info(self, repo: Repo, branch: str) -> Optional[BranchInfo]:
+        """
+        Return the metadata of the last commit of a branch.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+        branch : str
+            Local or remote-tracking branch.
+
+        Returns
+        -------
+        Optional[BranchInfo]
+            Metadata of the commit, ``None`` if the branch does not exist.
+        """
+        name = branch.encode('utf-8')
+        for ref in HEADS + name, REMOTES + name:
+            try:
+                sha = repo.refs[ref]
+                break
+            except KeyError:
+                continue
+        else:
+            return None
+        info = self.infos.get(sha)
+        if info is None:
+            commit = repo[sha]
+            if not isinstance(commit, Commit):
+                return None
+            summary = commit.message.decode('utf-8', 'replace').split('\n', 1)[0]
+            info = BranchInfo(
+                sha.decode('ascii'),
+                commit.author.decode('utf-8', 'replace'),
+                commit.commit_time,
+                summary,
+            )
+            self.infos[sha] = info
+        return info
+
+    def invalidate(self, repo_path: Optional[str] = None):
+        """
+        Discard the branches of a repository, or of all the repositories.
+
+        Parameters
+        ----------
+        repo_path : Optional[str]
+            Path of the repository, all the repositories when ``None``.
+        """
+        if repo_path is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(repo_path, None)
@@ -0,0 +1,197 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Lightweight definition of the commands of the Git extension.
+
+SCADE Studio registers the menus and toolbars of the extension at startup:
+they are populated with lazy commands which do not depend on Dulwich.
+Dulwich, the Git client and the actual commands are loaded on the first
+activation of a command, or when the Git browser is first displayed, that
+is as soon as a project is loaded.
+
+This module must not import Dulwich, directly or indirectly.
+"""
+
+from pathlib import Path
+import traceback
+from typing import Callable, Dict, Optional
+
+import scade
+
+from ansys.scade.guitools.command import Command
+from ansys.scade.guitools.ide import Ide
+
+# maximum duration of the registration of the extension at startup, in seconds
+STARTUP_BUDGET = 0.05
+
+script_dir = Path(__file__).parent
+
+res = {
+    "refresh": str(script_dir / 'img/refresh.bmp'),
+    "stage": str(script_dir / 'img/stage.bmp'),
+    "unstage": str(script_dir / 'img/unstage.bmp'),
+    "reset": str(script_dir / 'img/unstage.bmp'),
+    "commit": str(script_dir / 'img/commit.bmp'),
+    "diff": str(script_dir / 'img/diff.bmp'),
+}
+
+
+def _data(name: str, message: str, image: str = '') -> Dict[str, str]:
+    """Return the arguments of the constructor of a command."""
+    data = {'name': name, 'status_message': message, 'tooltip_message': message}
+    if image:
+        data['image_file'] = res[image]
+    return data
+
+
+# arguments of the constructors of the commands, shared by the lazy and actual commands
+command_data = {
+    'refresh': _data('Refresh', 'Refresh the Git repo status', 'refresh'),
+    'stage': _data('Stage', 'Stage selected files', 'stage'),
+    'unstage': _data('Unstage', 'UnStage selected files', 'unstage'),
+    'reset': _data('Reset', 'Reset selected files', 'reset'),
+    'stage_all': _data('Stage All', 'Stage all files', 'stage'),
+    'unstage_all': _data('Unstage All', 'Unstage all files', 'unstage'),
+    'commit': _data('Commit', 'Commit', 'commit'),
+    'diff': _data('Diff', 'Diff project with another version', 'diff'),
+    'timings': _data('Timings', 'Display the durations of the Git operations'),
+}
+
+
+def log(text: str):
+    """
+    Display the input message in the `Messages` output tab.
+
+    The messages are prefixed by 'Git Extension - '.
+
+    Parameters
+    ----------
+    text : str
+        Message to display.
+    """
+    if text:
+        # scade is a CPython module defined dynamically
+        scade.tabput("LOG", "Git Extension - " + text + "\n")  # type: ignore
+
+
+class CommandLoader:
+    """
+    Load the actual commands of the extension on first use.
+
+    Parameters
+    ----------
+    factory : Callable[[], Dict[str, Command]]
+        Function loading the Git client and returning the actual commands,
+        indexed by the keys of ``command_data``. The dictionary is empty
+        when the Git client can't be initialized.
+    log : Optional[Callable[[str], None]]
+        Function logging the errors of the factory, ``log`` when ``None``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Dict[str, Command]],
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.factory = factory
+        self.log = log
+        self.commands: Optional[Dict[str, Command]] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Return whether the actual commands are loaded."""
+        return self.commands is not None
+
+    def get(self, key: str) -> Optional[Command]:
+        """
+        Return an actual command, loaded on first call.
+
+        Parameters
+        ----------
+        key : str
+            Key of the command in ``command_data``.
+
+        Returns
+        -------
+        Optional[Command]
+            Actual command, ``None`` when the Git client can't be initialized.
+        """
+        if self.commands is None:
+            try:
+                self.commands = self.factory()
+            except BaseException:
+                # the commands are polled continuously: the error is reported once
+                # and the commands remain disabled
+                (self.log or log)('Loading failed:\n' + traceback.format_exc())
+                self.commands = {}
+        return self.commands.get(key)
+
+
+class LazyCommand(Command):
+    """
+    Command registered at startup, delegating to the actual command once loaded.
+
+    Parameters
+    ----------
+    ide : Ide
+        SCADE IDE environment.
+    loader : CommandLoader
+        Loader of the actual commands.
+    key : str
+        Key of the command in ``command_data``.
+    enabled : bool
+        Whether the command is enabled before the actual commands are loaded.
+    load_with_project : bool
+        Whether the actual commands are loaded as soon as a project is loaded,
+        to display the Git browser.
+    """
+
+    def __init__(
+        self,
+        ide: Ide,
+        loader: CommandLoader,
+        key: str,
+        enabled: bool = False,
+        load_with_project: bool = False,
+    ):
+        super().__init__(ide, **command_data[key])
+        self.loader = loader
+        self.key = key
+        self.enabled = enabled
+        self.load_with_project = load_with_project
+
+    def on_enable(self) -> bool:
+        """Return the status of the actual command once loaded."""
+        if not self.loader.loaded and not (
+            self.load_with_project and self.ide.get_active_project()
+        ):
+            return self.enabled
+        command = self.loader.get(self.key)
+        return command.on_enable() if command is not None else False
+
+    def on_activate(self):
+        """Run the actual command, loaded if needed."""
+        command = self.loader.get(self.key)
+        if command is not None:
+            command.on_activate()
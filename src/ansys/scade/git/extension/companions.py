@@ -0,0 +1,146 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Discovery of the companion files of the project files.
+
+A companion file is a file which is not referenced by the project but is
+stored next to a project file, with the same name and another suffix: for
+example the annotation file ``P.ann`` of the model file ``P.xscade``.
+
+Each directory is scanned once, whatever the number of project files it
+contains, and its entries are cached until its modification time changes.
+"""
+
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# default companion suffixes, per suffix of project file
+DEFAULT_COMPANIONS = {'.xscade': ('.ann',)}
+
+# a directory modified less than this delay before its scan, in nanoseconds,
+# may have been modified again within the resolution of its modification time
+RACY_DELAY = 2_000_000_000
+
+
+class CompanionFinder:
+    """
+    Finder of the companion files of project files.
+
+    Parameters
+    ----------
+    companions : Optional[Dict[str, Sequence[str]]]
+        Suffixes of the companion files, per suffix of project file,
+        ``DEFAULT_COMPANIONS`` when ``None``.
+    """
+
+    def __init__(self, companions: Optional[Dict[str, Sequence[str]]] = None):
+        self.companions = dict(DEFAULT_COMPANIONS if companions is None else companions)
+        # cached directories: modification time and folded names of the entries
+        self.entries: Dict[str, Tuple[int, Set[str]]] = {}
+
+    def get_candidates(self, path: str) -> List[str]:
+        """
+        Return the paths of the possible companion files of a file.
+
+        Parameters
+        ----------
+        path : str
+            Path of a project file.
+
+        Returns
+        -------
+        List[str]
+            Paths of the companion files, existing or not.
+        """
+        root, suffix = os.path.splitext(path)
+        return [root + _ for _ in self.companions.get(suffix.lower(), ())]
+
+    def get_names(self, directory: str) -> Optional[Set[str]]:
+        """
+        Return the names of the entries of a directory, folded with ``normcase``.
+
+        Parameters
+        ----------
+        directory : str
+            Path of the directory.
+
+        Returns
+        -------
+        Optional[Set[str]]
+            Names of the entries, ``None`` if the directory does not exist.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.entries.pop(directory, None)
+            return None
+        entry = self.entries.get(directory)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        start = time.time_ns()
+        try:
+            with os.scandir(directory) as it:
+                names = {os.path.normcase(_.name) for _ in it}
+        except OSError:
+            return None
+        if mtime < start - RACY_DELAY:
+            self.entries[directory] = mtime, names
+        else:
+            # recent modification: scan again next time
+            self.entries.pop(directory, None)
+        return names
+
+    def find(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Return the existing companion files of files.
+
+        Parameters
+        ----------
+        paths : Iterable[str]
+            Absolute paths of project files.
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            Existing companion files, per input path having some.
+        """
+        companions = {}
+        directories: Dict[str, Optional[Set[str]]] = {}
+        for path in paths:
+            found = []
+            for candidate in self.get_candidates(path):
+                directory, name = os.path.split(candidate)
+                if directory not in directories:
+                    directories[directory] = self.get_names(directory)
+                names = directories[directory]
+                if names is not None and os.path.normcase(name) in names:
+                    found.append(candidate)
+            if found:
+                companions[path] = found
+        return companions
+
+    def invalidate(self):
+        """Discard the cached directories."""
+        self.entries.clear()
@@ -0,0 +1,234 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Discovery of the Git repositories.
+
+The repository of a path is the first parent directory containing a ``.git``
+entry, either a directory or a file redirecting to the Git directory:
+
+* ``gitdir: <path>`` files are used by the submodules and the linked worktrees.
+* The Git directory of a linked worktree contains a ``commondir`` file, which
+  locates the Git directory shared with the main worktree.
+
+The results are memoized per directory: subsequent lookups only check
+that the ``.git`` entry of the repository is still present.
+"""
+
+import os
+from pathlib import Path
+import stat
+import threading
+from typing import Dict, Optional, Tuple
+
+# kinds of repositories
+MAIN = 'main'
+WORKTREE = 'worktree'
+SUBMODULE = 'submodule'
+
+
+class RepoLocation:
+    """
+    Location of a Git repository.
+
+    Parameters
+    ----------
+    work_tree : str
+        Root directory of the working tree.
+    git_dir : str
+        Git directory of the working tree, for example ``<work_tree>/.git``.
+    common_dir : str
+        Git directory shared by all the worktrees of the repository.
+    kind : str
+        Kind of the repository, ``MAIN``, ``WORKTREE`` or ``SUBMODULE``.
+    """
+
+    def __init__(self, work_tree: str, git_dir: str, common_dir: str, kind: str):
+        self.work_tree = work_tree
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        """Return a representation of the location, for debugging."""
+        return 'RepoLocation({0!r}, {1!r}, {2!r}, {3!r})'.format(
+            self.work_tree, self.git_dir, self.common_dir, self.kind
+        )
+
+
+def read_gitdir(gitfile: str) -> Optional[str]:
+    """
+    Return the Git directory referenced by a ``.git`` file.
+
+    Parameters
+    ----------
+    gitfile : str
+        Path of the ``.git`` file.
+
+    Returns
+    -------
+    Optional[str]
+        Absolute path of the Git directory, ``None`` if the file is not valid.
+    """
+    try:
+        with open(gitfile, encoding='utf-8') as f:
+            line = f.readline().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    prefix = 'gitdir:'
+    if not line.startswith(prefix):
+        return None
+    # relative paths are relative to the directory of the file
+    git_dir = os.path.join(os.path.dirname(gitfile), line[len(prefix) :].strip())
+    return os.path.normpath(git_dir)
+
+
+def get_location(work_tree: str, st: os.stat_result) -> Optional[RepoLocation]:
+    """
+    Return the location of the repository of a working tree.
+
+    Parameters
+    ----------
+    work_tree : str
+        Directory containing a ``.git`` entry.
+    st : os.stat_result
+        Stat data of the ``.git`` entry.
+
+    Returns
+    -------
+    Optional[RepoLocation]
+        Location of the repository, ``None`` if the ``.git`` entry is not valid.
+    """
+    dot_git = os.path.join(work_tree, '.git')
+    if stat.S_ISDIR(st.st_mode):
+        return RepoLocation(work_tree, dot_git, dot_git, MAIN)
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    git_dir = read_gitdir(dot_git)
+    if git_dir is None or not os.path.isdir(git_dir):
+        return None
+    try:
+        with open(os.path.join(git_dir, 'commondir'), encoding='utf-8') as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.readline().strip()))
+    except OSError:
+        # no commondir: submodule or separate Git directory
+        return RepoLocation(work_tree, git_dir, git_dir, SUBMODULE)
+    return RepoLocation(work_tree, git_dir, common_dir, WORKTREE)
+
+
+def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+    """Return the data identifying a ``.git`` entry."""
+    if stat.S_ISDIR(st.st_mode):
+        # the modification time of a Git directory changes with the index
+        return st.st_ino, st.st_mode, 0
+    return st.st_ino, st.st_mode, st.st_mtime_ns
+
+
+class RepoDiscovery:
+    """Memoized discovery of the Git repositories."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # location of the repository of a directory, None for none
+        self.dirs: Dict[str, Optional[RepoLocation]] = {}
+        # signature of the .git entry of the discovered working trees
+        self.signatures: Dict[str, Tuple[int, int, int]] = {}
+
+    def find(self, path: str) -> Optional[RepoLocation]:
+        """
+        Return the location of the repository containing a path.
+
+        Parameters
+        ----------
+        path : str
+            Path of a file or a directory.
+
+        Returns
+        -------
+        Optional[RepoLocation]
+            Location of the repository, ``None`` if the path is not in a repository.
+        """
+        d = Path(os.path.abspath(path))
+        root = Path(d.root)
+        disk = d.anchor
+        walked = []
+        location = None
+        with self.lock:
+            while d != root and str(d) != disk:
+                key = str(d)
+                if key in self.dirs:
+                    location = self.dirs[key]
+                    if location is None or self._is_valid(location):
+                        break
+                    self._forget(location.work_tree)
+                    location = None
+                try:
+                    st = os.stat(os.path.join(key, '.git'))
+                except OSError:
+                    pass
+                else:
+                    location = get_location(key, st)
+                    if location is not None:
+                        self.signatures[key] = _signature(st)
+                        self.dirs[key] = location
+                        break
+                walked.append(key)
+                d = d.parent
+            for key in walked:
+                self.dirs[key] = location
+        return location
+
+    def invalidate(self, path: Optional[str] = None):
+        """
+        Forget the memoized results for a working tree, or all the results.
+
+        Parameters
+        ----------
+        path : Optional[str]
+            Root directory of a working tree, all the results when ``None``.
+        """
+        with self.lock:
+            if path is None:
+                self.dirs.clear()
+                self.signatures.clear()
+            else:
+                self._forget(os.path.abspath(path))
+
+    def _is_valid(self, location: RepoLocation) -> bool:
+        """Return whether the ``.git`` entry of a working tree is unchanged."""
+        try:
+            st = os.stat(os.path.join(location.work_tree, '.git'))
+        except OSError:
+            return False
+        return _signature(st) == self.signatures.get(location.work_tree)
+
+    def _forget(self, work_tree: str):
+        """Forget the results for a working tree and the directories outside of any repository."""
+        self.signatures.pop(work_tree, None)
+        for key, location in list(self.dirs.items()):
+            if location is None or location.work_tree == work_tree:
+                del self.dirs[key]
+
+
+# memoized results shared by all the projects and files
+repo_discovery = RepoDiscovery()
@@ -23,12 +23,15 @@
 """Front-end for Git commands."""
 
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import os
 from pathlib import Path
 import site
+import stat
 import sys
-from typing import List, Tuple
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 # force user installed modules to have priority on Python installation
 site_user = site.getusersitepackages()
@@ -38,10 +41,40 @@ if site_user in sys.path:
 
 import dulwich as dulwich  # noqa: E402
 from dulwich import porcelain as git  # noqa: E402
+from dulwich.errors import NotGitRepository  # noqa: E402
+from dulwich.index import (  # noqa: E402
+    Index,
+    IndexEntry,
+    blob_from_path_and_stat,
+    build_file_from_blob,
+)
+from dulwich.objects import Blob, Commit  # noqa: E402
 from dulwich.repo import Repo  # noqa: E402
 
+from ansys.scade.git.extension.branches import BranchCache, BranchInfo  # noqa: E402
+from ansys.scade.git.extension.discovery import repo_discovery  # noqa: E402
+from ansys.scade.git.extension.repopool import RepoPool  # noqa: E402
+from ansys.scade.git.extension.snapshot import StatusSnapshots  # noqa: E402
+from ansys.scade.git.extension.statcache import StatCache, get_index_checksum  # noqa: E402
+from ansys.scade.git.extension.timing import Instrumentation  # noqa: E402
+from ansys.scade.git.extension.untracked import (  # noqa: E402
+    UNTRACKED_ALL,
+    UNTRACKED_MODES,
+    UNTRACKED_NO,
+    UNTRACKED_PROJECT,
+    IgnoreCache,
+    find_untracked,
+)
+from ansys.scade.git.extension.workspace import (  # noqa: E402
+    WorkspaceCache,
+    lookup_tree_paths,
+    materialize_project,
+)
+
 # minimum Dulwich version
 min_dulwich_ver = (0, 21, 3)
+# maximum number of repositories which status is computed concurrently
+MAX_WORKERS = 4
 
 GitStatus = Enum(
     'GitStatus',
@@ -75,20 +108,763 @@ def find_git_repo(local_proj_path: str) -> str:
     Returns
     -------
     str
-        Location of the git repository for this SCADE project, otherwise `None`.
+        Location of the git repository for this SCADE project, otherwise an empty string.
+    """
+    # the results are memoized and shared by all the projects and files
+    location = repo_discovery.find(local_proj_path)
+    return location.work_tree if location is not None else ''
+
+
+class RefreshCancelledError(Exception):
+    """Exception raised when a status computation is cancelled."""
+
+
+def check_cancelled(cancel: Optional[threading.Event]):
+    """
+    Raise ``RefreshCancelledError`` if the computation has been cancelled.
+
+    Parameters
+    ----------
+    cancel : Optional[threading.Event]
+        Event set when the computation is not needed anymore.
+    """
+    if cancel is not None and cancel.is_set():
+        raise RefreshCancelledError()
+
+
+# statuses of the files with staged changes
+STAGED_STATUSES = {GitStatus.added, GitStatus.modified_staged, GitStatus.removed_staged}
+
+# known effects of the operations on the files without hidden unstaged changes,
+# the other statuses are not modified
+EFFECTS = {
+    'stage': {
+        GitStatus.untracked: GitStatus.added,
+        GitStatus.modified_unstaged: GitStatus.modified_staged,
+        GitStatus.removed_unstaged: GitStatus.removed_staged,
+    },
+    'unstage': {
+        GitStatus.added: GitStatus.untracked,
+        GitStatus.modified_staged: GitStatus.modified_unstaged,
+        GitStatus.removed_staged: GitStatus.removed_unstaged,
+    },
+    'commit': {
+        GitStatus.added: GitStatus.clean,
+        GitStatus.modified_staged: GitStatus.clean,
+    },
+}
+
+
+class RepoStatus:
+    """
+    Result of a status computation.
+
+    Parameters
+    ----------
+    repo_path : str
+        Path of the repository, empty if none.
+    repo : Optional[Repo]
+        Git repository.
+    branch : str
+        Active branch.
+    files_status : Optional[Dict[str, GitStatus]]
+        Status of the files, indexed by posix paths relative to the repository.
+    scope : Optional[Set[str]]
+        Files considered for the computation, the whole working tree when ``None``.
+    unstaged : Optional[Dict[str, GitStatus]]
+        Unstaged status of the files which status is staged and which also
+        have unstaged changes.
+    key : Tuple[str, str]
+        Checksum of the index and id of the HEAD commit when the status was computed.
+    siblings : Optional[Dict[str, RepoStatus]]
+        Status of the other repositories containing files of the scope,
+        indexed by path.
+    """
+
+    def __init__(
+        self,
+        repo_path: str = '',
+        repo: Optional[Repo] = None,
+        branch: str = '',
+        files_status: Optional[Dict[str, GitStatus]] = None,
+        scope: Optional[Set[str]] = None,
+        unstaged: Optional[Dict[str, GitStatus]] = None,
+        key: Tuple[str, str] = ('', ''),
+        siblings: Optional[Dict[str, 'RepoStatus']] = None,
+    ):
+        self.repo_path = repo_path
+        self.repo = repo
+        self.branch = branch
+        self.files_status = files_status if files_status is not None else {}
+        self.scope = scope
+        self.unstaged = unstaged if unstaged is not None else {}
+        self.key = key
+        self.siblings = siblings if siblings is not None else {}
+
+    def merge(self, status: 'RepoStatus'):
+        """
+        Update the status of the files with an incremental status of the same repository.
+
+        The status of the other repositories are merged as well.
+
+        Parameters
+        ----------
+        status : RepoStatus
+            Status of the files of its scope.
+        """
+        for file in status.scope or []:
+            self.files_status.pop(file, None)
+            self.unstaged.pop(file, None)
+        self.files_status.update(status.files_status)
+        self.unstaged.update(status.unstaged)
+        for path, sibling in status.siblings.items():
+            if path in self.siblings:
+                self.siblings[path].merge(sibling)
+            else:
+                self.siblings[path] = sibling
+
+
+def get_index_path(repo_path: str, file_path: str) -> Optional[str]:
+    """
+    Return the path of a file relative to a repository.
+
+    Parameters
+    ----------
+    repo_path : str
+        Path of the repository.
+    file_path : str
+        Input path, either absolute or relative to the Git repository.
+
+    Returns
+    -------
+    Optional[str]
+        Posix path relative to the repository, ``None`` if the file
+        is not in the repository.
+    """
+    path = Path(file_path)
+    if not path.is_absolute():
+        return path.as_posix()
+    try:
+        return path.relative_to(repo_path).as_posix()
+    except ValueError:
+        return None
+
+
+def group_paths(repo_path: str, paths: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Group paths by repository.
+
+    Parameters
+    ----------
+    repo_path : str
+        Path of the main repository, first in the result.
+    paths : Iterable[str]
+        Paths of files, either absolute or relative to the main repository.
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        Paths indexed by repository. The files outside of any repository are ignored.
+    """
+    groups: Dict[str, List[str]] = {repo_path: []}
+    for path in paths:
+        if not os.path.isabs(path):
+            groups[repo_path].append(path)
+            continue
+        # the discovery is memoized per directory
+        location = repo_discovery.find(os.path.dirname(path))
+        if location is not None:
+            groups.setdefault(location.work_tree, []).append(path)
+    return groups
+
+
+def get_repo_watch_paths(repo: Repo, branch: str) -> List[str]:
+    """
+    Return the Git files of a repository which changes invalidate the status of its files.
+
+    These are the index, ``HEAD`` and the references of the active branch.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    branch : str
+        Active branch, if any.
+
+    Returns
+    -------
+    List[str]
+    """
+    # the references are shared by the worktrees of a repository
+    controldir = Path(repo.controldir())
+    commondir = Path(os.path.normpath(repo.commondir()))
+    paths = [controldir / 'index', controldir / 'HEAD', commondir / 'packed-refs']
+    if branch:
+        paths.append(commondir / 'refs' / 'heads' / branch)
+    return [str(_) for _ in paths]
+
+
+def get_existing_paths(paths: Iterable[str]) -> Set[str]:
+    """
+    Return the paths which exist in the file system.
+
+    The directories are scanned once, whatever the number of paths they contain.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        Absolute paths.
+
+    Returns
+    -------
+    Set[str]
+        Input paths which exist, either files or directories.
+    """
+    dirs: Dict[str, List[str]] = {}
+    for path in paths:
+        directory, name = os.path.split(path)
+        dirs.setdefault(directory, []).append(name)
+    existing = set()
+    for directory, names in dirs.items():
+        try:
+            with os.scandir(directory) as it:
+                # file systems are case-insensitive when normcase folds the case
+                entries = {os.path.normcase(_.name) for _ in it}
+        except OSError:
+            continue
+        for name in names:
+            if os.path.normcase(name) in entries:
+                existing.add(os.path.join(directory, name))
+    return existing
+
+
+def get_snapshot_status(
+    statuses: Tuple[Dict[str, str], Dict[str, str]],
+) -> Tuple[Dict[str, GitStatus], Dict[str, GitStatus]]:
+    """
+    Return the status of the files saved in a snapshot.
+
+    Parameters
+    ----------
+    statuses : Tuple[Dict[str, str], Dict[str, str]]
+        Names of the status of the files and of the unstaged status of the files
+        which also have staged changes.
+
+    Returns
+    -------
+    Tuple[Dict[str, GitStatus], Dict[str, GitStatus]]
+
+    Raises
+    ------
+    KeyError
+        A status is unknown.
+    """
+    files, unstaged = statuses
+    files_status = {path: GitStatus[status] for path, status in files.items()}
+    return files_status, {path: GitStatus[status] for path, status in unstaged.items()}
+
+
+def get_status_key(repo: Repo) -> Tuple[str, str]:
+    """
+    Return the checksum of the index and the id of the HEAD commit.
+
+    The staged changes, and thus the status of the files, can be reused
+    as long as this key does not change.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+
+    Returns
+    -------
+    Tuple[str, str]
+        Checksum of the index and id of the HEAD commit, empty when there is no commit yet.
+    """
+    try:
+        head = repo.head()
+    except KeyError:
+        # no commit yet
+        head = b''
+    return get_index_checksum(repo.index_path()), head.decode('ascii')
+
+
+def get_staged_changes(
+    repo: Repo, index: Index, cache: Optional[StatCache] = None
+) -> Dict[str, List[bytes]]:
+    """
+    Return the changes between HEAD and the index.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    index : Index
+        Index of the repository.
+    cache : Optional[StatCache]
+        Cache of the status, used when the index and HEAD did not change.
+
+    Returns
+    -------
+    Dict[str, List[bytes]]
+        Paths added, deleted or modified in the index with respect to HEAD.
+    """
+    key = get_status_key(repo)
+    if cache:
+        staged = cache.get_staged(key)
+        if staged is not None:
+            return staged
+    # no tree when there is no commit yet
+    tree_id = repo[key[1].encode('ascii')].tree if key[1] else None  # type: ignore
+    staged = {'add': [], 'delete': [], 'modify': []}
+    for (old_path, new_path), _, _ in index.changes_from_tree(repo.object_store, tree_id):
+        if not old_path:
+            staged['add'].append(new_path)
+        elif not new_path:
+            staged['delete'].append(old_path)
+        else:
+            staged['modify'].append(old_path)
+    if cache:
+        cache.set_staged(key, staged)
+    return staged
+
+
+def is_entry_up_to_date(entry: IndexEntry, st: os.stat_result, index_mtime_ns: int) -> bool:
+    """
+    Return whether a file is unchanged since it was added to the index, from its stat data.
+
+    As with Git, an entry is racily clean when the file is not older than the index:
+    the file may have been modified after it was added, within the timestamp
+    granularity, and its stat data are not trusted.
+
+    Parameters
+    ----------
+    entry : IndexEntry
+        Index entry of the file.
+    st : os.stat_result
+        Current stat data of the file.
+    index_mtime_ns : int
+        Modification time of the index file, in nanoseconds.
+
+    Returns
+    -------
+    bool
+    """
+    if st.st_mtime_ns >= index_mtime_ns:
+        return False
+    # the index stores 32-bit sizes and inodes
+    if entry.size != st.st_size & 0xFFFFFFFF:
+        return False
+    if entry.ino and st.st_ino and entry.ino != st.st_ino & 0xFFFFFFFF:
+        return False
+    if isinstance(entry.mtime, tuple):
+        seconds, nanoseconds = entry.mtime
+    else:
+        # entry created in memory: no nanoseconds
+        seconds, nanoseconds = int(entry.mtime), 0
+    if seconds != st.st_mtime_ns // 1_000_000_000:
+        return False
+    # some Git implementations do not record the nanoseconds
+    return not nanoseconds or nanoseconds == st.st_mtime_ns % 1_000_000_000
+
+
+def get_unstaged_changes(
+    repo: Repo,
+    index: Index,
+    cache: Optional[StatCache] = None,
+    paths: Optional[Iterable[bytes]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[Set[bytes], Set[bytes]]:
     """
-    # look for .git folders in local_proj_path or parent folders
-    d = Path(local_proj_path)
-    root = Path(d.root)
-    disk = d.anchor
+    Return the tracked files which differ from the index.
 
-    while d != root and str(d) != disk:
-        repo_path = d / '.git'
-        if repo_path.is_dir():
-            return str(d)
-        d = d.parent
+    The working tree is accessed once per index entry: the files missing from
+    the file system are reported as removed without any further access.
+    The files are hashed only when their stat data differ from both the index
+    entry's and the cache's.
 
-    return ''
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    index : Index
+        Index of the repository.
+    cache : Optional[StatCache]
+        Cache of the blob ids of the working tree files.
+    paths : Optional[Iterable[bytes]]
+        Index paths to consider, all the entries of the index when ``None``.
+    cancel : Optional[threading.Event]
+        Event set when the computation is not needed anymore.
+
+    Returns
+    -------
+    Tuple[Set[bytes], Set[bytes]]
+        Modified and removed index paths.
+    """
+    modified = set()
+    removed = set()
+    root = os.fsencode(repo.path)
+    normalizer = repo.get_blob_normalizer()
+    try:
+        index_mtime_ns = os.stat(repo.index_path()).st_mtime_ns
+    except OSError:
+        # no index yet
+        index_mtime_ns = 0
+    if paths is None:
+        entries = index.iteritems()
+    else:
+        entries = ((_, index[_]) for _ in paths if _ in index)
+    for tree_path, entry in entries:
+        check_cancelled(cancel)
+        if not hasattr(entry, 'sha'):
+            # conflicted entries are always unstaged
+            modified.add(tree_path)
+            continue
+        full_path = os.path.join(root, tree_path)
+        try:
+            st = os.lstat(full_path)
+        except FileNotFoundError:
+            removed.add(tree_path)
+            continue
+        if not stat.S_ISREG(st.st_mode) and not stat.S_ISLNK(st.st_mode):
+            # directories, submodules, etc.
+            continue
+        if is_entry_up_to_date(entry, st, index_mtime_ns):
+            continue
+        blob_id = cache.get_blob_id(tree_path, st) if cache else None
+        if blob_id is None:
+            blob = blob_from_path_and_stat(full_path, st)
+            if normalizer is not None:
+                blob = normalizer.checkin_normalize(blob, tree_path)
+            blob_id = blob.id
+            if cache:
+                cache.set_blob_id(tree_path, st, blob_id)
+        if blob_id != entry.sha:
+            modified.add(tree_path)
+    if cache and paths is None:
+        cache.prune(set(index.paths()))
+    return modified, removed
+
+
+def get_untracked_paths(
+    repo: Repo,
+    index: Index,
+    ignores: Optional[IgnoreCache] = None,
+    dirs: Iterable[str] = ('',),
+) -> List[str]:
+    """
+    Return the untracked files of a repository, excluding the ignored ones.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    index : Index
+        Index of the repository.
+    ignores : Optional[IgnoreCache]
+        Ignore rules of the repository, reused across the computations.
+    dirs : Iterable[str]
+        Posix paths of the directories to consider, relative to the repository,
+        the whole working tree by default.
+
+    Returns
+    -------
+    List[str]
+        Posix paths relative to the repository.
+    """
+    if ignores is None:
+        ignores = IgnoreCache(repo)
+    return find_untracked(repo.path, index, ignores, dirs)
+
+
+def get_untracked_files(
+    repo: Repo, index: Index, paths: Iterable[bytes], ignores: Optional[IgnoreCache] = None
+) -> List[str]:
+    """
+    Return the untracked files among a set of paths, excluding the ignored ones.
+
+    The file system is scanned once per directory containing the paths,
+    without walking the working tree.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    index : Index
+        Index of the repository.
+    paths : Iterable[bytes]
+        Index paths to consider.
+    ignores : Optional[IgnoreCache]
+        Ignore rules of the repository, reused across the computations.
+
+    Returns
+    -------
+    List[str]
+        Posix paths relative to the repository.
+    """
+    dirs = {}
+    for path in paths:
+        if path not in index:
+            dir, _, name = path.rpartition(b'/')
+            dirs.setdefault(dir, []).append((path, name))
+    if not dirs:
+        return []
+    root = os.fsencode(repo.path)
+    if ignores is None:
+        ignores = IgnoreCache(repo)
+    untracked = []
+    for dir, files in dirs.items():
+        try:
+            with os.scandir(os.path.join(root, dir)) as it:
+                names = {_.name for _ in it if not _.is_dir()}
+        except OSError:
+            # missing directory
+            continue
+        for path, name in files:
+            if name in names:
+                file_str = path.decode('utf-8')
+                if not ignores.is_ignored(file_str):
+                    untracked.append(file_str)
+    return untracked
+
+
+def get_hidden_unstaged(
+    files_status: Dict[str, GitStatus], modified: Set[bytes], removed: Set[bytes]
+) -> Dict[str, GitStatus]:
+    """
+    Return the unstaged status of the files which status is staged.
+
+    The status of a file is staged when it has both staged and unstaged changes.
+
+    Parameters
+    ----------
+    files_status : Dict[str, GitStatus]
+        Status of the files, as returned by ``classify_files``.
+    modified : Set[bytes]
+        Tracked paths modified in the working tree.
+    removed : Set[bytes]
+        Tracked paths missing from the working tree.
+
+    Returns
+    -------
+    Dict[str, GitStatus]
+        Unstaged status of the files having some.
+    """
+    unstaged = {}
+    for paths, status in (
+        (modified, GitStatus.modified_unstaged),
+        (removed, GitStatus.removed_unstaged),
+    ):
+        for path in paths:
+            file = path.decode('utf-8')
+            if files_status.get(file) in STAGED_STATUSES:
+                unstaged[file] = status
+    return unstaged
+
+
+def get_effect(
+    operation: str, status: GitStatus, unstaged: Optional[GitStatus] = None, exists: bool = True
+) -> Optional[GitStatus]:
+    """
+    Return the status of a file after an operation.
+
+    Parameters
+    ----------
+    operation : str
+        Operation, either ``stage``, ``unstage`` or ``commit``.
+    status : GitStatus
+        Status of the file before the operation.
+    unstaged : Optional[GitStatus]
+        Unstaged status of the file when its status is staged, if any.
+    exists : bool, default: True
+        Whether the file exists in the working tree, considered for the staged deletions.
+
+    Returns
+    -------
+    Optional[GitStatus]
+        New status, ``GitStatus.none`` when the file is not known by Git anymore,
+        or ``None`` when the status can't be deduced.
+    """
+    if unstaged is not None:
+        # the content of the working tree is not known
+        if operation == 'stage' and unstaged == GitStatus.modified_unstaged:
+            return status
+        if operation == 'commit':
+            return unstaged
+        return None
+    if status == GitStatus.removed_staged:
+        if operation == 'commit':
+            return GitStatus.untracked if exists else GitStatus.none
+        # the content of a file created again is not known
+        return None if exists else EFFECTS[operation].get(status)
+    return EFFECTS[operation].get(status, status)
+
+
+def classify_files(
+    tracked: Iterable[bytes],
+    staged: Dict[str, List[bytes]],
+    modified: Set[bytes],
+    removed: Set[bytes],
+    untracked: Iterable[str],
+    scope: Optional[Set[bytes]] = None,
+) -> Dict[str, GitStatus]:
+    """
+    Return the status of the files of a repository.
+
+    The complexity is linear: each file is looked up in sets.
+
+    Parameters
+    ----------
+    tracked : Iterable[bytes]
+        Paths of the index.
+    staged : Dict[str, List[bytes]]
+        Paths added, deleted or modified in the index with respect to HEAD.
+    modified : Set[bytes]
+        Tracked paths modified in the working tree.
+    removed : Set[bytes]
+        Tracked paths missing from the working tree.
+    untracked : Iterable[str]
+        Untracked paths.
+    scope : Optional[Set[bytes]]
+        Paths to consider for the staged deletions, all when ``None``.
+
+    Returns
+    -------
+    Dict[str, GitStatus]
+        Status of the files, indexed by posix paths relative to the repository.
+    """
+    added = set(staged['add'])
+    modified_staged = set(staged['modify'])
+    files_status = {}
+    for file in tracked:
+        if file in added:
+            status = GitStatus.added
+        elif file in modified_staged:
+            status = GitStatus.modified_staged
+        elif file in removed:
+            status = GitStatus.removed_unstaged
+        elif file in modified:
+            status = GitStatus.modified_unstaged
+        else:
+            status = GitStatus.clean
+        files_status[file.decode('utf-8')] = status
+
+    # deleted staged files are not listed in the index
+    for file in staged['delete']:
+        if scope is None or file in scope:
+            files_status[file.decode('utf-8')] = GitStatus.removed_staged
+
+    # untracked files are not listed in the index
+    for file_str in untracked:
+        files_status[file_str] = GitStatus.untracked
+
+    return files_status
+
+
+def unstage_paths(repo: Repo, paths: Iterable[bytes]) -> Dict[bytes, str]:
+    """
+    Reset the index entries of files to their state in ``HEAD``.
+
+    The index is read and written once.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    paths : Iterable[bytes]
+        Index paths of the files.
+
+    Returns
+    -------
+    Dict[bytes, str]
+        Error messages, indexed by path, for the files which can't be unstaged.
+    """
+    errors = {}
+    index = repo.open_index()
+    try:
+        commit = repo[b'HEAD']
+    except KeyError:
+        # no commit yet: the files are being added
+        commit = None
+    paths = list(paths)
+    if isinstance(commit, Commit):
+        entries = lookup_tree_paths(repo.object_store, commit.tree, paths)
+        commit_time = commit.commit_time
+    else:
+        entries = {}
+        commit_time = 0
+    root = os.fsencode(repo.path)
+    for path in paths:
+        entry = entries.get(path)
+        if entry is None:
+            # the file is being added: remove it from the index
+            if path in index:
+                del index[path]
+            else:
+                errors[path] = 'file not in index'
+            continue
+        mode, sha = entry
+        try:
+            st = os.lstat(os.path.join(root, path.replace(b'/', os.fsencode(os.sep))))
+        except FileNotFoundError:
+            st = None
+        blob = repo.object_store[sha]
+        assert isinstance(blob, Blob)  # nosec B101  # addresses linter
+        index[path] = IndexEntry(
+            ctime=(commit_time, 0),
+            mtime=(commit_time, 0),
+            dev=st.st_dev if st else 0,
+            ino=st.st_ino if st else 0,
+            mode=mode,
+            uid=st.st_uid if st else 0,
+            gid=st.st_gid if st else 0,
+            size=len(blob.data),
+            sha=sha,
+            flags=0,
+            extended_flags=0,
+        )
+    index.write()
+    return errors
+
+
+def reset_paths(repo: Repo, paths: Iterable[bytes]) -> Dict[bytes, str]:
+    """
+    Restore the content of files from ``HEAD`` in the working tree.
+
+    The tree of ``HEAD`` is looked up once for all the files.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    paths : Iterable[bytes]
+        Index paths of the files.
+
+    Returns
+    -------
+    Dict[bytes, str]
+        Error messages, indexed by path, for the files which can't be restored.
+    """
+    errors = {}
+    commit = repo[b'HEAD']
+    assert isinstance(commit, Commit)  # nosec B101  # addresses linter
+    paths = list(paths)
+    entries = lookup_tree_paths(repo.object_store, commit.tree, paths)
+    root = os.fsencode(repo.path)
+    for path in paths:
+        entry = entries.get(path)
+        if entry is None:
+            errors[path] = 'file not in HEAD'
+            continue
+        mode, sha = entry
+        try:
+            blob = repo.object_store[sha]
+            assert isinstance(blob, Blob)  # nosec B101  # addresses linter
+            full_path = os.path.join(root, path.replace(b'/', os.fsencode(os.sep)))
+            build_file_from_blob(blob, mode, full_path)
+        except (OSError, KeyError) as e:
+            errors[path] = str(e)
+    return errors
 
 
 class GitClient(metaclass=ABCMeta):
@@ -100,6 +876,43 @@ class GitClient(metaclass=ABCMeta):
         self.branch = ''
         self.repo = None
         self.files_status = {}
+        # unstaged status of the files which also have staged changes
+        self.unstaged: Dict[str, GitStatus] = {}
+        # status of the other repositories containing files of the projects, indexed by path
+        self.siblings: Dict[str, RepoStatus] = {}
+        # status of the files by path folded with normcase, indexed by folded repository path,
+        # built on first use on case-insensitive platforms and reset when the status changes
+        self.folded_tables: Dict[str, Dict[str, GitStatus]] = {}
+        # stat data of the Git files after the last operation applied to the status
+        self.git_state: Optional[List[Tuple[str, Optional[Tuple[int, int]]]]] = None
+        # checksum of the index and HEAD commit of the current status
+        self.status_key: Tuple[str, str] = ('', '')
+        # status caches, indexed by repository path
+        self.stat_caches = {}
+        # files considered for the untracked files:
+        # UNTRACKED_NO, UNTRACKED_PROJECT or UNTRACKED_ALL
+        self.untracked_mode = UNTRACKED_ALL
+        # ignore rules, indexed by repository path
+        self.ignore_caches: Dict[str, IgnoreCache] = {}
+        # snapshots of the status of the projects, indexed by repository path
+        self.snapshots: Dict[str, StatusSnapshots] = {}
+        # handles of the repositories, reused across the operations
+        self.repo_pool = RepoPool()
+        # handles of the repositories reserved to the computations of the status,
+        # so that the commands do not share them with the worker threads
+        self.worker_pool = RepoPool()
+        # serialize the computations of the status of a repository, indexed by path
+        self.repo_locks: Dict[str, threading.Lock] = {}
+        # branches of the repositories, read again when the references change
+        self.branch_cache = BranchCache()
+        # durations of the Git operations, the slow ones are logged
+        self.instrumentation = Instrumentation(log=self.log)
+        # serializes the accesses to the repositories and caches
+        self.lock = threading.RLock()
+        # files which status is outdated, all if dirty_all is set
+        self.dirty_lock = threading.Lock()
+        self.dirty_paths: Set[str] = set()
+        self.dirty_all = False
         # check Dulwich version
         dulwich_ver = dulwich.__version__
         if dulwich_ver < min_dulwich_ver:  # pyright: ignore[reportOperatorIssue]
@@ -138,7 +951,7 @@ class GitClient(metaclass=ABCMeta):
         """
         return self.dulwich_ok
 
-    def refresh(self, project_path: str) -> bool:
+    def refresh(self, project_path: str, paths: Optional[Iterable[str]] = None) -> bool:
         """
         Get the status of the files for the input project.
 
@@ -146,71 +959,647 @@ class GitClient(metaclass=ABCMeta):
         ----------
         project_path : str
             Path of the SCADE project.
+        paths : Optional[Iterable[str]]
+            Paths of the files to consider, either absolute or relative to the
+            Git repository. When ``None``, the status is computed for the whole
+            working tree.
 
         Returns
         -------
         bool
         """
-        self.files_status = {}
-        if self.dulwich_ok:
-            self.repo_path = find_git_repo(project_path)
-        if self.repo_path:
-            path_repo = Path(self.repo_path)
-            self.repo_name = str(path_repo.name)
-            os.chdir(self.repo_path)
-            self.repo = Repo(self.repo_path)
-            ref_chain, _ = self.repo.refs.follow(b'HEAD')
-            # active_branch not supported by dulwich prior 20
-            self.branch = git.active_branch(self.repo).decode('utf-8')
-            # self.branch = str(Path(str(ref_chain[1].decode('utf-8'))).relative_to('refs/heads').as_posix()) # noqa: E501
-
-            # git status for the current repo
-            # typing annotation incorrect for git.status: str | Repo
-            staged, unstaged, untracked = git.status(self.repo)  # type: ignore
-
-            # list files & status in git repo
-            repo_files = git.ls_files(self.repo)
-            for file in repo_files:
-                file_str = file.decode('utf-8')
-                # ['added', 'removed_staged', 'modified_staged', 'modified_unstaged',
-                # 'untracked', 'removed_unstaged', 'clean', 'extern']
-                if file in staged['add']:
-                    status = GitStatus.added
-                # elif (file in staged['delete']):
-                #    status = GitStatus.removed_staged
-                elif file in staged['modify']:
-                    status = GitStatus.modified_staged
-                elif file in unstaged:
-                    file_abs_path = path_repo / file_str
-                    if file_abs_path.is_file():
-                        status = GitStatus.modified_unstaged
-                    else:
-                        status = GitStatus.removed_unstaged
-                # untracked files are not listed in ls_files
-                # elif (file_str in untracked):
-                #    status = GitStatus.untracked
-                else:
-                    status = GitStatus.clean
-                self.files_status[file_str] = status
-
-            # deleted staged files are not listed in ls_files
-            for file in staged['delete']:
-                file_str = file.decode('utf-8')
-                status = GitStatus.removed_staged
-                self.files_status[file_str] = status
-
-            # untracked files are not listed in ls_files
-            # untracked returned as str, Windows path in 19.13 but posix in 21.3
-            for file_str in untracked:
-                status = GitStatus.untracked
-                self.files_status[file_str] = status
-
-            return True
+        status = self.compute_status(project_path, paths)
+        self.apply_status(status)
+        return status.repo is not None
+
+    def compute_status(
+        self,
+        project_path: str,
+        paths: Optional[Iterable[str]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> RepoStatus:
+        """
+        Compute the status of the files for the input project.
+
+        The method does not modify the current status: it can be called
+        from a worker thread. Use ``apply_status`` to update the client.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+        paths : Optional[Iterable[str]]
+            Paths of the files to consider, either absolute or relative to the
+            Git repository. When ``None``, the status is computed for the whole
+            working tree.
+        cancel : Optional[threading.Event]
+            Event set when the computation is not needed anymore.
+
+        Returns
+        -------
+        RepoStatus
+
+        Raises
+        ------
+        RefreshCancelledError
+            The computation has been cancelled.
+        """
+        if not self.dulwich_ok:
+            return RepoStatus(self.repo_path)
+        repo_path = find_git_repo(project_path)
+        if not repo_path:
+            return RepoStatus()
+        groups: Dict[str, Optional[List[str]]] = {repo_path: None}
+        if paths is not None:
+            groups.update(group_paths(repo_path, paths))
+        # directory of the project, relative to the repository
+        project_dir = get_index_path(repo_path, os.path.dirname(os.path.abspath(project_path)))
+        if project_dir == '.':
+            project_dir = ''
+        args = []
+        with self.lock:
+            for path, group in groups.items():
+                repo_lock = self.repo_locks.setdefault(path, threading.Lock())
+                args.append((path, repo_lock, group, project_dir))
+                # the project is not located in the sibling repositories
+                project_dir = None
+
+        def compute(
+            path: str,
+            repo_lock: threading.Lock,
+            group: Optional[List[str]],
+            project_dir: Optional[str],
+        ) -> RepoStatus:
+            # the commands of the client are not blocked by the computation:
+            # only the computations of the same repository are serialized
+            with repo_lock:
+                repo = self.worker_pool.get(path)
+                cache = self.get_stat_cache(repo)
+                ignores = self.get_ignore_cache(repo)
+                status = self.compute_repo_status(
+                    path, repo, cache, ignores, group, cancel, project_dir
+                )
+                cache.save()
+            return status
+
+        if len(args) == 1:
+            statuses = [compute(*args[0])]
+        else:
+            # the repositories are independent: their status is computed concurrently
+            with ThreadPoolExecutor(min(len(args), MAX_WORKERS)) as executor:
+                statuses = list(executor.map(lambda _: compute(*_), args))
+        status = statuses[0]
+        status.siblings = {_.repo_path: _ for _ in statuses[1:]}
+        return status
+
+    def compute_repo_status(
+        self,
+        repo_path: str,
+        repo: Repo,
+        cache: StatCache,
+        ignores: IgnoreCache,
+        paths: Optional[List[str]] = None,
+        cancel: Optional[threading.Event] = None,
+        project_dir: Optional[str] = None,
+    ) -> RepoStatus:
+        """
+        Compute the status of the files of a repository.
+
+        The method must be called while holding the lock of the repository,
+        ``repo_locks[repo_path]``: it can be called concurrently for distinct
+        repositories.
+
+        The detection of the untracked files depends on ``untracked_mode``.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path of the repository.
+        repo : Repo
+            Git repository.
+        cache : StatCache
+            Status cache of the repository.
+        ignores : IgnoreCache
+            Ignore rules of the repository.
+        paths : Optional[List[str]]
+            Paths of the files to consider, either absolute or relative to the
+            Git repository. When ``None``, the status is computed for the whole
+            working tree.
+        cancel : Optional[threading.Event]
+            Event set when the computation is not needed anymore.
+        project_dir : Optional[str]
+            Posix path of the directory of the project, relative to the repository,
+            when the project belongs to the repository.
+
+        Returns
+        -------
+        RepoStatus
+
+        Raises
+        ------
+        RefreshCancelledError
+            The computation has been cancelled.
+        """
+        scope_str = None
+        # active_branch not supported by dulwich prior 20
+        branch = git.active_branch(repo).decode('utf-8')
+
+        # computed before reading the index: a concurrent change makes the key obsolete
+        key = get_status_key(repo)
+        # git status for the current repo, computed from sets
+        measure = self.instrumentation.measure
+        with measure('ls_files'):
+            index = repo.open_index()
+        with measure('status.staged', len(index)):
+            staged = get_staged_changes(repo, index, cache)
+        check_cancelled(cancel)
+        if paths is None:
+            with measure('status.unstaged', len(index)):
+                modified, removed = get_unstaged_changes(repo, index, cache, cancel=cancel)
+            check_cancelled(cancel)
+            if self.untracked_mode == UNTRACKED_NO:
+                dirs = []
+            elif self.untracked_mode == UNTRACKED_PROJECT and project_dir is not None:
+                dirs = [project_dir]
+            else:
+                dirs = ['']
+            with measure('status.untracked', len(index)):
+                untracked = get_untracked_paths(repo, index, ignores, dirs)
+            files_status = classify_files(index, staged, modified, removed, untracked)
+        else:
+            # restrict the computation to the input paths
+            scope = set()
+            for path in paths:
+                index_path = get_index_path(repo_path, path)
+                if index_path is not None:
+                    scope.add(index_path.encode('utf-8'))
+            scope_str = {_.decode('utf-8') for _ in scope}
+            tracked = [_ for _ in scope if _ in index]
+            with measure('status.unstaged', len(tracked)):
+                modified, removed = get_unstaged_changes(repo, index, cache, tracked, cancel)
+            check_cancelled(cancel)
+            if self.untracked_mode == UNTRACKED_NO:
+                untracked = []
+            else:
+                # the scope is already restricted to the files of the project
+                with measure('status.untracked', len(scope)):
+                    untracked = get_untracked_files(repo, index, scope, ignores)
+            files_status = classify_files(tracked, staged, modified, removed, untracked, scope)
+        unstaged = get_hidden_unstaged(files_status, modified, removed)
+        return RepoStatus(repo_path, repo, branch, files_status, scope_str, unstaged, key)
+
+    def apply_status(self, status: RepoStatus, incremental: bool = False):
+        """
+        Set the current status of the files.
+
+        Parameters
+        ----------
+        status : RepoStatus
+            Status computed by ``compute_status``.
+        incremental : bool
+            Whether the status updates the current status, for the files
+            of its scope only, or replaces it.
+        """
+        # log the slow calls of the computation, if run in a worker thread
+        self.instrumentation.flush()
+        # the Git files do not reflect an operation of the client anymore
+        self.git_state = None
+        self.folded_tables = {}
+        if incremental and status.repo_path == self.repo_path and status.scope is not None:
+            # the dictionaries of the client are updated in place
+            current = RepoStatus(
+                self.repo_path,
+                files_status=self.files_status,
+                unstaged=self.unstaged,
+                siblings=self.siblings,
+            )
+            current.merge(status)
+            return
+        self.repo_path = status.repo_path
+        self.files_status = status.files_status
+        self.unstaged = status.unstaged
+        self.siblings = status.siblings
+        self.status_key = status.key
+        if status.repo is not None:
+            self.repo_name = str(Path(self.repo_path).name)
+            self.repo = status.repo
+            self.branch = status.branch
         else:
             self.repo_name = ''
             self.branch = ''
             self.repo = None
+
+    def get_repo(self, repo_path: Optional[str] = None) -> Repo:
+        """
+        Return the handle of a repository, reopened if its packs or references changed.
+
+        The method must be called while holding ``lock``.
+
+        Parameters
+        ----------
+        repo_path : Optional[str]
+            Path of a repository containing files of the projects,
+            the current repository when ``None``.
+
+        Returns
+        -------
+        Repo
+        """
+        if repo_path is not None and repo_path != self.repo_path:
+            return self.repo_pool.get(repo_path)
+        self.repo = self.repo_pool.get(self.repo_path)
+        return self.repo
+
+    def get_statuses(self) -> List[Tuple[str, Dict[str, GitStatus], Dict[str, GitStatus]]]:
+        """
+        Return the status of the current repository and of the other repositories.
+
+        Returns
+        -------
+        List[Tuple[str, Dict[str, GitStatus], Dict[str, GitStatus]]]
+            Path, status of the files and unstaged status of the files which
+            also have staged changes, for each repository, the most specific
+            first: for example, a submodule before its parent repository.
+        """
+        statuses = [(self.repo_path, self.files_status, self.unstaged)]
+        statuses += [(_.repo_path, _.files_status, _.unstaged) for _ in self.siblings.values()]
+        statuses.sort(key=lambda _: len(os.path.normpath(_[0])), reverse=True)
+        return statuses
+
+    def locate_file(self, file_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Return the repository of a file, among the current ones, and its path relative to it.
+
+        Parameters
+        ----------
+        file_path : str
+            Input path, either absolute or relative to the current repository.
+
+        Returns
+        -------
+        Optional[Tuple[str, str]]
+            Path of the repository and posix path of the file relative to the
+            repository, ``None`` if the file is not in a repository.
+        """
+        if not self.repo_path:
+            return None
+        if not os.path.isabs(file_path):
+            return self.repo_path, Path(file_path).as_posix()
+        for repo_path, _, _ in self.get_statuses():
+            index_path = get_index_path(repo_path, file_path)
+            if index_path is not None:
+                return repo_path, index_path
+        return None
+
+    def get_index_path(self, file_path: str) -> Optional[str]:
+        """
+        Return the path of a file relative to the repository.
+
+        Parameters
+        ----------
+        file_path : str
+            Input path, either absolute or relative to the Git repository.
+
+        Returns
+        -------
+        Optional[str]
+            Posix path relative to the repository, ``None`` if the file
+            is not in the repository.
+        """
+        return get_index_path(self.repo_path, file_path)
+
+    def invalidate(self, paths: Optional[Iterable[str]] = None, git_changed: bool = False):
+        """
+        Mark the status of files as outdated.
+
+        This method can be called from any thread.
+
+        Parameters
+        ----------
+        paths : Optional[Iterable[str]]
+            Paths of the files, either absolute or relative to the Git repository.
+            When ``None``, the status of all the files is outdated.
+        git_changed : bool
+            Whether a Git file changed, for example the index: the status of
+            all the files is outdated, unless the change has been made by the
+            client and already applied to the status.
+        """
+        with self.dirty_lock:
+            if paths is None:
+                self.dirty_all = True
+            elif git_changed and (self.git_state is None or self.git_state != self.get_git_state()):
+                self.dirty_all = True
+            if self.dirty_all:
+                self.dirty_paths.clear()
+            else:
+                self.dirty_paths.update(paths or [])
+
+    def is_dirty(self) -> bool:
+        """
+        Return whether the status of some files is outdated.
+
+        Returns
+        -------
+        bool
+        """
+        with self.dirty_lock:
+            return self.dirty_all or bool(self.dirty_paths)
+
+    def pop_dirty(self) -> Tuple[bool, Set[str]]:
+        """
+        Return and clear the files which status is outdated.
+
+        Returns
+        -------
+        Tuple[bool, Set[str]]
+            Whether the status of all the files is outdated, and the outdated files otherwise.
+        """
+        with self.dirty_lock:
+            dirty = self.dirty_all, self.dirty_paths
+            self.dirty_all = False
+            self.dirty_paths = set()
+        return dirty
+
+    def get_watch_paths(self) -> List[str]:
+        """
+        Return the Git files which changes invalidate the status of all the files.
+
+        These are the index, ``HEAD`` and the references of the active branch.
+
+        Returns
+        -------
+        List[str]
+        """
+        if not self.repo:
+            return []
+        paths = get_repo_watch_paths(self.repo, self.branch)
+        for sibling in self.siblings.values():
+            if sibling.repo is not None:
+                paths.extend(get_repo_watch_paths(sibling.repo, sibling.branch))
+        return paths
+
+    def get_git_state(self) -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+        """
+        Return the modification time and size of the Git files which are watched.
+
+        Returns
+        -------
+        List[Tuple[str, Optional[Tuple[int, int]]]]
+            Stat data of the files returned by ``get_watch_paths``, ``None``
+            for the missing files.
+        """
+        state = []
+        for path in self.get_watch_paths():
+            try:
+                st = os.stat(path)
+            except OSError:
+                state.append((path, None))
+            else:
+                state.append((path, (st.st_mtime_ns, st.st_size)))
+        return state
+
+    def update_status(self, operation: str, files: Iterable[str]) -> bool:
+        """
+        Apply the known effect of an operation to the status of files.
+
+        The status is updated only when the effect is known for all the files.
+        The resulting state of the Git files is recorded so that their changes,
+        caused by the operation, do not invalidate the status.
+
+        Parameters
+        ----------
+        operation : str
+            Operation performed on the files, either ``stage``, ``unstage`` or ``commit``.
+        files : Iterable[str]
+            Paths of the files, either absolute or relative to the Git repository.
+            They are ignored for ``commit``, which applies to all the staged files
+            of the current repository.
+
+        Returns
+        -------
+        bool
+            Whether the status is updated, ``False`` when it must be computed again.
+        """
+        if not self.repo:
             return False
+        # status of the files and hidden unstaged status, indexed by repository
+        tables = {
+            repo_path: (files_status, unstaged)
+            for repo_path, files_status, unstaged in self.get_statuses()
+        }
+        if operation == 'commit':
+            paths = [
+                (self.repo_path, _)
+                for _, status in self.files_status.items()
+                if status in STAGED_STATUSES
+            ]
+        else:
+            paths = []
+            for file in files:
+                location = self.locate_file(file)
+                if location is None or location[1] not in tables[location[0]][0]:
+                    return False
+                paths.append(location)
+        updates = {}
+        for repo_path, path in paths:
+            files_status, unstaged = tables[repo_path]
+            status = files_status[path]
+            exists = status != GitStatus.removed_staged or os.path.exists(
+                os.path.join(repo_path, path)
+            )
+            status = get_effect(operation, status, unstaged.get(path), exists)
+            if status is None:
+                return False
+            updates[repo_path, path] = status
+        for (repo_path, path), status in updates.items():
+            files_status, unstaged = tables[repo_path]
+            unstaged.pop(path, None)
+            if status == GitStatus.none:
+                del files_status[path]
+            else:
+                files_status[path] = status
+        self.folded_tables = {}
+        self.git_state = self.get_git_state()
+        with self.lock:
+            self.status_key = get_status_key(self.get_repo())
+            # the other repositories modified by the operation
+            for repo_path in {path for path, _ in updates} - {self.repo_path}:
+                self.siblings[repo_path].key = get_status_key(self.get_repo(repo_path))
+        return True
+
+    def get_snapshots(self, repo: Repo) -> StatusSnapshots:
+        """
+        Return the snapshots of the status of a repository, loaded on first use.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+
+        Returns
+        -------
+        StatusSnapshots
+        """
+        snapshots = self.snapshots.get(repo.path)
+        if snapshots is None:
+            snapshots = StatusSnapshots(repo.controldir())
+            snapshots.load()
+            self.snapshots[repo.path] = snapshots
+        return snapshots
+
+    def load_snapshot(self, project_path: str) -> Optional[RepoStatus]:
+        """
+        Return the last saved status of a project if the index and HEAD did not change.
+
+        The working tree may have changed since: the status must be confirmed
+        by a computation. The status of the other repositories containing files
+        of the project is restored as well: the snapshot is obsolete when the
+        index or HEAD of any of them changed.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+
+        Returns
+        -------
+        Optional[RepoStatus]
+            Saved status, ``None`` if there is none or if it is obsolete.
+        """
+        if not self.dulwich_ok:
+            return None
+        repo_path = find_git_repo(project_path)
+        if not repo_path:
+            return None
+        with self.lock:
+            repo = self.repo_pool.get(repo_path)
+            key = get_status_key(repo)
+            snapshots = self.get_snapshots(repo)
+            snapshot = snapshots.get(project_path, key)
+            if snapshot is None:
+                return None
+            try:
+                branch, statuses = snapshot
+                files_status, unstaged = get_snapshot_status(statuses)
+                status = RepoStatus(repo_path, repo, branch, files_status, None, unstaged, key)
+                # the other repositories must not have changed either
+                siblings = snapshots.get_siblings(project_path)
+                for path, (sibling_key, branch, statuses) in siblings.items():
+                    sibling_repo = self.repo_pool.get(path)
+                    if not sibling_key[0] or get_status_key(sibling_repo) != sibling_key:
+                        return None
+                    files_status, unstaged = get_snapshot_status(statuses)
+                    status.siblings[path] = RepoStatus(
+                        path, sibling_repo, branch, files_status, None, unstaged, sibling_key
+                    )
+            except NotGitRepository:
+                # the other repository has been removed
+                return None
+            except KeyError:
+                # unknown status
+                return None
+        return status
+
+    def save_snapshot(self, project_path: str):
+        """
+        Save the current status of a project, to be displayed at the next startup.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+        """
+        if not self.repo or not self.status_key[0]:
+            return
+        files = {path: status.name for path, status in self.files_status.items()}
+        unstaged = {path: status.name for path, status in self.unstaged.items()}
+        siblings = {}
+        for path, sibling in self.siblings.items():
+            sibling_files = {_: status.name for _, status in sibling.files_status.items()}
+            sibling_unstaged = {_: status.name for _, status in sibling.unstaged.items()}
+            siblings[path] = sibling.key, sibling.branch, (sibling_files, sibling_unstaged)
+        snapshots = self.get_snapshots(self.repo)
+        snapshots.set(project_path, self.status_key, self.branch, (files, unstaged), siblings)
+
+    def get_stat_cache(self, repo: Repo) -> StatCache:
+        """
+        Return the status cache of a repository, loaded on first use.
+
+        The method must be called while holding the lock of the repository.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+
+        Returns
+        -------
+        StatCache
+        """
+        cache = self.stat_caches.get(repo.path)
+        if cache is None:
+            cache = StatCache(repo.controldir())
+            cache.load()
+            self.stat_caches[repo.path] = cache
+        return cache
+
+    def get_ignore_cache(self, repo: Repo) -> IgnoreCache:
+        """
+        Return the ignore rules of a repository, compiled again if an ignore file changed.
+
+        The method must be called while holding the lock of the repository.
+
+        Parameters
+        ----------
+        repo : Repo
+            Git repository.
+
+        Returns
+        -------
+        IgnoreCache
+        """
+        ignores = self.ignore_caches.get(repo.path)
+        if ignores is None:
+            ignores = IgnoreCache(repo)
+            self.ignore_caches[repo.path] = ignores
+        ignores.validate()
+        return ignores
+
+    def set_untracked_mode(self, mode: str):
+        """
+        Set the files considered for the untracked files.
+
+        Parameters
+        ----------
+        mode : str
+            ``UNTRACKED_NO``, ``UNTRACKED_PROJECT`` or ``UNTRACKED_ALL``.
+
+        Raises
+        ------
+        ValueError
+            The mode is unknown.
+        """
+        if mode not in UNTRACKED_MODES:
+            raise ValueError(f'{mode}: unknown untracked mode, expected one of {UNTRACKED_MODES}')
+        self.untracked_mode = mode
+
+    def set_slow_call_threshold(self, threshold: float):
+        """
+        Set the minimum duration of the Git operations to log.
+
+        Parameters
+        ----------
+        threshold : float
+            Duration in seconds, ``0`` to log all the operations.
+
+        Raises
+        ------
+        ValueError
+            The duration is negative.
+        """
+        if threshold < 0:
+            raise ValueError(f'{threshold}: the threshold must not be negative')
+        self.instrumentation.threshold = threshold
 
     def get_branch_list(self) -> List[str]:
         """
@@ -220,13 +1609,68 @@ class GitClient(metaclass=ABCMeta):
         -------
         List[str]
         """
-        if self.repo_path:
-            branches = git.branch_list(self.repo)
-            branches = [x.decode('utf-8') for x in branches]
+        if self.repo:
+            with self.lock:
+                with self.instrumentation.measure('branch_list'):
+                    branches = list(self.branch_cache.get(self.get_repo(), remotes=False))
         else:
             branches = []
         return branches
 
+    def get_branches(
+        self, prefix: str = '', start: int = 0, count: Optional[int] = None, remotes: bool = True
+    ) -> Tuple[List[str], int]:
+        """
+        Return a page of the repository's branches starting with a prefix.
+
+        The list of the branches is cached until the references of the repository change.
+
+        Parameters
+        ----------
+        prefix : str, default: ''
+            Prefix of the branches, all the branches when empty.
+        start : int, default: 0
+            Index of the first branch of the page.
+        count : Optional[int]
+            Maximum number of branches of the page, all the remaining branches when ``None``.
+        remotes : bool, default: True
+            Whether to add the remote-tracking branches, for example ``origin/main``.
+
+        Returns
+        -------
+        Tuple[List[str], int]
+            Branches of the page and total number of branches starting with the prefix.
+        """
+        if not self.repo:
+            return [], 0
+        with self.lock:
+            with self.instrumentation.measure('branch_list'):
+                return self.branch_cache.filter(self.get_repo(), prefix, start, count, remotes)
+
+    def get_branch_infos(self, branches: Iterable[str]) -> Dict[str, BranchInfo]:
+        """
+        Return the metadata of the last commits of branches.
+
+        Parameters
+        ----------
+        branches : Iterable[str]
+            Local or remote-tracking branches, for example the displayed ones.
+
+        Returns
+        -------
+        Dict[str, BranchInfo]
+            Metadata of the existing branches.
+        """
+        infos = {}
+        if self.repo:
+            with self.lock:
+                repo = self.get_repo()
+                for branch in branches:
+                    info = self.branch_cache.get_info(repo, branch)
+                    if info is not None:
+                        infos[branch] = info
+        return infos
+
     def get_file_status(self, file_path: str) -> Tuple[str, GitStatus]:
         """
         Return the Git status of a file.
@@ -240,65 +1684,154 @@ class GitClient(metaclass=ABCMeta):
         -------
         Tuple[str, GitStatus]
         """
-        if self.repo_path:
-            try:
-                path = Path(file_path)
-                if path.is_absolute():
-                    abspath = path
-                    index_file_name = path.relative_to(self.repo_path).as_posix()
-                else:
-                    index_file_name = path.as_posix()
-                    abspath = Path(self.repo_path) / path
-                status = self.files_status.get(index_file_name, None)
-                if not status:
-                    self.log("not status: %s %s" % (abspath, abspath.exists()))
-                    status = GitStatus.untracked if abspath.exists() else GitStatus.error
-                return index_file_name, status
-            except ValueError:
-                return file_path, GitStatus.extern
-        else:
-            return '', GitStatus.none
+        return self.get_file_statuses([file_path])[0]
+
+    def get_file_statuses(
+        self, file_paths: Iterable[str], existing: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, GitStatus]]:
+        """
+        Return the Git status of files.
+
+        The paths are normalized with respect to their repository in a single pass,
+        case-insensitively on the platforms with case-insensitive file systems.
+        The files with no status are searched in the file system with a single
+        scan per directory.
+
+        Parameters
+        ----------
+        file_paths : Iterable[str]
+            Input paths, either absolute or relative to the Git repository.
+        existing : Optional[Iterable[str]]
+            Absolute paths of files known to exist, for example companion
+            files already found: they are not searched again.
+
+        Returns
+        -------
+        List[Tuple[str, GitStatus]]
+            Path relative to the repository, absolute path for the files of
+            the other repositories, or input path for the files external to
+            the repositories, and status of each file.
+        """
+        file_paths = [os.fspath(_) for _ in file_paths]
+        if not self.repo_path:
+            return [('', GitStatus.none)] * len(file_paths)
+        tables = []
+        for repo_path, files_status, _ in self.get_statuses():
+            root = os.path.normpath(repo_path)
+            tables.append((os.path.join(os.path.normcase(root), ''), root, files_status))
+        current = next(_ for _ in tables if _[2] is self.files_status)
+        case_insensitive = os.path.normcase('A') != 'A'
+
+        results = []
+        misses = {}
+        for i, file_path in enumerate(file_paths):
+            if os.path.isabs(file_path):
+                abspath = os.path.normpath(file_path)
+                key = os.path.normcase(abspath)
+                table = next((_ for _ in tables if key.startswith(_[0])), None)
+                if table is None:
+                    results.append((file_path, GitStatus.extern))
+                    continue
+                index_file_name = Path(abspath[len(table[0]) :]).as_posix()
+            else:
+                table = current
+                index_file_name = Path(file_path).as_posix()
+                abspath = os.path.join(table[1], file_path)
+            root_key, _, files_status = table
+            status = files_status.get(index_file_name)
+            if status is None and case_insensitive:
+                folded = self.folded_tables.get(root_key)
+                if folded is None:
+                    folded = {os.path.normcase(_): status for _, status in files_status.items()}
+                    self.folded_tables[root_key] = folded
+                status = folded.get(os.path.normcase(index_file_name))
+            if status is None:
+                misses[i] = abspath
+            if table is not current:
+                # the files of the other repositories are identified by their absolute path
+                index_file_name = abspath
+            results.append((index_file_name, status))
+
+        if misses:
+            known = {os.path.normpath(_) for _ in existing} if existing else set()
+            found = known.intersection(misses.values())
+            found |= get_existing_paths(_ for _ in misses.values() if _ not in found)
+            for i, abspath in misses.items():
+                status = GitStatus.untracked if abspath in found else GitStatus.error
+                results[i] = results[i][0], status
+            self.log(
+                'not status: {0} file(s), {1} not found'.format(
+                    len(misses), len(misses) - len(found)
+                )
+            )
+        return results
 
-    def stage(self, files: List[str]):
+    def stage(self, files: List[str]) -> bool:
         """
-        Add the input files to the Git index.
+        Add the input files to the index of their repository.
 
         Parameters
         ----------
         files : List[str]
             List of files to stage. The paths are either absolute or
             relative to the Git repository.
+
+        Returns
+        -------
+        bool
+            Whether all the files are staged.
         """
         if self.repo:
-            try:
-                # porcelain.add accepts any paths, absolute or relative to the repo,
-                # as well as repos (incorrect typing annotation)
-                return git.add(self.repo, files)  # type: ignore
-            except BaseException as e:
-                self.log('Error stage: .{0}'.format(e))
+            with self.lock:
+                groups = self.group_files(files, 'stage')
+                count = 0
+                for repo_path, paths in groups.items():
+                    # porcelain.add interprets relative paths with respect to the current
+                    # directory in older versions of Dulwich: use absolute paths
+                    paths = [str(Path(repo_path, _)) for _ in paths]
+                    try:
+                        # porcelain.add stages all the files with a single index write
+                        # and accepts repos (incorrect typing annotation)
+                        with self.instrumentation.measure('add', len(paths)):
+                            git.add(self.get_repo(repo_path), paths)  # type: ignore
+                    except BaseException as e:
+                        self.log('Error stage: .{0}'.format(e))
+                    else:
+                        count += len(paths)
+                return count == len(files)
+        return False
 
-    def unstage(self, files: List[str]):
+    def unstage(self, files: List[str]) -> bool:
         """
-        Remove the input from the Git index.
+        Remove the input from the index of their repository.
 
         Parameters
         ----------
         files : List[str]
             List of files to unstage. The paths are either absolute or
             relative to the Git repository.
+
+        Returns
+        -------
+        bool
+            Whether all the files are unstaged.
         """
         if self.repo:
-            for file in files:
-                try:
-                    # repo.unstage only accepts relative paths to the repo path
-                    file_path = Path(file)
-                    if file_path.is_absolute():
-                        index_file = file_path.relative_to(self.repo_path).as_posix()
+            with self.lock:
+                groups = self.group_files(files, 'unstage')
+                count = 0
+                for repo_path, paths in groups.items():
+                    tree_paths = [_.encode('utf-8') for _ in paths]
+                    try:
+                        with self.instrumentation.measure('unstage', len(tree_paths)):
+                            errors = unstage_paths(self.get_repo(repo_path), tree_paths)
+                    except BaseException as e:
+                        self.log('Error unstage: {0}'.format(e))
                     else:
-                        index_file = file
-                    self.repo.unstage([index_file])
-                except BaseException as e:
-                    self.log('Error unstage: {0}'.format(e))
+                        self.log_errors(errors, 'unstage')
+                        count += len(tree_paths) - len(errors)
+                return count == len(files)
+        return False
 
     def reset_files(self, files: List[str]):
         """
@@ -311,23 +1844,62 @@ class GitClient(metaclass=ABCMeta):
             relative to the Git repository.
         """
         if self.repo:
-            for file in files:
-                try:
-                    # porcelain.reset_file only accepts relative paths to the repo path
-                    file_path = Path(file)
-                    if file_path.is_absolute():
-                        # index_file = file_path.relative_to(self.repo_path).as_posix()
-                        index_file = str(file_path.relative_to(self.repo_path))
+            with self.lock:
+                for repo_path, paths in self.group_files(files, 'reset').items():
+                    tree_paths = [_.encode('utf-8') for _ in paths]
+                    try:
+                        with self.instrumentation.measure('reset_file', len(tree_paths)):
+                            errors = reset_paths(self.get_repo(repo_path), tree_paths)
+                    except BaseException as e:
+                        self.log('Error reset: {0}'.format(e))
                     else:
-                        index_file = file
-                    git.reset_file(self.repo, index_file)
-                except BaseException as e:
-                    self.log('Error reset: {0}'.format(e))
+                        self.log_errors(errors, 'reset')
+
+    def group_files(self, files: List[str], operation: str) -> Dict[str, List[str]]:
+        """
+        Group files by repository, and log the files outside of the repositories.
+
+        Parameters
+        ----------
+        files : List[str]
+            Paths of the files, either absolute or relative to the Git repository.
+        operation : str
+            Name of the operation, for the error messages.
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            Posix paths relative to the repository, indexed by repository.
+        """
+        groups = {}
+        for file in files:
+            location = self.locate_file(file)
+            if location is None:
+                self.log('Error {0}: {1} is not in the repository'.format(operation, file))
+            else:
+                groups.setdefault(location[0], []).append(location[1])
+        return groups
+
+    def log_errors(self, errors: Dict[bytes, str], operation: str):
+        """
+        Log the errors of a batch operation, one line per file.
+
+        Parameters
+        ----------
+        errors : Dict[bytes, str]
+            Error messages, indexed by path.
+        operation : str
+            Name of the operation.
+        """
+        for path, message in errors.items():
+            self.log('Error {0}: {1}: {2}'.format(operation, path.decode('utf-8'), message))
 
     def reset(self):
         """Discard all the changes."""
         if self.repo:
-            git.reset(self.repo, 'hard')
+            with self.lock:
+                with self.instrumentation.measure('reset'):
+                    git.reset(self.get_repo(), 'hard')
 
     def archive(self, branch: str, file: str) -> bool:
         """
@@ -341,15 +1913,71 @@ class GitClient(metaclass=ABCMeta):
             Output file.
         """
         if self.repo:
-            try:
-                with Path(file).open('wb') as f:
-                    git.archive(self.repo, branch, f)
-                return True
-            except BaseException as e:
-                self.log('Error archive: {0}'.format(e))
+            with self.lock:
+                try:
+                    with Path(file).open('wb') as f, self.instrumentation.measure('archive'):
+                        git.archive(self.get_repo(), branch, f)
+                    return True
+                except BaseException as e:
+                    self.log('Error archive: {0}'.format(e))
         return False
 
-    def commit(self, commit_text: str):
+    def materialize_project(
+        self,
+        branch: str,
+        project_path: str,
+        target_dir: str,
+        cache: Optional[WorkspaceCache] = None,
+    ) -> str:
+        """
+        Write the files of a project, as present in a branch, to a directory.
+
+        Only the project, its files and the annotation files of its models
+        are written: the result is the working copy of the project for
+        the branch, rooted at ``target_dir``. When the directory is an existing
+        working copy, only the files which differ are written.
+
+        Parameters
+        ----------
+        branch : str
+            Name of the branch.
+        project_path : str
+            Path of the project, either absolute or relative to the Git repository.
+        target_dir : str
+            Output directory.
+        cache : Optional[WorkspaceCache]
+            Cache of working copies the output directory belongs to, if any.
+
+        Returns
+        -------
+        str
+            Path of the project in the output directory, empty if the project
+            is not present in the branch.
+        """
+        if self.repo:
+            project = get_index_path(self.repo_path, project_path)
+            if project is None:
+                self.log('Error diff: {0} is not in the repository'.format(project_path))
+                return ''
+            with self.lock:
+                blob_store = cache.blob_store if cache is not None else None
+                try:
+                    repo = self.get_repo()
+                    with self.instrumentation.measure('materialize'):
+                        path = materialize_project(
+                            repo, branch, project, Path(target_dir), blob_store=blob_store
+                        )
+                    if cache is not None:
+                        cache.evict(keep=Path(target_dir))
+                except BaseException as e:
+                    self.log('Error diff: {0}'.format(e))
+                    return ''
+            if path is not None:
+                return str(path)
+            self.log('Error diff: {0} is not present in {1}'.format(project, branch))
+        return ''
+
+    def commit(self, commit_text: str) -> bool:
         """
         Commit the changes.
 
@@ -357,7 +1985,19 @@ class GitClient(metaclass=ABCMeta):
         ----------
         commit_text : str
             Message associated to the commit.
+
+        Returns
+        -------
+        bool
+            Whether the changes are committed.
         """
         if self.repo:
-            # typing annotation incorrect for git.commit: str | Repo
-            git.commit(self.repo, message=commit_text)  # type: ignore
+            with self.lock:
+                try:
+                    # typing annotation incorrect for git.commit: str | Repo
+                    with self.instrumentation.measure('commit', len(self.files_status)):
+                        git.commit(self.get_repo(), message=commit_text)  # type: ignore
+                    return True
+                except BaseException as e:
+                    self.log('Error commit: {0}'.format(e))
+        return False
@@ -22,17 +22,30 @@
 
 """SCADE custom extension for Git."""
 
+from collections import Counter
 import os
 from pathlib import Path
-import shutil
-import tarfile
 import tempfile
-from typing import Union
+import threading
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import scade
 from scade.model.project.stdproject import FileRef, Project
 
-from ansys.scade.git.extension.gitclient import GitClient, GitStatus
+from ansys.scade.git.extension.commands import (  # noqa: F401  # res: public API
+    command_data,
+    res,
+)
+from ansys.scade.git.extension.companions import CompanionFinder
+from ansys.scade.git.extension.discovery import repo_discovery
+from ansys.scade.git.extension.gitclient import (
+    GitClient,
+    GitStatus,
+    RefreshCancelledError,
+    RepoStatus,
+)
+from ansys.scade.git.extension.watcher import Watcher, create_watcher
+from ansys.scade.git.extension.workspace import WorkspaceCache
 from ansys.scade.guitools.command import Command
 from ansys.scade.guitools.ide import Ide
 
@@ -42,24 +55,29 @@ BrowserCat = {
     'Unstaged': 'Unstaged files',
     'Clean': 'Clean files',
     'Extern': 'Extern files',
+    'Refreshing': 'Refreshing...',
 }
 
 
-def create_temp_dir(folder: str):
+def get_workspace_cache(repo_name: str) -> WorkspaceCache:
     """
-    Create a temporary directory.
-
-    If the folder already exists, it is deleted.
+    Return the cache of the working copies used for the diffs of a repository.
 
     Parameters
     ----------
-    text : str
-        Message to display.
+    repo_name : str
+        Name of the repository.
+
+    Returns
+    -------
+    WorkspaceCache
     """
-    tmp_dir = Path(tempfile.gettempdir()) / folder
-    shutil.rmtree(tmp_dir, ignore_errors=True)
-    tmp_dir.mkdir(parents=True)
-    return tmp_dir
+    cache = workspace_caches.get(repo_name)
+    if cache is None:
+        root = Path(tempfile.gettempdir()) / 'SCADE' / 'git-diff' / repo_name
+        cache = WorkspaceCache(root)
+        workspace_caches[repo_name] = cache
+    return cache
 
 
 def create_browser(ide: Ide, branch_name: str):
@@ -81,41 +99,205 @@ def create_browser(ide: Ide, branch_name: str):
     ide.browser_report(BrowserCat['Extern'], branch_name, False)
 
 
-def report_item(ide: Ide, item: Union[Project, FileRef, str]) -> str:
+def get_item_data(
+    item: Union[Project, FileRef, str], file_status: Tuple[str, GitStatus]
+) -> Tuple[str, str, str, str]:
     """
-    Add an item to the Git browser and return its path.
-
-    The item is attached to one of the predefined categories with respect to
-    its status. It can be
+    Return how an item is displayed in the Git browser.
 
     Parameters
     ----------
-    ide : Studio
-        SCADE IDE environment.
     item: Union[Project, FileRef, str]
         Element to add to the browser: Either a SCADE Python object or a string.
+    file_status : Tuple[str, GitStatus]
+        Status of the item, as returned by ``get_file_statuses``.
+
+    Returns
+    -------
+    Tuple[str, str, str, str]
+        Path relative to the repository, browser category, icon and name of the item.
     """
-    assert _git_client is not None  # nosec B101  # addresses linter
+    index_file_name, status = file_status
+    browser_cat, icon = status_data.get(status, status_data[GitStatus.extern])
+    if isinstance(item, str) or isinstance(item, Project):
+        name = index_file_name
+    else:
+        name = item.persist_as if Path(index_file_name).is_absolute() else index_file_name
+    return index_file_name, browser_cat, icon, name
+
+
+def display_item(
+    ide: Ide, item: Union[Project, FileRef, str], browser_cat: str, icon: str, name: str
+):
+    """Add an item to a category of the Git browser."""
     if isinstance(item, str):
-        index_file_name, status = _git_client.get_file_status(item)
-        browser_cat, icon = status_data.get(status, status_data[GitStatus.extern])
-        project_files_status[browser_cat].append(index_file_name)
-        ide.browser_report(index_file_name, browser_cat, icon_file=icon)
+        ide.browser_report(name, browser_cat, icon_file=icon)
     else:
-        index_file_name, status = _git_client.get_file_status(item.pathname)
-        browser_cat, icon = status_data.get(status, status_data[GitStatus.extern])
-        project_files_status[browser_cat].append(index_file_name)
-        if isinstance(item, Project):
-            name = index_file_name
-        else:
-            name = item.persist_as if Path(index_file_name).is_absolute() else index_file_name
         ide.browser_report(item, browser_cat, icon_file=icon, name=name)
-    return index_file_name
+
+
+def get_project_paths(ide: Ide) -> List[str]:
+    """
+    Return the paths of the files displayed in the Git browser.
+
+    These are the loaded projects, their files, and the companion
+    files of these files, for example the annotation files of the SCADE models.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
+    paths = []
+    for project in ide.get_projects():
+        paths.append(project.pathname)
+        for fr in project.file_refs:
+            paths.append(fr.pathname)
+            paths.extend(companion_finder.get_candidates(fr.pathname))
+    return paths
+
+
+class DisplayedStatus:
+    """
+    Content of the Git browser, to update it with the differences only.
+
+    The browser can't remove or modify its items: it is created again
+    unless the new content only adds items to the displayed ones.
+    """
+
+    def __init__(self):
+        self.header: Optional[Tuple[str, str]] = None
+        # type, path, category, icon and name of the displayed items
+        self.rows: List[Tuple[str, str, str, str, str]] = []
+
+    def get_additions(
+        self, header: Tuple[str, str], rows: List[Tuple[str, str, str, str, str]]
+    ) -> Optional[List[int]]:
+        """
+        Return the indexes of the rows to add to the browser to display the new content.
+
+        Parameters
+        ----------
+        header : Tuple[str, str]
+            Repository and branch of the new content.
+        rows : List[Tuple[str, str, str, str, str]]
+            New content.
+
+        Returns
+        -------
+        Optional[List[int]]
+            Rows to add, none when the content is unchanged, ``None`` when
+            the browser must be created again.
+        """
+        if header != self.header:
+            return None
+        displayed = Counter(self.rows)
+        additions = []
+        for i, row in enumerate(rows):
+            if displayed[row] > 0:
+                displayed[row] -= 1
+            else:
+                additions.append(i)
+        # items modified or removed
+        return None if +displayed else additions
+
+    def set(self, header: Tuple[str, str], rows: List[Tuple[str, str, str, str, str]]):
+        """Store the displayed content."""
+        self.header = header
+        self.rows = rows
+
+    def reset(self):
+        """Forget the displayed content, for example when the browser is replaced."""
+        self.set(None, [])  # type: ignore
+
+
+def update_browser(ide: Ide):
+    """
+    Display the current status of the Git client in the Git browser.
+
+    Only the new items are added when the other items are unchanged, and the
+    browser is not updated when the status is unchanged. The status is saved
+    to be displayed at the next startup.
+
+    This function must be called from the UI thread.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    ide.log('Refreshed git repo {0}'.format(_git_client.repo_path))
+    branch_name = 'branch: ' + _git_client.branch
+
+    # clear files status lists
+    project_files_status[BrowserCat['Staged']].clear()
+    project_files_status[BrowserCat['Unstaged']].clear()
+    project_files_status[BrowserCat['Clean']].clear()
+    project_files_status[BrowserCat['Extern']].clear()
+
+    # look for files present in the SCADE project
+    projects = ide.get_projects()
+    # existing companion files, for example ann files for xscade files
+    companions = companion_finder.find(
+        os.path.abspath(fr.pathname) for project in projects for fr in project.file_refs
+    )
+    items: List[Tuple[Union[Project, FileRef, str], str]] = []
+    for project in projects:
+        # for project file
+        items.append((project, project.pathname))
+        # for files registered in the project
+        for fr in project.file_refs:
+            items.append((fr, fr.pathname))
+            for companion in companions.get(os.path.abspath(fr.pathname), []):
+                items.append((companion, companion))
+    # single lookup for all the files
+    statuses = _git_client.get_file_statuses(
+        [path for _, path in items], existing=[_ for v in companions.values() for _ in v]
+    )
+    entries = []
+    for (item, path), file_status in zip(items, statuses):
+        index_file_name, browser_cat, icon, name = get_item_data(item, file_status)
+        project_files_status[browser_cat].append(index_file_name)
+        row = type(item).__name__, path, browser_cat, icon, name
+        entries.append((row, item))
+
+    # update the browser with the differences only, when possible
+    header = _git_client.repo_path, _git_client.branch
+    rows = [row for row, _ in entries]
+    additions = _displayed.get_additions(header, rows)
+    if additions is None:
+        # create SCADE Git browser
+        create_browser(ide, branch_name)
+        additions = range(len(entries))
+    for i in additions:
+        (_, _, browser_cat, icon, name), item = entries[i]
+        display_item(ide, item, browser_cat, icon, name)
+    _displayed.set(header, rows)
+    active_project = ide.get_active_project()
+    if active_project:
+        _git_client.save_snapshot(active_project.pathname)
+
+    # look for files in git but not in the project: deleted files
+    # not possible as the repo can contain several SCADE projects
+
+    return
+    # todo: symbol file has no absolute path, relative to the project ?
+    for session in scade.model.suite.get_roots():
+        # symbols files
+        model = session.model
+        for subop in model.sub_operators:
+            symbol_file = subop.symbol_file
+            ide.log('file: {0}'.format(str(symbol_file)))
+            if str(symbol_file) != '':
+                ide.log('file 2: {0}'.format(str(symbol_file)))
 
 
 def refresh_browser(ide: Ide):
     """
-    Refresh the Git browser.
+    Refresh the Git browser synchronously.
+
+    Any refresh running in the background is cancelled.
 
     Parameters
     ----------
@@ -123,57 +305,373 @@ def refresh_browser(ide: Ide):
         SCADE IDE environment.
     """
     assert _git_client is not None  # nosec B101  # addresses linter
+    _background_refresh.cancel()
     active_project = ide.get_active_project()
     if active_project:
         # save project before Git refresh
         # active_project.save(active_project.pathname) # crash the editor on reload
-        if _git_client.refresh(active_project.pathname):
-            ide.log('Refreshed git repo {0}'.format(_git_client.repo_path))
-            branch_name = 'branch: ' + _git_client.branch
-
-            # create SCADE Git browser
-            create_browser(ide, branch_name)
-
-            # clear files status lists
-            project_files_status[BrowserCat['Staged']].clear()
-            project_files_status[BrowserCat['Unstaged']].clear()
-            project_files_status[BrowserCat['Clean']].clear()
-            project_files_status[BrowserCat['Extern']].clear()
-
-            # look for files present in the SCADE project
-            project_files = []
-            for project in ide.get_projects():
-                # for project file
-                project_files.append(report_item(ide, project))
-                # for files registered in the project
-                for fr in project.file_refs:
-                    project_files.append(report_item(ide, fr))
-                    # check if ann file for xscade
-                    filepath = Path(fr.pathname)
-                    if filepath.suffix == '.xscade':
-                        ann_file = filepath.with_suffix('.ann')
-                        if ann_file.exists():
-                            project_files.append(report_item(ide, str(ann_file)))
-
-            # look for files in git but not in the project: deleted files
-            # not possible as the repo can contain several SCADE projects
-
-            return
-            # todo: symbol file has no absolute path, relative to the project ?
-            for session in scade.model.suite.get_roots():
-                # symbols files
-                model = session.model
-                for subop in model.sub_operators:
-                    symbol_file = subop.symbol_file
-                    ide.log('file: {0}'.format(str(symbol_file)))
-                    if str(symbol_file) != '':
-                        ide.log('file 2: {0}'.format(str(symbol_file)))
+        # restrict the status to the files of the projects
+        _git_client.pop_dirty()
+        paths = get_project_paths(ide)
+        if _git_client.refresh(active_project.pathname, paths):
+            watch_files(paths)
+            update_browser(ide)
         else:
             ide.log("No repository found")
     else:
         ide.log("No project loaded")
 
 
+class BackgroundRefresh:
+    """
+    Compute the status of the Git repository in a worker thread.
+
+    The UI thread submits requests with ``request`` and polls the results
+    with ``fetch``: only the browser updates are performed by the UI thread.
+
+    * A new request cancels the computation in progress, if any.
+    * The requests received while the worker is busy are coalesced:
+      only the latest one is computed.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        # incremented for each request: the results of older requests are discarded
+        self.generation = 0
+        self.cancel_event: Optional[threading.Event] = None
+        self.worker: Optional[threading.Thread] = None
+        # arguments of the request waiting for the worker, if any
+        self.pending: Optional[Tuple[int, str, List[str], bool, threading.Event]] = None
+        # status of the latest request, waiting for the UI thread
+        self.result: Optional[RepoStatus] = None
+        self.incremental = False
+        self.error = ''
+
+    @property
+    def refreshing(self) -> bool:
+        """Return whether a refresh is in progress or waiting to be displayed."""
+        with self.lock:
+            return self.worker is not None or self.result is not None
+
+    def request(self, project_path: str, paths: List[str], incremental: bool = False):
+        """
+        Request the computation of the status of a project.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+        paths : List[str]
+            Paths of the files to consider.
+        incremental : bool
+            Whether the status updates the current status or replaces it.
+        """
+        with self.lock:
+            self.generation += 1
+            if self.cancel_event is not None:
+                # the computation in progress is overtaken
+                self.cancel_event.set()
+            self.cancel_event = threading.Event()
+            self.result = None
+            args = (self.generation, project_path, paths, incremental, self.cancel_event)
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, args=(args,), daemon=True)
+                self.worker.start()
+            else:
+                # coalesce with the previous pending request, if any
+                self.pending = args
+
+    def cancel(self):
+        """Cancel the computation in progress and discard the pending requests."""
+        with self.lock:
+            self.generation += 1
+            if self.cancel_event is not None:
+                self.cancel_event.set()
+                self.cancel_event = None
+            self.pending = None
+            self.result = None
+
+    def fetch(self) -> Tuple[Optional[RepoStatus], bool, str]:
+        """
+        Return the status of the latest request once computed, and an error message if any.
+
+        Returns
+        -------
+        Tuple[Optional[RepoStatus], bool, str]
+            Status, whether it is incremental, and error message.
+        """
+        with self.lock:
+            result, incremental, error = self.result, self.incremental, self.error
+            self.result, self.error = None, ''
+            return result, incremental, error
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait for the worker thread to complete.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum duration of the wait, in seconds.
+        """
+        worker = self.worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def _run(self, args: Tuple[int, str, List[str], bool, threading.Event]):
+        """Compute the requests until there is none left."""
+        assert _git_client is not None  # nosec B101  # addresses linter
+        while True:
+            generation, project_path, paths, incremental, cancel = args
+            status = None
+            error = ''
+            try:
+                status = _git_client.compute_status(project_path, paths, cancel)
+            except RefreshCancelledError:
+                pass
+            except BaseException as e:
+                # the IDE can't be accessed from this thread: the UI thread logs the error
+                error = 'Error refresh: {0}'.format(e)
+            with self.lock:
+                if generation == self.generation:
+                    self.result = status
+                    self.incremental = incremental
+                    self.error = error
+                if self.pending is None:
+                    self.worker = None
+                    return
+                args = self.pending
+                self.pending = None
+
+
+def request_refresh(ide: Ide):
+    """
+    Refresh the Git browser, in the background when enabled.
+
+    The browser keeps its content until the status is computed, or displays
+    a temporary state when it is empty. The browser is updated by ``process_refresh``.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    if not _background_refresh.enabled:
+        refresh_browser(ide)
+        return
+    active_project = ide.get_active_project()
+    if active_project:
+        # the project is accessed from the UI thread only
+        _git_client.pop_dirty()
+        paths = get_project_paths(ide)
+        if _displayed.header is None:
+            ide.create_browser('Git', icons["git"])
+            ide.browser_report(BrowserCat['Refreshing'], None, False)
+        _background_refresh.request(active_project.pathname, paths)
+    else:
+        ide.log("No project loaded")
+
+
+def start_browser(ide: Ide) -> bool:
+    """
+    Display the Git browser once a project is loaded.
+
+    The status saved for the project, if still valid, is displayed immediately
+    and confirmed in the background: only the differences are updated.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+
+    Returns
+    -------
+    bool
+        Whether the browser is started, ``False`` when no project is loaded.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    active_project = ide.get_active_project()
+    if not active_project:
+        return False
+    status = _git_client.load_snapshot(active_project.pathname)
+    if status is not None:
+        _git_client.apply_status(status)
+        update_browser(ide)
+    request_refresh(ide)
+    return True
+
+
+def is_status_valid() -> bool:
+    """
+    Return whether the displayed status reflects the files and the repository.
+
+    The status can be trusted only when the files are watched: it is invalid
+    while a refresh is in progress or when some files changed since the last one.
+
+    Returns
+    -------
+    bool
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    return (
+        _watcher is not None
+        and not _background_refresh.refreshing
+        and not _git_client.is_dirty()
+        and _displayed.header == (_git_client.repo_path, _git_client.branch)
+    )
+
+
+def update_status(ide: Ide, operation: str, files: List[str], valid: bool):
+    """
+    Update the Git browser after an operation on files.
+
+    The known effect of the operation is applied to the status when it was valid
+    before the operation, otherwise the status is computed again.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    operation : str
+        Operation, either ``stage``, ``unstage`` or ``commit``.
+    files : List[str]
+        Files of the operation.
+    valid : bool
+        Whether the status was valid before the operation and the operation succeeded.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    if valid and _git_client.update_status(operation, files):
+        update_browser(ide)
+    else:
+        request_refresh(ide)
+
+
+def process_refresh(ide: Ide):
+    """
+    Update the Git browser with the result of a background refresh, if any.
+
+    This function must be called regularly from the UI thread.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    status, incremental, error = _background_refresh.fetch()
+    if error:
+        ide.log(error)
+    if status is not None:
+        _git_client.apply_status(status, incremental)
+        if status.repo is not None:
+            if not incremental:
+                watch_files(get_project_paths(ide))
+            update_browser(ide)
+        else:
+            ide.log("No repository found")
+    elif not _background_refresh.refreshing:
+        process_changes(ide)
+
+
+def process_changes(ide: Ide):
+    """
+    Refresh the status of the files modified since the last refresh, if any.
+
+    The status is computed in the background: only the outdated files are considered,
+    unless a Git file, for example the index, or a project changed.
+
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    if not _background_refresh.enabled:
+        return
+    full, paths = _git_client.pop_dirty()
+    if not full and not paths:
+        return
+    active_project = ide.get_active_project()
+    if not active_project:
+        return
+    project_paths = {os.path.abspath(_.pathname) for _ in ide.get_projects()}
+    if full or not project_paths.isdisjoint(paths):
+        # the files of the projects may have changed
+        _background_refresh.request(active_project.pathname, get_project_paths(ide))
+    else:
+        _background_refresh.request(active_project.pathname, sorted(paths), incremental=True)
+
+
+def on_files_changed(paths: Optional[Set[str]], git_changed: bool):
+    """
+    Mark the status of the modified files as outdated.
+
+    This function is called from the thread of the watcher.
+
+    Parameters
+    ----------
+    paths : Optional[Set[str]]
+        Modified files, ``None`` when too many files changed.
+    git_changed : bool
+        Whether a Git file changed, for example the index.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    _git_client.invalidate(paths, git_changed)
+
+
+def watch_files(paths: List[str]):
+    """
+    Watch the files of the projects and of the Git repository, if enabled.
+
+    Parameters
+    ----------
+    paths : List[str]
+        Files of the projects.
+    """
+    assert _git_client is not None  # nosec B101  # addresses linter
+    if _watcher is not None:
+        _watcher.watch(paths, _git_client.get_watch_paths())
+
+
+def set_watcher(enabled: bool):
+    """
+    Enable or disable the watcher of the files.
+
+    When enabled, the Git browser is refreshed incrementally, in the background,
+    when the files of the projects or the Git repository change.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether the files are watched.
+    """
+    global _watcher
+    if enabled and _watcher is None:
+        _watcher = create_watcher(on_files_changed)
+        _watcher.start()
+    elif not enabled and _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+
+def set_background_refresh(enabled: bool):
+    """
+    Enable or disable the computation of the status in a worker thread.
+
+    The background refresh is disabled by default, for command line tools.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether the status is computed in a worker thread.
+    """
+    if not enabled:
+        _background_refresh.cancel()
+    _background_refresh.enabled = enabled
+
+
 class CmdRefresh(Command):
     """
     SCADE Command: Refresh.
@@ -185,17 +683,25 @@ class CmdRefresh(Command):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Refresh',
-            status_message='Refresh the Git repo status',
-            tooltip_message='Refresh the Git repo status',
-            image_file=res['refresh'],
-        )
+        super().__init__(ide, **command_data['refresh'])
+
+    def on_enable(self) -> bool:
+        """Display the result of the background refresh, if any."""
+        global _started
+        if not _started and _background_refresh.enabled:
+            # first poll of the commands with a project loaded
+            _started = start_browser(self.ide)
+        process_refresh(self.ide)
+        return True
 
     def on_activate(self):
         """Run the command."""
-        refresh_browser(self.ide)
+        # discover the repositories again, for example after a git init
+        repo_discovery.invalidate()
+        companion_finder.invalidate()
+        # create the browser again
+        _displayed.reset()
+        request_refresh(self.ide)
 
 
 class GitRepoCommand(Command):
@@ -204,7 +710,8 @@ class GitRepoCommand(Command):
     def on_enable(self) -> bool:
         """Enable the command if the Git repository exists and is refreshed."""
         assert _git_client is not None  # nosec B101  # addresses linter
-        return _git_client.repo is not None
+        process_refresh(self.ide)
+        return _git_client.repo is not None and not _background_refresh.refreshing
 
 
 class CmdStage(GitRepoCommand):
@@ -218,13 +725,7 @@ class CmdStage(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Stage',
-            status_message='Stage selected files',
-            tooltip_message='Stage selected files',
-            image_file=res['stage'],
-        )
+        super().__init__(ide, **command_data['stage'])
 
     def on_activate(self):
         """Run the command."""
@@ -234,8 +735,9 @@ class CmdStage(GitRepoCommand):
             if isinstance(item, FileRef) or isinstance(item, Project):
                 files_to_process.append(item.pathname)
         if files_to_process:
-            _git_client.stage(files_to_process)
-            refresh_browser(self.ide)
+            valid = is_status_valid()
+            done = _git_client.stage(files_to_process)
+            update_status(self.ide, 'stage', files_to_process, valid and done)
 
 
 class CmdUnstage(GitRepoCommand):
@@ -249,13 +751,7 @@ class CmdUnstage(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Unstage',
-            status_message='UnStage selected files',
-            tooltip_message='UnStage selected files',
-            image_file=res['unstage'],
-        )
+        super().__init__(ide, **command_data['unstage'])
 
     def on_activate(self):
         """Run the command."""
@@ -265,8 +761,9 @@ class CmdUnstage(GitRepoCommand):
             if isinstance(item, FileRef) or isinstance(item, Project):
                 files_to_process.append(item.pathname)
         if files_to_process:
-            _git_client.unstage(files_to_process)
-            refresh_browser(self.ide)
+            valid = is_status_valid()
+            done = _git_client.unstage(files_to_process)
+            update_status(self.ide, 'unstage', files_to_process, valid and done)
 
 
 class CmdReset(GitRepoCommand):
@@ -280,13 +777,7 @@ class CmdReset(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Reset',
-            status_message='Reset selected files',
-            tooltip_message='Reset selected files',
-            image_file=res['reset'],
-        )
+        super().__init__(ide, **command_data['reset'])
 
     def on_activate(self):
         """Run the command."""
@@ -297,7 +788,7 @@ class CmdReset(GitRepoCommand):
                 files_to_process.append(item.pathname)
         if files_to_process:
             _git_client.reset_files(files_to_process)
-            refresh_browser(self.ide)
+            request_refresh(self.ide)
 
 
 class CmdStageAll(GitRepoCommand):
@@ -311,20 +802,17 @@ class CmdStageAll(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Stage All',
-            status_message='Stage all files',
-            tooltip_message='Stage all files',
-            image_file=res['stage'],
-        )
+        super().__init__(ide, **command_data['stage_all'])
 
     def on_activate(self):
         """Run the command."""
         assert _git_client is not None  # nosec B101  # addresses linter
-        refresh_browser(self.ide)
-        _git_client.stage(project_files_status[BrowserCat['Unstaged']])
-        refresh_browser(self.ide)
+        if not is_status_valid():
+            refresh_browser(self.ide)
+        valid = is_status_valid()
+        files = list(project_files_status[BrowserCat['Unstaged']])
+        done = _git_client.stage(files)
+        update_status(self.ide, 'stage', files, valid and done)
 
 
 class CmdUnstageAll(GitRepoCommand):
@@ -338,20 +826,17 @@ class CmdUnstageAll(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Unstage All',
-            status_message='Unstage all files',
-            tooltip_message='Unstage all files',
-            image_file=res['unstage'],
-        )
+        super().__init__(ide, **command_data['unstage_all'])
 
     def on_activate(self):
         """Run the command."""
         assert _git_client is not None  # nosec B101  # addresses linter
-        refresh_browser(self.ide)
-        _git_client.unstage(project_files_status[BrowserCat['Staged']])
-        refresh_browser(self.ide)
+        if not is_status_valid():
+            refresh_browser(self.ide)
+        valid = is_status_valid()
+        files = list(project_files_status[BrowserCat['Staged']])
+        done = _git_client.unstage(files)
+        update_status(self.ide, 'unstage', files, valid and done)
 
 
 class CmdCommit(GitRepoCommand):
@@ -365,18 +850,13 @@ class CmdCommit(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Commit',
-            status_message='Commit',
-            tooltip_message='Commit',
-            image_file=res['commit'],
-        )
+        super().__init__(ide, **command_data['commit'])
 
     def on_activate(self):
         """Run the command."""
         assert _git_client is not None  # nosec B101  # addresses linter
-        refresh_browser(self.ide)
+        if not is_status_valid():
+            refresh_browser(self.ide)
         if project_files_status[BrowserCat['Unstaged']]:
             confirm = self.confirm_commit()
             if not confirm:
@@ -384,8 +864,9 @@ class CmdCommit(GitRepoCommand):
 
         commit_text = self.get_commit_text()
         if commit_text:
-            _git_client.commit(commit_text)
-            refresh_browser(self.ide)
+            valid = is_status_valid()
+            if _git_client.commit(commit_text):
+                update_status(self.ide, 'commit', [], valid)
 
     def confirm_commit(self) -> bool:
         """Provide a default behavior for command line tools."""
@@ -407,99 +888,62 @@ class CmdDiff(GitRepoCommand):
     """
 
     def __init__(self, ide: Ide):
-        super().__init__(
-            ide,
-            name='Diff',
-            status_message='Diff project with another version',
-            tooltip_message='Diff project with another version',
-            image_file=res['diff'],
-        )
+        super().__init__(ide, **command_data['diff'])
 
     def on_activate(self):
         """Run the command."""
         assert _git_client is not None  # nosec B101  # addresses linter
         branch = self.select_branch()
         if branch:
-            branch_path = "".join([c for c in branch if c.isalnum() or c in "._-"])
-            tmp_dir = create_temp_dir(
-                os.path.join('SCADE', 'git-diff', _git_client.repo_name, branch_path)
-            )
+            # the working copies are reused across the diffs and updated incrementally
+            cache = get_workspace_cache(_git_client.repo_name)
+            tmp_dir = cache.get_path(branch)
             active_project = self.ide.get_projects()[0]
-            diff_project = tmp_dir / Path(active_project.pathname).relative_to(
-                _git_client.repo_path
+            # write the files of the project only, without archiving the branch
+            diff_project = _git_client.materialize_project(
+                branch, active_project.pathname, str(tmp_dir), cache
             )
-            # create a tar archive of the branch
-            archive_file = tmp_dir.with_suffix('.tar')
-            _git_client.archive(branch, str(archive_file))
-            if archive_file.exists():
-                # untar the archive in tmp_dir
-                tar_file = tarfile.open(archive_file)
-                safe_members = self.safe_members(tmp_dir, tar_file)
-                # the archive is built on the same repo a few lines above: its content is known
-                tar_file.extractall(tmp_dir, members=safe_members)  # nosec B202
-                tar_file.close()
-                # delete the tar archive"
-                archive_file.unlink()
-                # display the branch project to compare with the current
-                # project in the Git output tab
-                if diff_project.exists():
-                    self.ide.log(
-                        'Launch the Diff Analyzer tool with the project\n   {0}'.format(
-                            str(diff_project)
-                        )
-                    )
-                    # self.ide.log('module scade: {0}'.format(getmembers(scade.tool.suite.diff)))
-                    # scade.tool.suite.diff_analyze(active_project.pathname, diff_project.asposix())
+            # display the branch project to compare with the current
+            # project in the Git output tab
+            if diff_project:
+                self.ide.log(
+                    'Launch the Diff Analyzer tool with the project\n   {0}'.format(diff_project)
+                )
+                # self.ide.log('module scade: {0}'.format(getmembers(scade.tool.suite.diff)))
+                # scade.tool.suite.diff_analyze(active_project.pathname, diff_project)
 
     def select_branch(self) -> str:
         """Provide a default behavior for command line tools."""
         return 'main'
 
-    def safe_members(self, base: Path, tar_file: tarfile.TarFile):
-        """
-        Filter the link members from an archive.
 
-        From https://stackoverflow.com/questions/10060069/safely-extract-zip-or-tar-using-python.
-        """
-        base = base.resolve()
-
-        for finfo in tar_file:
-            if badpath(finfo.name, base):
-                self.ide.log(f'{finfo.name} is blocked: illegal path')
-            elif finfo.issym() and badlink(finfo, base):
-                self.ide.log(f'{finfo.name} is blocked: symlink to {finfo.linkname}')
-            elif finfo.islnk() and badlink(finfo, base):
-                self.ide.log(f'{finfo.name} is blocked: hard link to {finfo.linkname}')
-            else:
-                yield finfo
+class CmdTimings(Command):
+    """
+    SCADE Command: Timings.
 
+    Display the statistics of the Git operations in the output tab.
 
-def badpath(path: str, base: Path) -> bool:
-    """Return whether a file is external to the base hierarchy."""
-    # joinpath will ignore base if path is absolute
-    target = (base / path).resolve()
-    return not str(target).startswith(str(base))
+    Parameters
+    ----------
+    ide : Studio
+        SCADE IDE environment.
+    """
 
+    def __init__(self, ide: Ide):
+        super().__init__(ide, **command_data['timings'])
 
-def badlink(info: tarfile.TarInfo, base: Path) -> bool:
-    """Return whether a link is external to the base hierarchy."""
-    # links are interpreted relative to the directory containing the link
-    path = (base / info.name).parent / info.linkname
-    return badpath(str(path), base)
+    def on_activate(self):
+        """Run the command."""
+        assert _git_client is not None  # nosec B101  # addresses linter
+        lines = _git_client.instrumentation.dump()
+        self.ide.log('Git operations:')
+        for line in lines if lines else ['no calls']:
+            self.ide.log('   ' + line)
 
 
 script_path = Path(__file__)
 script_dir = script_path.parent
 
-res = {
-    "refresh": str(script_dir / 'img/refresh.bmp'),
-    "stage": str(script_dir / 'img/stage.bmp'),
-    "unstage": str(script_dir / 'img/unstage.bmp'),
-    "reset": str(script_dir / 'img/unstage.bmp'),
-    "commit": str(script_dir / 'img/commit.bmp'),
-    "diff": str(script_dir / 'img/diff.bmp'),
-}
-
 icons = {
     "git": str(script_dir / 'img/git.ico'),
 }
@@ -517,6 +961,12 @@ status_data = {
     GitStatus.error: [BrowserCat['Extern'], str(script_dir / 'img/error.ico')],
 }
 
+# companion files of the project files, cached between the refreshes
+companion_finder = CompanionFinder()
+
+# caches of the working copies for the diffs, indexed by repository name
+workspace_caches: Dict[str, WorkspaceCache] = {}
+
 project_files_status = {
     BrowserCat['Staged']: [],
     BrowserCat['Unstaged']: [],
@@ -526,6 +976,16 @@ project_files_status = {
 
 _git_client = None
 
+# content of the Git browser
+_displayed = DisplayedStatus()
+
+_background_refresh = BackgroundRefresh()
+
+# whether the Git browser has been displayed for the project loaded at startup
+_started = False
+
+_watcher: Optional[Watcher] = None
+
 
 def set_git_client(git_client: GitClient):
     """
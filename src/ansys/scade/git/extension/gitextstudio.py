@@ -0,0 +1,257 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Implementation of the Git extension for SCADE Studio.
+
+This module loads Dulwich: it is imported on first use of the extension,
+through the lazy commands registered by ``gitextension.py``.
+"""
+
+from typing import Dict, Optional
+
+from scade.tool.suite.gui.dialogs import Dialog, message_box
+from scade.tool.suite.gui.widgets import Button, EditBox, Label, ListBox
+
+from ansys.scade.git.extension.commands import log
+from ansys.scade.git.extension.gitclient import GitClient as AbsGitClient
+from ansys.scade.git.extension.gitextcore import (
+    CmdCommit as CoreCmdCommit,
+    CmdDiff as CoreCmdDiff,
+    CmdRefresh,
+    CmdReset,
+    CmdStage,
+    CmdStageAll,
+    CmdTimings,
+    CmdUnstage,
+    CmdUnstageAll,
+    set_background_refresh,
+    set_git_client,
+    set_watcher,
+)
+from ansys.scade.guitools.command import Command
+from ansys.scade.guitools.ide import Ide
+
+
+class GitClient(AbsGitClient):
+    """GitClient implementation to log the messages to the IDE."""
+
+    def log(self, text: str):
+        """Print the logs to the SCADE Message output tab."""
+        log(text)
+
+
+class SelectBranchDialog(Dialog):
+    """
+    Custom dialog for selecting a branch.
+
+    The branches are filtered by prefix and displayed by pages.
+    """
+
+    # number of branches loaded at once
+    page_size = 100
+
+    def __init__(self, name):
+        super().__init__(name, 300, 240)
+        self.branch = ''
+        self.prefix = ''
+        self.branches = []
+        self.total = 0
+        self.filter_box = None
+        self.list_box = None
+        self.info_label = None
+
+    def on_build(self):
+        """Build the dialog."""
+        self.filter_box = EditBox(self, 15, 15, 200, 20)
+        Button(self, 'Filter', 220, 12, 45, 25, self.on_filter_click)
+        Button(self, 'Diff', 220, 45, 45, 25, self.on_close_click)
+        Button(self, 'Cancel', 220, 80, 45, 25, self.on_cancel_click)
+        Button(self, 'More', 220, 115, 45, 25, self.on_more_click)
+        self.branches, self.total = get_git_client().get_branches(count=self.page_size)
+        self.list_box = ListBox(
+            self, self.branches, 15, 45, 200, 100, self.on_list_branch_selection
+        )
+        self.info_label = Label(self, self.get_count_text(), 15, 150, 250, 40)
+
+    def get_count_text(self) -> str:
+        """Return the number of displayed branches."""
+        return '{0}/{1} branches'.format(len(self.branches), self.total)
+
+    def on_filter_click(self, button):
+        """Display the first page of the branches starting with the filter."""
+        assert self.filter_box is not None  # nosec B101  # addresses linter
+        # Edit.get_name(): wrong typing annotation
+        value: str = self.filter_box.get_name()  # type: ignore
+        self.prefix = value.strip()
+        self.branches, self.total = get_git_client().get_branches(self.prefix, count=self.page_size)
+        self.update_list()
+
+    def on_more_click(self, button):
+        """Display the next page of branches."""
+        if len(self.branches) < self.total:
+            page, self.total = get_git_client().get_branches(
+                self.prefix, len(self.branches), self.page_size
+            )
+            self.branches.extend(page)
+            self.update_list()
+
+    def update_list(self):
+        """Update the list of branches and the selection."""
+        assert self.list_box is not None  # nosec B101  # addresses linter
+        self.list_box.set_list(self.branches)
+        self.branch = ''
+        self.show_info(self.get_count_text())
+
+    def show_info(self, text: str):
+        """Display a text below the list of branches."""
+        if self.info_label:
+            self.info_label.set_name(text)
+
+    def on_close_click(self, button):
+        """Close the dialog."""
+        self.close()
+
+    def on_cancel_click(self, button):
+        """Cancel the dialog."""
+        self.branch = ''
+        self.close()
+
+    def on_list_branch_selection(self, list, index):
+        """Store the selected branch."""
+        branch = list.get_selection()
+        if len(branch) == 1:
+            self.branch = str(branch[0])
+            # metadata of the selected branch only
+            info = get_git_client().get_branch_infos([self.branch]).get(self.branch)
+            if info:
+                self.show_info('{0} {1}\n{2}'.format(info.sha[:8], info.author, info.summary))
+        else:
+            log('Error: select only one branch: {0}'.format(branch))
+
+
+class CommitDialog(Dialog):
+    """Custom dialog for providing the commit message."""
+
+    def __init__(self, name):
+        super().__init__(name, 600, 200)
+        self.commit_text = ''
+
+    def on_build(self):
+        """Build the dialog."""
+        Button(self, 'Commit', 520, 15, 45, 25, self.on_close_click)
+        Button(self, 'Cancel', 520, 55, 45, 25, self.on_cancel_click)
+        self.editbox = EditBox(self, 15, 15, 500, 100, style=['multiline'])
+
+    def on_close_click(self, button):
+        """Close the dialog if the message is not empty."""
+        if self.editbox:
+            # Edit.get_name(): wrong typing annotation
+            value: str = self.editbox.get_name()  # type: ignore
+            commit_text = value.strip()
+            if commit_text != '':
+                self.commit_text = commit_text
+                self.close()
+            else:
+                log('Error: commit text cannot be empty')
+
+    def on_cancel_click(self, button):
+        """Cancel the dialog."""
+        self.close()
+
+
+class CmdCommit(CoreCmdCommit):
+    """SCADE Command: Commit."""
+
+    def confirm_commit(self) -> bool:
+        """Override default behavior."""
+        confirm = message_box(
+            'Confirm Partial Commit',
+            'There are unstagged files. Do you really want to do a partial commit?',
+            style='yesno',
+            icon='warning',
+        )
+        return confirm == 6
+
+    def get_commit_text(self) -> str:
+        """Override default behavior."""
+        commit_dialog = CommitDialog('Commit')
+        commit_dialog.do_modal()
+        return commit_dialog.commit_text
+
+
+class CmdDiff(CoreCmdDiff):
+    """SCADE Command: Diff."""
+
+    def select_branch(self) -> str:
+        """Override default behavior."""
+        select_branch = SelectBranchDialog('Select Branch')
+        select_branch.do_modal()
+        return select_branch.branch
+
+
+def get_git_client() -> GitClient:
+    """Return the Git client, once loaded."""
+    assert git_client is not None  # nosec B101  # addresses linter
+    return git_client
+
+
+def create_commands(ide: Ide) -> Dict[str, Command]:
+    """
+    Load the Git client and return the commands of the extension.
+
+    Parameters
+    ----------
+    ide : Ide
+        SCADE IDE environment.
+
+    Returns
+    -------
+    Dict[str, Command]
+        Commands indexed by the keys of ``command_data``, none when the
+        Git client can't be initialized.
+    """
+    global git_client
+    git_client = GitClient()
+    if not git_client.get_init_status():
+        log('Git client not initialized')
+        return {}
+    set_git_client(git_client)
+    # compute the status in a worker thread to keep the IDE responsive
+    set_background_refresh(True)
+    # refresh the status of the modified files only
+    set_watcher(True)
+    return {
+        'refresh': CmdRefresh(ide),
+        'stage': CmdStage(ide),
+        'unstage': CmdUnstage(ide),
+        'reset': CmdReset(ide),
+        'stage_all': CmdStageAll(ide),
+        'unstage_all': CmdUnstageAll(ide),
+        'commit': CmdCommit(ide),
+        'diff': CmdDiff(ide),
+        'timings': CmdTimings(ide),
+    }
+
+
+git_client: Optional[GitClient] = None
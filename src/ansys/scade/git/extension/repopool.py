@@ -0,0 +1,118 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Pool of Dulwich repositories.
+
+Opening a repository parses its configuration and discards the caches of
+its object store, for example the indexes of the packs. The pool keeps a
+handle per repository, reused until the packs or the references of the
+repository change.
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+from dulwich.repo import Repo
+
+# stat data of the files and directories which changes invalidate a handle
+Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    """Return the modification time and size of a path, ``None`` if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_signature(repo: Repo) -> Signature:
+    """
+    Return the signature of the packs, references and configuration of a repository.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+
+    Returns
+    -------
+    Signature
+    """
+    commondir = repo.commondir()
+    paths = [
+        os.path.join(commondir, 'objects', 'pack'),
+        os.path.join(commondir, 'packed-refs'),
+        os.path.join(commondir, 'refs', 'heads'),
+        os.path.join(commondir, 'refs', 'tags'),
+        os.path.join(commondir, 'config'),
+    ]
+    return tuple(_stat(_) for _ in paths)
+
+
+class RepoPool:
+    """Handles of the repositories, indexed by path."""
+
+    def __init__(self):
+        self.handles: Dict[str, Tuple[Repo, Signature]] = {}
+
+    def get(self, repo_path: str) -> Repo:
+        """
+        Return the handle of a repository, opened or reopened when needed.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path of the repository.
+
+        Returns
+        -------
+        Repo
+        """
+        handle = self.handles.get(repo_path)
+        if handle is not None:
+            repo, signature = handle
+            if get_signature(repo) == signature:
+                return repo
+            # the packs or the references changed
+            repo.close()
+        repo = Repo(repo_path)
+        self.handles[repo_path] = repo, get_signature(repo)
+        return repo
+
+    def invalidate(self, repo_path: Optional[str] = None):
+        """
+        Close the handle of a repository, or all the handles.
+
+        Parameters
+        ----------
+        repo_path : Optional[str]
+            Path of the repository, all the repositories when ``None``.
+        """
+        paths = list(self.handles) if repo_path is None else [repo_path]
+        for path in paths:
+            handle = self.handles.pop(path, None)
+            if handle is not None:
+                handle[0].close()
@@ -0,0 +1,201 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Persistent snapshot of the Git status of the SCADE projects.
+
+The last status displayed in the Git browser is saved per repository and
+project, tagged with the checksum of the index and the commit of HEAD.
+The status of the other repositories containing files of the project is
+saved with it, tagged the same way. It is displayed at startup, before the
+first status computation completes, when neither the indexes nor the HEADs
+changed since.
+
+The snapshots are stored in the Git directory of the repository.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# version of the persisted format
+SNAPSHOT_VERSION = 2
+# name of the snapshot file, in the Git directory
+SNAPSHOT_FILE_NAME = 'scade-git-snapshots.json'
+# maximum number of projects per repository, the least recently saved are discarded
+MAX_PROJECTS = 16
+
+# status of the files, indexed by posix paths relative to the repository,
+# and unstaged status of the files which also have staged changes
+Statuses = Tuple[Dict[str, str], Dict[str, str]]
+# checksum of the index and id of the HEAD commit, active branch and statuses
+# of the files of another repository
+SiblingSnapshot = Tuple[Tuple[str, str], str, Statuses]
+
+
+def get_project_key(project_path: str) -> str:
+    """
+    Return the key of a project in the snapshot file.
+
+    Parameters
+    ----------
+    project_path : str
+        Path of the SCADE project.
+
+    Returns
+    -------
+    str
+    """
+    return os.path.normcase(os.path.abspath(project_path))
+
+
+class StatusSnapshots:
+    """
+    Snapshots of the Git status of the projects of a repository.
+
+    Parameters
+    ----------
+    controldir : str
+        Git directory of the repository.
+    """
+
+    def __init__(self, controldir: str):
+        self.path = Path(controldir) / SNAPSHOT_FILE_NAME
+        # snapshots indexed by project keys, the most recent last
+        self.projects: Dict[str, dict] = {}
+
+    def load(self):
+        """Read the snapshot file, if any."""
+        try:
+            with self.path.open(encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != SNAPSHOT_VERSION:
+            return
+        self.projects = data['projects']
+
+    def save(self):
+        """Write the snapshot file."""
+        data = {'version': SNAPSHOT_VERSION, 'projects': self.projects}
+        tmp = self.path.with_suffix('.tmp')
+        try:
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # the snapshots are optional
+            pass
+
+    def get(self, project_path: str, key: Tuple[str, str]) -> Optional[Tuple[str, Statuses]]:
+        """
+        Return the snapshot of a project if the index and HEAD did not change.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+        key : Tuple[str, str]
+            Checksum of the index and id of the HEAD commit.
+
+        Returns
+        -------
+        Optional[Tuple[str, Statuses]]
+            Branch and statuses of the files, ``None`` if there is no valid snapshot.
+        """
+        snapshot = self.projects.get(get_project_key(project_path))
+        if snapshot is None or not key[0] or tuple(snapshot['key']) != key:
+            return None
+        return snapshot['branch'], (snapshot['files'], snapshot['unstaged'])
+
+    def get_siblings(self, project_path: str) -> Dict[str, SiblingSnapshot]:
+        """
+        Return the snapshots of the other repositories containing files of a project.
+
+        The snapshots must be checked against the current index and HEAD
+        of their repository.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+
+        Returns
+        -------
+        Dict[str, SiblingSnapshot]
+            Snapshots indexed by repository path.
+        """
+        snapshot = self.projects.get(get_project_key(project_path))
+        if snapshot is None:
+            return {}
+        siblings = {}
+        for path, sibling in snapshot['siblings'].items():
+            statuses = sibling['files'], sibling['unstaged']
+            siblings[path] = (sibling['key'][0], sibling['key'][1]), sibling['branch'], statuses
+        return siblings
+
+    def set(
+        self,
+        project_path: str,
+        key: Tuple[str, str],
+        branch: str,
+        statuses: Statuses,
+        siblings: Optional[Dict[str, SiblingSnapshot]] = None,
+    ):
+        """
+        Store the snapshot of a project and save the file if it has been modified.
+
+        Parameters
+        ----------
+        project_path : str
+            Path of the SCADE project.
+        key : Tuple[str, str]
+            Checksum of the index and id of the HEAD commit.
+        branch : str
+            Active branch.
+        statuses : Statuses
+            Statuses of the files.
+        siblings : Optional[Dict[str, SiblingSnapshot]]
+            Snapshots of the other repositories containing files of the project,
+            indexed by repository path.
+        """
+        files, unstaged = statuses
+        snapshot = {'key': list(key), 'branch': branch, 'files': files, 'unstaged': unstaged}
+        snapshot['siblings'] = {}
+        for path, (repo_key, repo_branch, (repo_files, repo_unstaged)) in (siblings or {}).items():
+            snapshot['siblings'][path] = {
+                'key': list(repo_key),
+                'branch': repo_branch,
+                'files': repo_files,
+                'unstaged': repo_unstaged,
+            }
+        project_key = get_project_key(project_path)
+        if self.projects.get(project_key) == snapshot:
+            return
+        # most recent last
+        self.projects.pop(project_key, None)
+        self.projects[project_key] = snapshot
+        for obsolete in list(self.projects)[:-MAX_PROJECTS]:
+            del self.projects[obsolete]
+        self.save()
@@ -0,0 +1,216 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Persistent cache of the Git status computation.
+
+* Blob ids of the working tree files, validated by their stat data, so that
+  only the files whose stat data changed are hashed again.
+* Changes staged in the index, validated by the checksum of the index and
+  the commit of HEAD.
+
+The cache is stored in the Git directory of the repository and is reused
+across refreshes and sessions.
+"""
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import Dict, List, Optional, Tuple
+
+# version of the persisted format
+CACHE_VERSION = 1
+# name of the cache file, in the Git directory
+CACHE_FILE_NAME = 'scade-git-status.json'
+# files modified less than RACY_NS nanoseconds before being hashed are not cached:
+# a subsequent modification within the file system's timestamp granularity
+# would not change their stat data (racy Git)
+RACY_NS = 2 * 1000 * 1000 * 1000
+
+# stat data and blob id of a file: mtime (ns), size, inode, blob id
+Entry = Tuple[int, int, int, bytes]
+
+
+def get_index_checksum(index_path: str) -> str:
+    """
+    Return the checksum of an index file, stored in its last bytes.
+
+    Parameters
+    ----------
+    index_path : str
+        Path of the index file.
+
+    Returns
+    -------
+    str
+        Hexadecimal checksum, empty when the index does not exist.
+    """
+    try:
+        with open(index_path, 'rb') as f:
+            f.seek(-20, os.SEEK_END)
+            return f.read(20).hex()
+    except OSError:
+        return ''
+
+
+class StatCache:
+    """
+    Cache of the Git status computation for a repository.
+
+    Parameters
+    ----------
+    controldir : str
+        Git directory of the repository.
+    """
+
+    def __init__(self, controldir: str):
+        self.path = Path(controldir) / CACHE_FILE_NAME
+        self.entries: Dict[bytes, Entry] = {}
+        # key and value of the staged changes
+        self.staged_key: Tuple[str, str] = ('', '')
+        self.staged: Optional[Dict[str, List[bytes]]] = None
+        self.modified = False
+
+    def load(self):
+        """Read the cache file, if any."""
+        try:
+            with self.path.open(encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        self.entries = {
+            os.fsencode(path): (mtime, size, ino, blob_id.encode('ascii'))
+            for path, (mtime, size, ino, blob_id) in data['entries'].items()
+        }
+        staged = data.get('staged')
+        if staged:
+            self.staged_key = tuple(staged['key'])  # type: ignore
+            self.staged = {
+                kind: [os.fsencode(_) for _ in staged[kind]] for kind in ('add', 'delete', 'modify')
+            }
+
+    def save(self):
+        """Write the cache file if it has been modified."""
+        if not self.modified:
+            return
+        data = {
+            'version': CACHE_VERSION,
+            'entries': {
+                os.fsdecode(path): [mtime, size, ino, blob_id.decode('ascii')]
+                for path, (mtime, size, ino, blob_id) in self.entries.items()
+            },
+        }
+        if self.staged is not None:
+            data['staged'] = {'key': self.staged_key}
+            data['staged'].update(
+                {kind: [os.fsdecode(_) for _ in paths] for kind, paths in self.staged.items()}
+            )
+        tmp = self.path.with_suffix('.tmp')
+        try:
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # the cache is optional
+            return
+        self.modified = False
+
+    def get_blob_id(self, path: bytes, st: os.stat_result) -> Optional[bytes]:
+        """
+        Return the cached blob id of a file if its stat data did not change.
+
+        Parameters
+        ----------
+        path : bytes
+            Index path of the file.
+        st : os.stat_result
+            Current stat data of the file.
+        """
+        entry = self.entries.get(path)
+        if entry and entry[:3] == (st.st_mtime_ns, st.st_size, st.st_ino):
+            return entry[3]
+        return None
+
+    def set_blob_id(self, path: bytes, st: os.stat_result, blob_id: bytes):
+        """
+        Store the blob id of a file unless it has been modified too recently.
+
+        Parameters
+        ----------
+        path : bytes
+            Index path of the file.
+        st : os.stat_result
+            Stat data of the file when hashed.
+        blob_id : bytes
+            Hexadecimal blob id of the file.
+        """
+        if time.time_ns() - st.st_mtime_ns < RACY_NS:
+            # racy entry: hash the file again next time
+            if self.entries.pop(path, None):
+                self.modified = True
+            return
+        self.entries[path] = (st.st_mtime_ns, st.st_size, st.st_ino, blob_id)
+        self.modified = True
+
+    def prune(self, paths: set):
+        """
+        Remove the entries of the files which are not tracked anymore.
+
+        Parameters
+        ----------
+        paths : set
+            Index paths of the tracked files.
+        """
+        obsolete = [_ for _ in self.entries if _ not in paths]
+        for path in obsolete:
+            del self.entries[path]
+        self.modified = self.modified or len(obsolete) != 0
+
+    def get_staged(self, key: Tuple[str, str]) -> Optional[Dict[str, List[bytes]]]:
+        """
+        Return the cached staged changes if the index and HEAD did not change.
+
+        Parameters
+        ----------
+        key : Tuple[str, str]
+            Checksum of the index and id of the HEAD commit.
+        """
+        return self.staged if key == self.staged_key and key[0] else None
+
+    def set_staged(self, key: Tuple[str, str], staged: Dict[str, List[bytes]]):
+        """
+        Store the staged changes for a given index and HEAD.
+
+        Parameters
+        ----------
+        key : Tuple[str, str]
+            Checksum of the index and id of the HEAD commit.
+        staged : Dict[str, List[bytes]]
+            Paths added, deleted or modified in the index with respect to HEAD.
+        """
+        self.staged_key = key
+        self.staged = staged
+        self.modified = True
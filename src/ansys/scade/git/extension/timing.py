@@ -0,0 +1,197 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Timing of the Git operations.
+
+Each call is recorded with its duration and the size of its input, for
+example the number of paths. The calls slower than a threshold are logged,
+and the most recent calls of each operation are kept in a rolling window
+to build histograms on demand.
+
+The slow calls of the worker threads are logged later, from the main thread.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# upper bounds of the buckets of the histograms, in seconds
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+def get_bucket_label(index: int) -> str:
+    """Return the label of a bucket, for example ``<=5ms``."""
+    if index == len(BUCKETS):
+        return '>{0:g}s'.format(BUCKETS[-1])
+    bound = BUCKETS[index]
+    return '<={0:g}ms'.format(bound * 1000) if bound < 1 else '<={0:g}s'.format(bound)
+
+
+class Instrumentation:
+    """
+    Recorder of the durations of the Git operations.
+
+    Parameters
+    ----------
+    threshold : float, default: 0.5
+        Minimum duration, in seconds, of the calls to log.
+    window : int, default: 1000
+        Number of calls kept per operation.
+    log : Optional[Callable[[str], None]]
+        Function logging the slow calls.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        window: int = 1000,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        self.threshold = threshold
+        self.window = window
+        self.log = log
+        # recent calls per operation: duration, size
+        self.calls: Dict[str, Deque[Tuple[float, int]]] = {}
+        # messages of the slow calls of the worker threads
+        self.pending: List[str] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str, size: int = 0) -> Iterator[None]:
+        """
+        Record the duration of a block of code.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation, for example ``add``.
+        size : int, default: 0
+            Size of the input of the operation, for example the number of paths.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, size)
+
+    def record(self, name: str, duration: float, size: int = 0):
+        """
+        Record a call and log it when it is slow.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation.
+        duration : float
+            Duration of the call, in seconds.
+        size : int, default: 0
+            Size of the input of the operation.
+        """
+        with self.lock:
+            calls = self.calls.get(name)
+            if calls is None:
+                calls = deque(maxlen=self.window)
+                self.calls[name] = calls
+            calls.append((duration, size))
+            if self.log and duration >= self.threshold:
+                message = 'slow call: {0} {1:.3f}s, size {2}'.format(name, duration, size)
+                self.pending.append(message)
+        self.flush()
+
+    def flush(self):
+        """Log the pending messages when called from the main thread."""
+        if not self.log or threading.current_thread() is not threading.main_thread():
+            return
+        with self.lock:
+            messages, self.pending = self.pending, []
+        for message in messages:
+            self.log(message)
+
+    def get_stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Return the statistics of the recent calls of each operation.
+
+        Returns
+        -------
+        Dict[str, Dict[str, object]]
+            For each operation: ``count``, ``total``, ``max``, ``median`` and
+            ``max_size``, and ``histogram``, the number of calls per bucket.
+        """
+        with self.lock:
+            snapshot = {name: list(calls) for name, calls in self.calls.items()}
+        stats = {}
+        for name, calls in sorted(snapshot.items()):
+            durations = sorted(_[0] for _ in calls)
+            histogram = [0] * (len(BUCKETS) + 1)
+            for duration in durations:
+                index = 0
+                while index < len(BUCKETS) and duration > BUCKETS[index]:
+                    index += 1
+                histogram[index] += 1
+            stats[name] = {
+                'count': len(durations),
+                'total': sum(durations),
+                'max': durations[-1],
+                'median': durations[len(durations) // 2],
+                'max_size': max(_[1] for _ in calls),
+                'histogram': histogram,
+            }
+        return stats
+
+    def dump(self) -> List[str]:
+        """
+        Return a textual report of the statistics of the operations.
+
+        Returns
+        -------
+        List[str]
+            Lines of the report, one per operation, the empty buckets are omitted.
+        """
+        lines = []
+        for name, stats in self.get_stats().items():
+            buckets = ', '.join(
+                '{0}: {1}'.format(get_bucket_label(i), count)
+                for i, count in enumerate(stats['histogram'])  # type: ignore
+                if count
+            )
+            lines.append(
+                '{0}: {1} call(s), total {2:.3f}s, median {3:.3f}s, max {4:.3f}s, '
+                'max size {5} ({6})'.format(
+                    name,
+                    stats['count'],
+                    stats['total'],
+                    stats['median'],
+                    stats['max'],
+                    stats['max_size'],
+                    buckets,
+                )
+            )
+        return lines
+
+    def reset(self):
+        """Discard the recorded calls."""
+        with self.lock:
+            self.calls.clear()
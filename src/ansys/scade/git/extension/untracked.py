@@ -0,0 +1,171 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Detection of the untracked files of a working tree.
+
+The detection can be restricted, since walking a working tree which contains
+generated files, for example the code generated by KCG or the reports, is the
+slowest part of a status computation:
+
+* ``UNTRACKED_NO``: the untracked files are not detected.
+* ``UNTRACKED_PROJECT``: the detection is restricted to the directory of the project.
+* ``UNTRACKED_ALL``: the detection considers the whole working tree.
+
+The ignore rules are compiled once per directory and reused across the
+computations until an ignore file changes. The ignored directories are not walked.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dulwich.ignore import IgnoreFilterManager, default_user_ignore_filter_path
+from dulwich.index import Index
+from dulwich.repo import Repo
+
+UNTRACKED_NO = 'no'
+UNTRACKED_PROJECT = 'project'
+UNTRACKED_ALL = 'all'
+UNTRACKED_MODES = (UNTRACKED_NO, UNTRACKED_PROJECT, UNTRACKED_ALL)
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    """Return the modification time and size of a file, ``None`` if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class IgnoreCache:
+    """
+    Ignore rules of a repository, compiled once and cached per directory.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    """
+
+    def __init__(self, repo: Repo):
+        self.repo = repo
+        self.manager: Optional[IgnoreFilterManager] = None
+        # stat data of the ignore files and of the configuration used by the rules
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        config = repo.get_config_stack()
+        self.global_paths = [
+            os.path.join(repo.controldir(), 'info', 'exclude'),
+            os.path.expanduser(default_user_ignore_filter_path(config)),
+            os.path.join(repo.controldir(), 'config'),
+        ]
+
+    def validate(self):
+        """Compile the rules again if an ignore file or the configuration changed."""
+        if self.manager is not None and all(
+            _stat(path) == signature for path, signature in self.signatures.items()
+        ):
+            return
+        self.manager = IgnoreFilterManager.from_repo(self.repo)
+        self.signatures = {_: _stat(_) for _ in self.global_paths}
+
+    def is_ignored(self, path: str) -> bool:
+        """
+        Return whether a path is ignored.
+
+        Parameters
+        ----------
+        path : str
+            Posix path relative to the repository, with a trailing slash for the directories.
+
+        Returns
+        -------
+        bool
+        """
+        if self.manager is None:
+            self.validate()
+        assert self.manager is not None  # nosec B101  # addresses linter
+        # record the ignore files of the parent directories, read by the manager
+        dir = path.rstrip('/').rpartition('/')[0]
+        while True:
+            gitignore = os.path.join(self.repo.path, dir, '.gitignore')
+            if gitignore in self.signatures:
+                # the parent directories are already recorded
+                break
+            self.signatures[gitignore] = _stat(gitignore)
+            if not dir:
+                break
+            dir = dir.rpartition('/')[0]
+        return self.manager.is_ignored(path) is True
+
+
+def find_untracked(
+    repo_path: str, index: Index, ignores: IgnoreCache, dirs: Iterable[str] = ('',)
+) -> List[str]:
+    """
+    Return the untracked files of directories of a working tree, excluding the ignored ones.
+
+    The ignored directories and the nested repositories are not walked.
+
+    Parameters
+    ----------
+    repo_path : str
+        Path of the repository.
+    index : Index
+        Index of the repository.
+    ignores : IgnoreCache
+        Ignore rules of the repository.
+    dirs : Iterable[str]
+        Posix paths of the directories to walk, relative to the repository,
+        the whole working tree by default.
+
+    Returns
+    -------
+    List[str]
+        Posix paths relative to the repository.
+    """
+    untracked = []
+    stack = list(dirs)
+    while stack:
+        dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(repo_path, dir)) as it:
+                entries = list(it)
+        except OSError:
+            # missing directory
+            continue
+        if dir and any(_.name == '.git' for _ in entries):
+            # nested repository or submodule
+            continue
+        prefix = dir + '/' if dir else ''
+        for entry in entries:
+            if entry.name == '.git':
+                continue
+            path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                # the files of an ignored directory are ignored
+                if not ignores.is_ignored(path + '/'):
+                    stack.append(path)
+            elif path.encode('utf-8') not in index and not ignores.is_ignored(path):
+                untracked.append(path)
+    return untracked
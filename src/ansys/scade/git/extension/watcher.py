@@ -0,0 +1,700 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+File system watcher for the Git status.
+
+The watcher notifies the changes of a set of files:
+
+* Working tree files, for example the files of the SCADE projects: their
+  status must be computed again.
+* Git files, for example the index or the references: the whole status
+  must be computed again.
+
+The notifications are debounced and rate limited so that bulk saves,
+for example when the SCADE editor saves a project, produce a single
+notification.
+
+The watcher uses ReadDirectoryChangesW on Windows and inotify on Linux:
+both monitor the directories of the files, without accessing the files.
+Otherwise, it polls the stat data of the files at a configurable interval.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# callback called with the changed files, ``None`` when too many files changed
+# or when the changes are lost, and whether a Git file changed
+Callback = Callable[[Optional[Set[str]], bool], None]
+# changed files, or None, and whether a Git file changed
+Changes = Tuple[Optional[Set[str]], bool]
+
+# default duration between two polls of the polling watcher, in seconds
+POLLING_INTERVAL = 5.0
+
+
+class Debouncer:
+    """
+    Accumulate the changes until they settle down.
+
+    Parameters
+    ----------
+    delay : float
+        Duration without change, in seconds, before the changes are notified.
+    min_interval : float
+        Minimum duration between two notifications, in seconds.
+    max_paths : int
+        Maximum number of changed files: beyond, the files are not recorded anymore
+        and all the files are considered changed.
+    max_delay : float
+        Maximum duration, in seconds, before the changes are notified
+        when they keep on arriving.
+    clock : Callable[[], float]
+        Source of time, for unit tests.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.5,
+        min_interval: float = 2.0,
+        max_paths: int = 256,
+        max_delay: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.delay = delay
+        self.min_interval = min_interval
+        self.max_paths = max_paths
+        self.max_delay = max_delay
+        self.clock = clock
+        self.paths: Optional[Set[str]] = set()
+        self.git_changed = False
+        self.first_event: Optional[float] = None
+        self.last_event = 0.0
+        self.last_notification: Optional[float] = None
+
+    def add(self, paths: Optional[Iterable[str]], git_changed: bool = False):
+        """
+        Record changes.
+
+        Parameters
+        ----------
+        paths : Optional[Iterable[str]]
+            Changed files, ``None`` when all the files are considered changed.
+        git_changed : bool
+            Whether a Git file changed.
+        """
+        now = self.clock()
+        if paths is None:
+            self.paths = None
+        elif self.paths is not None:
+            self.paths.update(paths)
+            if len(self.paths) > self.max_paths:
+                # too many files: a full status is cheaper
+                self.paths = None
+        self.git_changed = self.git_changed or git_changed
+        if self.paths is not None and not self.paths and not self.git_changed:
+            return
+        if self.first_event is None:
+            self.first_event = now
+        self.last_event = now
+
+    def pop(self) -> Optional[Changes]:
+        """
+        Return the accumulated changes if they must be notified.
+
+        Returns
+        -------
+        Optional[Changes]
+            Changed files, ``None`` when all the files are considered changed,
+            and whether a Git file changed, ``None`` if nothing must be notified yet.
+        """
+        if self.first_event is None:
+            return None
+        now = self.clock()
+        if now - self.last_event < self.delay and now - self.first_event < self.max_delay:
+            # the changes have not settled down
+            return None
+        if self.last_notification is not None and now - self.last_notification < self.min_interval:
+            return None
+        changes = self.paths, self.git_changed
+        self.paths = set()
+        self.git_changed = False
+        self.first_event = None
+        self.last_notification = now
+        return changes
+
+
+class Watcher:
+    """
+    Base class for the watchers.
+
+    The changes are notified from the thread of the watcher.
+
+    Parameters
+    ----------
+    callback : Callback
+        Function called with the changed files and whether a Git file changed.
+    debouncer : Optional[Debouncer]
+        Debounce and rate limit policy, the default one when ``None``.
+    """
+
+    def __init__(self, callback: Callback, debouncer: Optional[Debouncer] = None):
+        self.callback = callback
+        self.debouncer = debouncer if debouncer is not None else Debouncer()
+        self.lock = threading.Lock()
+        # normalized paths of the watched files
+        self.files: Set[str] = set()
+        self.git_files: Set[str] = set()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def watch(self, files: Iterable[str], git_files: Iterable[str]):
+        """
+        Set the files to watch.
+
+        Parameters
+        ----------
+        files : Iterable[str]
+            Working tree files.
+        git_files : Iterable[str]
+            Git files which changes invalidate the whole status.
+        """
+        with self.lock:
+            self.files = {os.path.abspath(_) for _ in files}
+            self.git_files = {os.path.abspath(_) for _ in git_files}
+            self.on_watch()
+
+    def start(self):
+        """Start the thread of the watcher."""
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop the thread of the watcher."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.close()
+
+    def run(self):
+        """Wait for changes and notify them until the watcher is stopped."""
+        timeout = self.debouncer.delay / 2
+        while not self.stop_event.is_set():
+            changes = self.wait_changes(timeout)
+            if changes is not None:
+                self.debouncer.add(*changes)
+            changes = self.debouncer.pop()
+            if changes is not None:
+                self.callback(*changes)
+
+    def on_watch(self):
+        """Update the system resources after the watched files changed."""
+        pass
+
+    def close(self):
+        """Release the system resources."""
+        pass
+
+    def wait_changes(self, timeout: float) -> Optional[Changes]:
+        """
+        Wait for changes.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum duration of the wait, in seconds.
+
+        Returns
+        -------
+        Optional[Changes]
+            Changed files, ``None`` when the changes are lost, and whether
+            a Git file changed, if any.
+        """
+        raise NotImplementedError('Abstract method call')
+
+
+def _stat(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return the stat data of a file, ``None`` if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class PollingWatcher(Watcher):
+    """
+    Watcher comparing the stat data of the files at regular intervals.
+
+    Parameters
+    ----------
+    callback : Callback
+        Function called with the changed files and whether a Git file changed.
+    debouncer : Optional[Debouncer]
+        Debounce and rate limit policy, the default one when ``None``.
+    interval : float
+        Duration between two polls, in seconds.
+    """
+
+    def __init__(
+        self,
+        callback: Callback,
+        debouncer: Optional[Debouncer] = None,
+        interval: float = POLLING_INTERVAL,
+    ):
+        super().__init__(callback, debouncer)
+        self.interval = interval
+        self.stats: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+    def on_watch(self):
+        """Record the stat data of the watched files."""
+        self.stats = {_: _stat(_) for _ in self.files | self.git_files}
+
+    def check(self) -> Optional[Changes]:
+        """
+        Return the files which stat data changed since the last call.
+
+        Returns
+        -------
+        Optional[Changes]
+            Changed files, ``None`` when the changes are lost, and whether
+            a Git file changed, if any.
+        """
+        changed = set()
+        with self.lock:
+            for path, previous in self.stats.items():
+                current = _stat(path)
+                if current != previous:
+                    self.stats[path] = current
+                    changed.add(path)
+            git_changed = not changed.isdisjoint(self.git_files)
+        changed -= self.git_files
+        return (changed, git_changed) if changed or git_changed else None
+
+    def wait_changes(self, timeout: float) -> Optional[Changes]:
+        """Poll the files when the interval has elapsed."""
+        if self.stop_event.wait(self.interval):
+            return None
+        return self.check()
+
+
+# inotify constants, cf. <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+IN_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event: wd, mask, cookie, len, followed by the name
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _get_libc():
+    """Return the C library if it provides inotify, ``None`` otherwise."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyWatcher(Watcher):
+    """
+    Watcher relying on inotify, for Linux.
+
+    The watcher monitors the directories of the files and
+    filters the events with the watched files.
+
+    Parameters
+    ----------
+    callback : Callback
+        Function called with the changed files and whether a Git file changed.
+    debouncer : Optional[Debouncer]
+        Debounce and rate limit policy, the default one when ``None``.
+    """
+
+    def __init__(self, callback: Callback, debouncer: Optional[Debouncer] = None):
+        super().__init__(callback, debouncer)
+        self.libc = _get_libc()
+        if self.libc is None:
+            raise OSError('inotify is not available')
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # watch descriptors: directory <-> descriptor
+        self.dirs: Dict[str, int] = {}
+        self.wds: Dict[int, str] = {}
+
+    def on_watch(self):
+        """Monitor the directories of the watched files."""
+        dirs = {os.path.dirname(_) for _ in self.files | self.git_files}
+        for directory in set(self.dirs) - dirs:
+            self.libc.inotify_rm_watch(self.fd, self.dirs[directory])
+            del self.wds[self.dirs.pop(directory)]
+        for directory in dirs - set(self.dirs):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_MASK)
+            if wd >= 0:
+                self.dirs[directory] = wd
+                self.wds[wd] = directory
+
+    def close(self):
+        """Release the inotify instance."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self.dirs.clear()
+            self.wds.clear()
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """
+        Read the pending events.
+
+        Returns
+        -------
+        List[Tuple[int, int, str]]
+            Watch descriptor, mask and name of the events.
+        """
+        events = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return events
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def wait_changes(self, timeout: float) -> Optional[Changes]:
+        """Wait for inotify events and filter the watched files."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return None
+        changed: Optional[Set[str]] = set()
+        git_changed = False
+        with self.lock:
+            for wd, mask, name in self.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    # events lost
+                    changed = None
+                    continue
+                directory = self.wds.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if path in self.git_files:
+                    git_changed = True
+                elif path in self.files and changed is not None:
+                    changed.add(path)
+        return (changed, git_changed) if changed != set() or git_changed else None
+
+
+# ReadDirectoryChangesW constants, cf. <winnt.h> and <fileapi.h>
+FILE_LIST_DIRECTORY = 0x0001
+FILE_SHARE_ALL = 0x0001 | 0x0002 | 0x0004
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+FILE_FLAG_OVERLAPPED = 0x40000000
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x0001
+FILE_NOTIFY_CHANGE_SIZE = 0x0008
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x0010
+FILE_NOTIFY_MASK = (
+    FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE
+)
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+# struct FILE_NOTIFY_INFORMATION: next entry offset, action, length of the name
+# in bytes, followed by the name in UTF-16
+NOTIFY_HEADER = struct.Struct('<III')
+NOTIFY_BUFFER_SIZE = 64 * 1024
+
+
+class OVERLAPPED(ctypes.Structure):
+    """Windows ``OVERLAPPED`` structure, for the asynchronous requests."""
+
+    _fields_ = [
+        ('Internal', ctypes.c_void_p),
+        ('InternalHigh', ctypes.c_void_p),
+        ('Offset', ctypes.c_uint32),
+        ('OffsetHigh', ctypes.c_uint32),
+        ('hEvent', ctypes.c_void_p),
+    ]
+
+
+def _get_kernel32():
+    """Return the Windows kernel library with the prototypes of its functions, if any."""
+    if sys.platform != 'win32':
+        return None
+    try:
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)  # type: ignore
+    except (OSError, AttributeError):
+        return None
+    handle, dword, bool_ = ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int
+    prototypes = {
+        'CreateFileW': (
+            handle,
+            [ctypes.c_wchar_p, dword, dword, ctypes.c_void_p, dword, dword, handle],
+        ),
+        'CreateIoCompletionPort': (handle, [handle, handle, ctypes.c_size_t, dword]),
+        'ReadDirectoryChangesW': (
+            bool_,
+            [
+                handle,
+                ctypes.c_void_p,
+                dword,
+                bool_,
+                dword,
+                ctypes.POINTER(dword),
+                ctypes.POINTER(OVERLAPPED),
+                ctypes.c_void_p,
+            ],
+        ),
+        'GetQueuedCompletionStatus': (
+            bool_,
+            [
+                handle,
+                ctypes.POINTER(dword),
+                ctypes.POINTER(ctypes.c_size_t),
+                ctypes.POINTER(ctypes.c_void_p),
+                dword,
+            ],
+        ),
+        'CancelIoEx': (bool_, [handle, ctypes.c_void_p]),
+        'CloseHandle': (bool_, [handle]),
+    }
+    for name, (restype, argtypes) in prototypes.items():
+        function = getattr(kernel32, name)
+        function.restype = restype
+        function.argtypes = argtypes
+    return kernel32
+
+
+def parse_notifications(data: bytes) -> List[str]:
+    """
+    Return the names of the files of a ``FILE_NOTIFY_INFORMATION`` buffer.
+
+    Parameters
+    ----------
+    data : bytes
+        Content of the buffer filled by ``ReadDirectoryChangesW``.
+
+    Returns
+    -------
+    List[str]
+        Names of the changed files, relative to the monitored directory.
+    """
+    names = []
+    offset = 0
+    while offset + NOTIFY_HEADER.size <= len(data):
+        next_offset, _, length = NOTIFY_HEADER.unpack_from(data, offset)
+        start = offset + NOTIFY_HEADER.size
+        names.append(data[start : start + length].decode('utf-16-le'))
+        if next_offset == 0:
+            break
+        offset += next_offset
+    return names
+
+
+class WindowsWatcher(Watcher):
+    """
+    Watcher relying on ReadDirectoryChangesW, for Windows.
+
+    The watcher monitors the directories of the files with asynchronous requests
+    completed through a single I/O completion port, and filters the notifications
+    with the watched files.
+
+    Parameters
+    ----------
+    callback : Callback
+        Function called with the changed files and whether a Git file changed.
+    debouncer : Optional[Debouncer]
+        Debounce and rate limit policy, the default one when ``None``.
+    """
+
+    def __init__(self, callback: Callback, debouncer: Optional[Debouncer] = None):
+        super().__init__(callback, debouncer)
+        self.kernel32 = _get_kernel32()
+        if self.kernel32 is None:
+            raise OSError('ReadDirectoryChangesW is not available')
+        self.port = self.kernel32.CreateIoCompletionPort(INVALID_HANDLE_VALUE, None, 0, 1)
+        if not self.port:
+            raise OSError(ctypes.get_last_error(), 'CreateIoCompletionPort failed')
+        # monitored directories: directory -> key, key -> directory, handle, buffer, overlapped
+        self.dirs: Dict[str, int] = {}
+        self.watches: Dict[int, tuple] = {}
+        # requests cancelled, kept alive until the system releases their buffer
+        self.cancelled: Dict[int, tuple] = {}
+        self.next_key = 1
+        # watched files indexed by normalized path, the names are notified with their actual case
+        self.file_keys: Dict[str, str] = {}
+        self.git_keys: Set[str] = set()
+
+    def on_watch(self):
+        """Monitor the directories of the watched files."""
+        self.file_keys = {os.path.normcase(_): _ for _ in self.files}
+        self.git_keys = {os.path.normcase(_) for _ in self.git_files}
+        dirs = {os.path.dirname(_) for _ in self.files | self.git_files}
+        for directory in set(self.dirs) - dirs:
+            self.cancel(self.dirs[directory])
+        for directory in dirs - set(self.dirs):
+            handle = self.kernel32.CreateFileW(
+                directory,
+                FILE_LIST_DIRECTORY,
+                FILE_SHARE_ALL,
+                None,
+                OPEN_EXISTING,
+                FILE_FLAG_BACKUP_SEMANTICS | FILE_FLAG_OVERLAPPED,
+                None,
+            )
+            if handle in {None, INVALID_HANDLE_VALUE}:
+                # missing directory
+                continue
+            key = self.next_key
+            self.next_key += 1
+            if not self.kernel32.CreateIoCompletionPort(handle, self.port, key, 0):
+                self.kernel32.CloseHandle(handle)
+                continue
+            buffer = ctypes.create_string_buffer(NOTIFY_BUFFER_SIZE)
+            self.dirs[directory] = key
+            self.watches[key] = (directory, handle, buffer, OVERLAPPED())
+            if not self.read_changes(key):
+                self.cancel(key, pending=False)
+
+    def read_changes(self, key: int) -> bool:
+        """Request the next changes of a monitored directory."""
+        _, handle, buffer, overlapped = self.watches[key]
+        return bool(
+            self.kernel32.ReadDirectoryChangesW(
+                handle,
+                buffer,
+                len(buffer),
+                False,
+                FILE_NOTIFY_MASK,
+                None,
+                ctypes.byref(overlapped),
+                None,
+            )
+        )
+
+    def cancel(self, key: int, pending: bool = True):
+        """Stop monitoring a directory, and cancel its request if pending."""
+        watch = self.watches.pop(key)
+        del self.dirs[watch[0]]
+        if pending:
+            self.kernel32.CancelIoEx(watch[1], None)
+            self.cancelled[key] = watch
+        self.kernel32.CloseHandle(watch[1])
+
+    def close(self):
+        """Release the directories and the completion port."""
+        if self.port:
+            for key in list(self.watches):
+                self.cancel(key)
+            self.kernel32.CloseHandle(self.port)
+            self.port = None
+
+    def wait_changes(self, timeout: float) -> Optional[Changes]:
+        """Wait for the completion of a request and filter the watched files."""
+        size = ctypes.c_uint32()
+        key = ctypes.c_size_t()
+        overlapped = ctypes.c_void_p()
+        status = self.kernel32.GetQueuedCompletionStatus(
+            self.port,
+            ctypes.byref(size),
+            ctypes.byref(key),
+            ctypes.byref(overlapped),
+            int(timeout * 1000),
+        )
+        if not overlapped.value:
+            # timeout
+            return None
+        with self.lock:
+            if self.cancelled.pop(key.value, None) is not None or key.value not in self.watches:
+                return None
+            directory, _, buffer, _ = self.watches[key.value]
+            # an empty buffer means that the changes did not fit: they are lost
+            names = parse_notifications(buffer.raw[: size.value]) if status and size.value else None
+            if not status or not self.read_changes(key.value):
+                # the directory can't be monitored anymore, for example it has been
+                # removed: it is monitored again with the next watched files
+                self.cancel(key.value, pending=False)
+        if names is None:
+            return None, False
+        changed = set()
+        git_changed = False
+        for name in names:
+            path = os.path.normcase(os.path.join(directory, name))
+            if path in self.git_keys:
+                git_changed = True
+            elif path in self.file_keys:
+                changed.add(self.file_keys[path])
+        return (changed, git_changed) if changed or git_changed else None
+
+
+def create_watcher(
+    callback: Callback, debouncer: Optional[Debouncer] = None, interval: float = POLLING_INTERVAL
+) -> Watcher:
+    """
+    Return the most efficient watcher available on the platform.
+
+    Parameters
+    ----------
+    callback : Callback
+        Function called with the changed files and whether a Git file changed.
+    debouncer : Optional[Debouncer]
+        Debounce and rate limit policy, the default one when ``None``.
+    interval : float
+        Duration between two polls, in seconds, when the platform
+        does not notify the changes.
+
+    Returns
+    -------
+    Watcher
+    """
+    for cls in WindowsWatcher, InotifyWatcher:
+        try:
+            return cls(callback, debouncer)
+        except OSError:
+            pass
+    return PollingWatcher(callback, debouncer, interval)
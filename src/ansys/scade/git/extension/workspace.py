@@ -0,0 +1,556 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Working copies of SCADE projects from Git trees.
+
+A working copy contains only the project file, the files referenced by
+the project and the annotation files of the SCADE models. It is built
+from the objects of the repository, without creating an archive.
+
+The working copies are incremental: a marker file records the tree and the
+files of the copy, so that only the files which differ from the requested
+tree are written again. The files can be hard links to a blob store shared
+by the working copies of a repository, bounded in size.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from pathlib import Path, PureWindowsPath
+import posixpath
+import shutil
+import stat
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dulwich.index import build_file_from_blob
+from dulwich.object_store import BaseObjectStore
+from dulwich.objects import Blob, Tree
+from dulwich.objectspec import parse_tree
+from dulwich.repo import Repo
+from lxml import etree as et
+
+# name of the file describing the content of a working copy
+MARKER_FILE_NAME = '.scade-git-workspace.json'
+# default maximum size of the blob store of a repository
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+# permissions of the files of the blob store, shared by hard links
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def lookup_tree_paths(
+    store: BaseObjectStore, tree_id: bytes, paths: Iterable[bytes]
+) -> Dict[bytes, Tuple[int, bytes]]:
+    """
+    Return the entries of files in a tree.
+
+    Each sub-tree is read once, whatever the number of files it contains.
+
+    Parameters
+    ----------
+    store : BaseObjectStore
+        Object store of the repository.
+    tree_id : bytes
+        Id of the root tree.
+    paths : Iterable[bytes]
+        Index paths of the files.
+
+    Returns
+    -------
+    Dict[bytes, Tuple[int, bytes]]
+        Mode and blob id of the files, indexed by path. The files
+        not present in the tree are omitted.
+    """
+    trees: Dict[bytes, Optional[Tree]] = {b'': store[tree_id]}  # type: ignore
+
+    def get_tree(path: bytes) -> Optional[Tree]:
+        if path in trees:
+            return trees[path]
+        parent_path, _, name = path.rpartition(b'/')
+        parent = get_tree(parent_path)
+        tree = None
+        if parent is not None and name in parent:
+            mode, sha = parent[name]
+            if stat.S_ISDIR(mode):
+                tree = store[sha]
+        trees[path] = tree  # type: ignore
+        return tree
+
+    entries = {}
+    for path in paths:
+        dir_path, _, name = path.rpartition(b'/')
+        tree = get_tree(dir_path)
+        if tree is not None and name in tree:
+            mode, sha = tree[name]
+            if not stat.S_ISDIR(mode):
+                entries[path] = mode, sha
+    return entries
+
+
+def get_file_refs(data: bytes) -> List[str]:
+    """
+    Return the paths of the files referenced by a project.
+
+    Parameters
+    ----------
+    data : bytes
+        Content of the project file.
+
+    Returns
+    -------
+    List[str]
+        Values of the ``persistAs`` attributes of the ``FileRef`` elements.
+    """
+    root = et.fromstring(data, parser=et.XMLParser(resolve_entities=False))
+    return [_.get('persistAs', '') for _ in root.iter('FileRef')]
+
+
+def get_project_tree_paths(project: str, file_refs: List[str]) -> Set[str]:
+    """
+    Return the index paths of the files of a project.
+
+    The files outside of the repository, for example the ones
+    using macros such as ``$(SCADE)``, are ignored.
+
+    Parameters
+    ----------
+    project : str
+        Index path of the project file.
+    file_refs : List[str]
+        Paths of the files referenced by the project, relative to its directory.
+
+    Returns
+    -------
+    Set[str]
+        Index paths of the project, its files and the annotation files of the models.
+    """
+    paths = {project}
+    project_dir = posixpath.dirname(project)
+    for file_ref in file_refs:
+        if not file_ref or '$(' in file_ref:
+            continue
+        if PureWindowsPath(file_ref).drive or posixpath.isabs(file_ref.replace('\\', '/')):
+            continue
+        path = posixpath.normpath(posixpath.join(project_dir, file_ref.replace('\\', '/')))
+        if path == '..' or path.startswith('../'):
+            continue
+        paths.add(path)
+        if path.endswith('.xscade'):
+            paths.add(path[: -len('.xscade')] + '.ann')
+    return paths
+
+
+def remove_file(path: str):
+    """
+    Remove a file, even if read-only.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.unlink(path)
+
+
+def remove_tree(path: Path):
+    """
+    Remove a directory, even if it contains read-only files.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the directory.
+    """
+
+    def on_error(function, path, _):
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        function(path)
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=on_error)
+    else:
+        shutil.rmtree(path, onerror=on_error)
+
+
+class BlobStore:
+    """
+    Store of the blobs of a repository, one read-only file per blob.
+
+    The files of the working copies are hard links to the files of the store,
+    when the file system supports it. Otherwise, the store is not used: its blobs
+    would not be linked to any working copy, thus neither bounded nor preserved.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory of the store.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        # whether the file system supports hard links, unknown until the first link
+        self.hard_links: Optional[bool] = None
+
+    def get_path(self, sha: bytes) -> Path:
+        """
+        Return the path of a blob in the store.
+
+        Parameters
+        ----------
+        sha : bytes
+            Hexadecimal id of the blob.
+
+        Returns
+        -------
+        Path
+        """
+        sha_hex = sha.decode('ascii')
+        return self.directory / sha_hex[:2] / sha_hex[2:]
+
+    def link(self, blob: Blob, path: str) -> bool:
+        """
+        Create a file from a blob, linked to the store.
+
+        Parameters
+        ----------
+        blob : Blob
+            Content of the file.
+        path : str
+            Path of the file.
+
+        Returns
+        -------
+        bool
+            Whether the file is linked, else the caller writes the file,
+            for example when the file system does not support hard links.
+        """
+        if self.hard_links is False:
+            return False
+        stored = self.get_path(blob.id)
+        if not stored.exists():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            # the same blob can be added concurrently
+            tmp = stored.with_name('{0}.{1}.tmp'.format(stored.name, threading.get_ident()))
+            tmp.write_bytes(blob.as_raw_string())
+            os.chmod(tmp, READ_ONLY)
+            os.replace(tmp, stored)
+        try:
+            os.link(stored, path)
+        except OSError:
+            if self.hard_links is None:
+                # no hard links on this file system: the unlinked blob is pruned later
+                self.hard_links = False
+            return False
+        self.hard_links = True
+        return True
+
+    def size(self) -> int:
+        """
+        Return the size of the store.
+
+        Returns
+        -------
+        int
+        """
+        size = 0
+        for file in self.directory.glob('*/*'):
+            size += file.stat().st_size
+        return size
+
+    def prune(self) -> int:
+        """
+        Remove the blobs which are not linked to any working copy.
+
+        Returns
+        -------
+        int
+            Size of the removed blobs.
+        """
+        size = 0
+        for file in self.directory.glob('*/*'):
+            st = file.stat()
+            if st.st_nlink == 1:
+                remove_file(str(file))
+                size += st.st_size
+        return size
+
+
+def write_blob(path: str, blob: Blob, mode: int, blob_store: Optional[BlobStore] = None):
+    """
+    Write a blob to a file, creating its directory if needed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    blob : Blob
+        Content of the file.
+    mode : int
+        Mode of the tree entry.
+    blob_store : Optional[BlobStore]
+        Store to link the file to, if any.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # the existing file may be a read-only link to the store
+    remove_file(path)
+    if blob_store is None or not stat.S_ISREG(mode) or not blob_store.link(blob, path):
+        build_file_from_blob(blob, mode, os.fsencode(path))
+
+
+def read_marker(target_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return the description of a working copy, ``None`` if not valid.
+
+    Parameters
+    ----------
+    target_dir : Path
+        Root directory of the working copy.
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        Tree, project and files of the working copy: ``{path: [mode, sha, size]}``.
+    """
+    try:
+        with (target_dir / MARKER_FILE_NAME).open() as f:
+            marker = json.load(f)
+        return marker if isinstance(marker.get('files'), dict) else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def is_intact(path: Path, size: int) -> bool:
+    """
+    Return whether a file of a working copy has not been removed or modified.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the file.
+    size : int
+        Size of the file, as recorded in the marker.
+
+    Returns
+    -------
+    bool
+    """
+    try:
+        return os.lstat(path).st_size == size
+    except OSError:
+        return False
+
+
+def get_workspace_size(target_dir: Path) -> int:
+    """
+    Return the size of the files of a working copy, as recorded in its marker.
+
+    Parameters
+    ----------
+    target_dir : Path
+        Root directory of the working copy.
+
+    Returns
+    -------
+    int
+    """
+    marker = read_marker(target_dir)
+    return sum(_[2] for _ in marker['files'].values()) if marker is not None else 0
+
+
+def materialize_project(
+    repo: Repo,
+    treeish: str,
+    project: str,
+    target_dir: Path,
+    jobs: Optional[int] = None,
+    blob_store: Optional[BlobStore] = None,
+) -> Optional[Path]:
+    """
+    Write the files of a project from a tree of a repository.
+
+    When ``target_dir`` is an existing working copy, only the files which
+    differ are written. The objects are read sequentially, the object store
+    not being thread-safe, and the files are written by a pool of threads.
+
+    Parameters
+    ----------
+    repo : Repo
+        Git repository.
+    treeish : str
+        Branch, commit or tree containing the project.
+    project : str
+        Index path of the project file.
+    target_dir : Path
+        Root directory of the working copy.
+    jobs : Optional[int]
+        Number of threads writing the files, default when ``None``.
+    blob_store : Optional[BlobStore]
+        Store to link the files to, if any.
+
+    Returns
+    -------
+    Optional[Path]
+        Path of the project in the working copy, ``None`` if the project
+        is not present in the tree.
+    """
+    tree = parse_tree(repo, treeish)
+    project_path = target_dir.joinpath(*project.split('/'))
+    marker = read_marker(target_dir)
+    if marker is None:
+        # not a working copy
+        if target_dir.exists():
+            remove_tree(target_dir)
+        old_files = {}
+    else:
+        old_files = marker['files']
+        if marker.get('project') == project and marker.get('tree') == tree.id.decode('ascii'):
+            if all(
+                is_intact(target_dir.joinpath(*path.split('/')), size)
+                for path, (_, _, size) in old_files.items()
+            ):
+                # up-to-date: mark the working copy as recently used
+                os.utime(target_dir / MARKER_FILE_NAME)
+                return project_path
+
+    store = repo.object_store
+    entry = lookup_tree_paths(store, tree.id, [project.encode('utf-8')]).get(
+        project.encode('utf-8')
+    )
+    if entry is None:
+        return None
+    etp = store[entry[1]]
+    assert isinstance(etp, Blob)  # nosec B101  # addresses linter
+    paths = get_project_tree_paths(project, get_file_refs(etp.data))
+    entries: Dict[bytes, Tuple[int, bytes]] = lookup_tree_paths(
+        store, tree.id, [_.encode('utf-8') for _ in sorted(paths)]
+    )
+
+    # differences between the working copy and the tree
+    files = {}
+    for path, (mode, sha) in entries.items():
+        files[path.decode('utf-8')] = [mode, sha.decode('ascii')]
+    for path in set(old_files) - set(files):
+        remove_file(str(target_dir.joinpath(*path.split('/'))))
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for path, (mode, sha) in files.items():
+            old = old_files.get(path)
+            file = target_dir.joinpath(*path.split('/'))
+            if old is not None and old[:2] == [mode, sha] and is_intact(file, old[2]):
+                # unchanged
+                files[path].append(old[2])
+                continue
+            blob = store[sha.encode('ascii')]
+            assert isinstance(blob, Blob)  # nosec B101  # addresses linter
+            files[path].append(blob.raw_length())
+            futures.append(executor.submit(write_blob, str(file), blob, mode, blob_store))
+        for future in futures:
+            # raise the exceptions, if any
+            future.result()
+    marker = {'project': project, 'tree': tree.id.decode('ascii'), 'files': files}
+    with (target_dir / MARKER_FILE_NAME).open('w') as f:
+        json.dump(marker, f)
+    return project_path
+
+
+class WorkspaceCache:
+    """
+    Working copies of the projects of a repository, sharing a blob store.
+
+    The least recently used working copies are removed when the size of the
+    blob store exceeds a limit, or the size of the working copies when the file
+    system does not support hard links.
+
+    Parameters
+    ----------
+    root : Path
+        Directory of the working copies.
+    max_size : int
+        Maximum size of the blob store, in bytes.
+    """
+
+    def __init__(self, root: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.root = root
+        self.max_size = max_size
+        self.blob_store = BlobStore(root / '.blobs')
+
+    def get_path(self, name: str) -> Path:
+        """
+        Return the directory of a working copy.
+
+        The directory is named after the alphanumeric characters of the name,
+        suffixed by a digest of the name: distinct names never share a directory,
+        and a name never maps to the root of the cache or to the blob store.
+
+        Parameters
+        ----------
+        name : str
+            Name of the working copy, for example the name of a branch.
+
+        Returns
+        -------
+        Path
+        """
+        readable = ''.join(_ for _ in name if _.isalnum() or _ in '._-').strip('.')
+        digest = hashlib.sha256(name.encode('utf-8')).hexdigest()[:12]
+        return self.root / ('{0}-{1}'.format(readable, digest) if readable else digest)
+
+    def evict(self, keep: Optional[Path] = None):
+        """
+        Remove the least recently used working copies until the store fits its limit.
+
+        Parameters
+        ----------
+        keep : Optional[Path]
+            Working copy to preserve, for example the one in use.
+        """
+        workspaces = []
+        for marker in self.root.glob('*/' + MARKER_FILE_NAME):
+            workspaces.append((marker.stat().st_mtime, marker.parent))
+        linked = self.blob_store.hard_links is not False
+        if linked:
+            size = self.blob_store.size()
+        else:
+            # the files are copies: the store only contains unlinked blobs, if any
+            self.blob_store.prune()
+            size = sum(get_workspace_size(workspace) for _, workspace in workspaces)
+        if size <= self.max_size:
+            return
+        for _, workspace in sorted(workspaces):
+            if workspace == keep:
+                continue
+            freed = 0 if linked else get_workspace_size(workspace)
+            remove_tree(workspace)
+            size -= self.blob_store.prune() if linked else freed
+            if size <= self.max_size:
+                break
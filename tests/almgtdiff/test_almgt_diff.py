@@ -0,0 +1,70 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for almgtdiff.py."""
+
+from shutil import copyfile
+
+from ansys.scade.git.almgtdiff.almgtdiff import ADDED, CHANGED, REMOVED, diff
+from test_utils import get_resources_dir
+
+resources_dir = get_resources_dir() / 'almgtmerge' / 'resources' / 'Nominal'
+
+
+def test_almgtdiff_nominal():
+    changes = set(diff(str(resources_dir / 'Base.almgt'), str(resources_dir / 'Local.almgt')))
+    assert changes == {
+        (REMOVED, '!ed/18/134D/3DB4/607ecda0229a', 'P::O1/', 'CC_HLR_IN_02', 'ADD_LINK', None),
+        (ADDED, '!ed/18/134D/3DB4/607ecda0229a', 'P::O1/', 'CC_HLR_IN_05', None, 'ADD_LINK'),
+        (ADDED, '!ed/18/134D/3DB4/607ecda0229a', 'P::O1/', 'CC_HLR_OUT_03', None, 'REMOVE_LINK'),
+        (REMOVED, '!ed/30/134D/3DB4/607ecda436d0', 'P::O4/', 'CC_HLR_IN_04', 'ADD_LINK', None),
+        (REMOVED, '!ed/30/279D/8AC4/6613de4638e2', 'P::O7/', 'CC_HLR_OUT_02', 'REMOVE_LINK', None),
+        (ADDED, '!ed/38/134D/3DB4/607ecda4169', 'P::O5/', 'CC_HLR_IN_08', None, 'ADD_LINK'),
+    }
+
+
+def test_almgtdiff_identical(tmpdir):
+    base = resources_dir / 'Base.almgt'
+    copy = tmpdir / 'DiffBase.almgt'
+    copyfile(base, copy)
+    assert list(diff(str(base), str(copy))) == []
+
+
+def test_almgtdiff_trace_type(tmpdir):
+    base = resources_dir / 'Base.almgt'
+    modified = tmpdir / 'DiffModified.almgt'
+    text = base.read_text().replace(
+        '"CC_HLR_IN_03" traceType="ADD_LINK"', '"CC_HLR_IN_03" traceType="REMOVE_LINK"'
+    )
+    modified.write_text(text)
+    changes = list(diff(str(base), str(modified)))
+    assert changes == [
+        (
+            CHANGED,
+            '!ed/20/134D/3DB4/607ecda33fb1',
+            'P::O2/',
+            'CC_HLR_IN_03',
+            'ADD_LINK',
+            'REMOVE_LINK',
+        ),
+    ]
@@ -22,11 +22,14 @@
 
 """Unit tests for almgtmerge3.py."""
 
+import io
 from pathlib import Path
+import sys
 
 import pytest
 
-from ansys.scade.git.almgtmerge.almgtmerge3 import merge3
+from ansys.scade.git.almgtmerge.__main__ import batch, read_manifest
+from ansys.scade.git.almgtmerge.almgtmerge3 import merge3, merge3_batch
 from test_utils import cmp_file, get_resources_dir
 
 almgtmerge_data_nominal = [
@@ -78,3 +81,66 @@ def test_almgtmerge_robustness(capsys, dir, tmpdir):
     merge_args.append(result)
     status = merge3(*merge_args)
     assert not status
+
+
+def test_almgtmerge_batch(capsys, tmpdir):
+    dirs = almgtmerge_data_nominal + almgtmerge_data_robustness
+    items = []
+    for dir in dirs:
+        merge_args = [str(dir / (_ + '.almgt')) for _ in ['Local', 'Remote', 'Base']]
+        merge_args.append(str(tmpdir / (dir.name + 'BatchMerge.almgt')))
+        items.append(tuple(merge_args))
+    results = list(merge3_batch(items, jobs=2))
+    # results are provided in the order of the inputs
+    assert [_[0] for _ in results] == items
+    assert [_[1] for _ in results] == [True, True, False]
+    assert all(_[2] >= 0 for _ in results)
+    # errors are returned, not printed by the workers
+    assert [bool(_[3]) for _ in results] == [False, False, True]
+
+    # compare to the references
+    captured = capsys.readouterr()
+    for dir in almgtmerge_data_nominal:
+        diff = cmp_file(dir / 'Merge.almgt', tmpdir / (dir.name + 'BatchMerge.almgt'), n=0)
+        for line in diff:
+            print(line, end='')
+    captured = capsys.readouterr()
+    assert captured.out == ''
+
+
+def test_almgtmerge_manifest():
+    manifest = io.StringIO(
+        '# comment\n'
+        '{"base": "b1", "local": "l1", "remote": "r1", "merged": "m1"}\n'
+        '\n'
+        'b2\tl2\tr2\tm2\n'
+    )
+    items = list(read_manifest(manifest))
+    assert items == [('l1', 'r1', 'b1', 'm1'), ('l2', 'r2', 'b2', 'm2')]
+
+
+def test_almgtmerge_manifest_malformed(capsys):
+    manifest = io.StringIO(
+        'b1\tl1\tr1\n'
+        '{"base": "b2", "local": "l2"\n'
+        '{"base": "b3", "local": "l3", "remote": "r3"}\n'
+        '["b4", "l4", "r4", "m4"]\n'
+        'b5\tl5\tr5\tm5\n'
+    )
+    errors = []
+    items = list(read_manifest(manifest, errors))
+    # the valid lines are still read
+    assert items == [('l5', 'r5', 'b5', 'm5')]
+    assert errors == [1, 2, 3, 4]
+    assert 'line 3: malformed entry' in capsys.readouterr().out
+
+
+def test_almgtmerge_batch_stdin(capsys, monkeypatch):
+    stdin = io.StringIO('b1\tl1\n')
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    assert not batch('-', 1)
+    # the standard input is not closed
+    assert not stdin.closed
+    out = capsys.readouterr().out
+    assert 'failed line 1' in out
+    assert '0 merged, 1 failed' in out
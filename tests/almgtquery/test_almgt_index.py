@@ -0,0 +1,102 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for almgtindex.py."""
+
+from pathlib import Path
+from shutil import copyfile
+
+from ansys.scade.git.almgtquery.almgtindex import (
+    TraceQuery,
+    get_index_path,
+    load_index,
+)
+from test_utils import get_resources_dir
+
+
+def get_almgt_file(name: str, tmpdir: Path) -> Path:
+    """Copy an ALMGT test file to tmpdir since its index is saved next to it."""
+    src = get_resources_dir() / 'almgtmerge' / 'resources' / 'Nominal' / (name + '.almgt')
+    dst = tmpdir / ('Query' + name + '.almgt')
+    copyfile(src, dst)
+    return dst
+
+
+def test_almgtindex_nominal(tmpdir):
+    path = get_almgt_file('Base', tmpdir)
+    index = load_index(str(path))
+    assert index
+    assert get_index_path(str(path)).exists()
+    assert index.get_requirements('!ed/18/134D/3DB4/607ecda0229a') == {
+        'CC_HLR_IN_01': 'ADD_LINK',
+        'CC_HLR_IN_02': 'ADD_LINK',
+    }
+    assert set(index.get_objects('CC_HLR_IN_04')) == {
+        ('!ed/28/134D/3DB4/607ecda4154c', 'P::O3/', 'ADD_LINK'),
+        ('!ed/30/134D/3DB4/607ecda436d0', 'P::O4/', 'ADD_LINK'),
+    }
+    assert index.get_objects('unknown') == []
+    assert index.get_requirements('unknown') == {}
+
+
+def test_almgtindex_persistence(tmpdir):
+    path = get_almgt_file('Remote', tmpdir)
+    index = load_index(str(path))
+    assert index
+    # the persisted index is used when the file is unchanged
+    reloaded = load_index(str(path))
+    assert reloaded
+    assert reloaded.objects == index.objects
+    assert reloaded.requirements == index.requirements
+    # the persisted index is invalidated when the file changes
+    text = path.read_text().replace('CC_HLR_IN_02', 'CC_HLR_IN_99')
+    path.write_text(text)
+    updated = load_index(str(path))
+    assert updated
+    assert updated.hash != index.hash
+    assert updated.get_objects('CC_HLR_IN_02') == []
+    assert updated.get_objects('CC_HLR_IN_99')
+
+
+def test_almgtquery_files(tmpdir):
+    paths = [str(get_almgt_file(_, tmpdir)) for _ in ['Local', 'Base']]
+    query = TraceQuery(paths, persist=False)
+    assert len(query.indexes) == 2
+    results = query.get_objects('CC_HLR_IN_03')
+    assert {_[0] for _ in results} == set(paths)
+    results = query.get_requirements('!ed/38/134D/3DB4/607ecda4169')
+    assert results == [(paths[0], 'CC_HLR_IN_08', 'ADD_LINK')]
+
+
+def test_almgtquery_robustness(tmpdir):
+    query = TraceQuery()
+    assert not query.add_file(str(tmpdir / 'Unknown.almgt'))
+    assert query.get_objects('CC_HLR_IN_03') == []
+
+
+def test_almgtindex_malformed(tmpdir, capsys):
+    path = Path(tmpdir) / 'Malformed.almgt'
+    path.write_text('<?xml version="1.0"?>\n<objects><object id="1">\n')
+    assert load_index(str(path)) is None
+    assert 'Malformed.almgt' in capsys.readouterr().out
+    assert not get_index_path(str(path)).exists()
@@ -0,0 +1,314 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Benchmark of GitClient on synthetic repositories.
+
+The script generates a local repository with a configurable number of tracked
+files, directory depth, changes and branches, times the main operations of
+GitClient, and stores the results as JSON so that they can be compared across
+versions::
+
+    python tests/extension/benchmark.py --files 20000 --depth 4 -o results.json
+
+The objects of the first ``packed`` ratio of the files are packed, the other
+ones are loose objects.
+"""
+
+from argparse import ArgumentParser
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+if __name__ == '__main__':
+    # allow running the script from the root of the repository
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+import dulwich  # noqa: E402
+
+from ansys.scade.git.extension.gitclient import GitClient  # noqa: E402
+
+
+class BenchmarkConfig:
+    """
+    Parameters of a synthetic repository.
+
+    Parameters
+    ----------
+    files : int
+        Number of tracked files.
+    depth : int
+        Depth of the directories containing the files.
+    fanout : int
+        Number of sub-directories per directory.
+    staged : int
+        Number of modified files added to the index.
+    unstaged : int
+        Number of modified files not added to the index.
+    untracked : int
+        Number of new files.
+    ignored : int
+        Number of generated files, in an ignored directory.
+    packed : float
+        Ratio of the tracked files which objects are packed.
+    branches : int
+        Number of branches, in addition to ``main``.
+    repeat : int
+        Number of runs of the read-only operations, the best time is kept.
+    untracked_mode : str
+        Files considered for the untracked files, ``no``, ``project`` or ``all``.
+    slow_threshold : float
+        Minimum duration, in seconds, of the Git operations counted in ``logs``.
+    """
+
+    def __init__(
+        self,
+        files: int = 5000,
+        depth: int = 3,
+        fanout: int = 8,
+        staged: int = 50,
+        unstaged: int = 50,
+        untracked: int = 50,
+        ignored: int = 1000,
+        packed: float = 0.8,
+        branches: int = 100,
+        repeat: int = 3,
+        untracked_mode: str = 'all',
+        slow_threshold: float = 0.5,
+    ):
+        self.files = files
+        self.depth = depth
+        self.fanout = fanout
+        self.staged = staged
+        self.unstaged = unstaged
+        self.untracked = untracked
+        self.ignored = ignored
+        self.packed = packed
+        self.branches = branches
+        self.repeat = repeat
+        self.untracked_mode = untracked_mode
+        self.slow_threshold = slow_threshold
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the parameters as a dictionary."""
+        return dict(vars(self))
+
+
+class BenchmarkGitClient(GitClient):
+    """GitClient counting the log messages instead of printing them."""
+
+    def __init__(self):
+        super().__init__()
+        self.log_count = 0
+
+    def log(self, text: str):
+        """Count the message."""
+        self.log_count += 1
+
+
+def git(directory: Path, *args: str, input: Optional[str] = None):
+    """Run a git command in a directory and raise an exception on failure."""
+    subprocess.run(
+        ['git', '-C', str(directory)] + list(args),
+        input=input,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def get_file_path(index: int, config: BenchmarkConfig) -> str:
+    """Return the path, relative to the repository, of the file of a given index."""
+    parts = []
+    n = index
+    for _ in range(config.depth):
+        parts.append('d{0}'.format(n % config.fanout))
+        n //= config.fanout
+    parts.append('file{0}.txt'.format(index))
+    return '/'.join(parts)
+
+
+def write_files(directory: Path, paths: List[str], content: str):
+    """Write files with a content suffixed by their path."""
+    for path in paths:
+        file = directory / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text('{0} {1}\n'.format(content, path))
+
+
+def create_repository(directory: Path, config: BenchmarkConfig) -> List[str]:
+    """
+    Create a synthetic repository and return the paths of its tracked files.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory of the repository, created if it does not exist.
+    config : BenchmarkConfig
+        Parameters of the repository.
+
+    Returns
+    -------
+    List[str]
+        Paths of the tracked files, relative to the repository.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    git(directory, 'init', '-q', '-b', 'main')
+    git(directory, 'config', 'user.name', 'benchmark')
+    git(directory, 'config', 'user.email', 'benchmark@example.com')
+    paths = ['Model.etp'] + [get_file_path(_, config) for _ in range(config.files - 1)]
+    packed = int(len(paths) * config.packed)
+    # first commit, packed
+    (directory / '.gitignore').write_text('generated/\n')
+    write_files(directory, paths[:packed], 'initial')
+    git(directory, 'add', '-A')
+    git(directory, 'commit', '-q', '-m', 'packed files')
+    git(directory, 'gc', '-q')
+    # second commit, loose objects
+    if packed < len(paths):
+        write_files(directory, paths[packed:], 'initial')
+        git(directory, 'add', '-A')
+        git(directory, 'commit', '-q', '-m', 'loose files')
+    # branches, created at once
+    lines = ''.join('create refs/heads/branch{0} HEAD\n'.format(_) for _ in range(config.branches))
+    git(directory, 'update-ref', '--stdin', input=lines)
+    # changes, on distinct files
+    files = paths[1:]
+    staged = files[: config.staged]
+    unstaged = files[config.staged : config.staged + config.unstaged]
+    write_files(directory, staged, 'staged')
+    if staged:
+        git(directory, 'add', '--', *staged)
+    write_files(directory, unstaged, 'unstaged')
+    untracked = ['untracked/file{0}.txt'.format(_) for _ in range(config.untracked)]
+    write_files(directory, untracked, 'untracked')
+    # generated files, for example the code generated by KCG
+    generated = ['generated/' + get_file_path(_, config) for _ in range(config.ignored)]
+    write_files(directory, generated, 'generated')
+    return paths
+
+
+def measure(function: Callable[[], Any], repeat: int = 1) -> float:
+    """Return the best execution time of a function, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(directory: Path, config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    Create a synthetic repository and time the operations of GitClient.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory of the repository, which must not exist.
+    config : BenchmarkConfig
+        Parameters of the repository.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Parameters, environment and timings, in seconds.
+    """
+    paths = create_repository(directory, config)
+    project = str(directory / 'Model.etp')
+    files = [str(directory / _) for _ in paths[1:]]
+    unstaged = files[config.staged : config.staged + config.unstaged]
+
+    client = BenchmarkGitClient()
+    assert client.get_init_status()  # nosec B101  # benchmark only
+    client.set_untracked_mode(config.untracked_mode)
+    client.set_slow_call_threshold(config.slow_threshold)
+    timings = {}
+    timings['refresh_cold'] = measure(lambda: client.refresh(project))
+    timings['refresh'] = measure(lambda: client.refresh(project), config.repeat)
+    timings['refresh_paths'] = measure(
+        lambda: client.refresh(project, unstaged + [project]), config.repeat
+    )
+    client.refresh(project)
+
+    def get_file_status():
+        for file in files:
+            client.get_file_status(file)
+
+    timings['get_file_status'] = measure(get_file_status, config.repeat)
+    timings['get_file_statuses'] = measure(lambda: client.get_file_statuses(files), config.repeat)
+    timings['get_branch_list'] = measure(client.get_branch_list, config.repeat)
+    timings['stage'] = measure(lambda: client.stage(unstaged))
+    timings['unstage'] = measure(lambda: client.unstage(unstaged))
+    timings['reset_files'] = measure(lambda: client.reset_files(unstaged))
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, 'archive.tar')
+        timings['archive'] = measure(lambda: client.archive('main', archive))
+    timings['commit'] = measure(lambda: client.commit('benchmark'))
+    return {
+        'config': config.to_dict(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dulwich': '.'.join(str(_) for _ in dulwich.__version__),
+        },
+        'timings': timings,
+        'logs': client.log_count,
+        # durations of the underlying Git calls
+        'calls': client.instrumentation.get_stats(),
+    }
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    defaults = BenchmarkConfig()
+    parser = ArgumentParser(description='Benchmark of GitClient on a synthetic repository')
+    for name, value in defaults.to_dict().items():
+        parser.add_argument('--' + name, type=type(value), default=value)
+    parser.add_argument(
+        '-d', '--directory', help='directory of the repository, temporary if not set'
+    )
+    parser.add_argument('-o', '--output', help='JSON file for the results, stdout if not set')
+    options = parser.parse_args(args)
+    config = BenchmarkConfig(**{_: getattr(options, _) for _ in defaults.to_dict()})
+    if options.directory:
+        results = run_benchmark(Path(options.directory), config)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run_benchmark(Path(tmp) / 'repo', config)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if options.output:
+        Path(options.output).write_text(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Smoke test for benchmark.py."""
+
+import json
+from pathlib import Path
+
+from benchmark import BenchmarkConfig, BenchmarkGitClient, main, run_benchmark
+import pytest
+
+
+def test_benchmark(tmp_path: Path):
+    config = BenchmarkConfig(
+        files=40,
+        depth=2,
+        fanout=3,
+        staged=3,
+        unstaged=3,
+        untracked=3,
+        ignored=10,
+        branches=5,
+        repeat=1,
+    )
+    results = run_benchmark(tmp_path / 'repo', config)
+    assert results['config']['files'] == 40
+    timings = results['timings']
+    for name in 'refresh', 'get_file_status', 'stage', 'unstage', 'reset_files', 'archive':
+        assert timings[name] >= 0
+    assert 'commit' in timings and 'get_branch_list' in timings
+    assert {'add', 'unstage', 'reset_file', 'commit'} <= set(results['calls'])
+
+
+def test_benchmark_untracked_mode(tmp_path: Path):
+    args = ['--files', '10', '--branches', '2', '--repeat', '1', '--untracked_mode', 'no']
+    output = tmp_path / 'results.json'
+    assert main(args + ['-d', str(tmp_path / 'repo'), '-o', str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert results['config']['untracked_mode'] == 'no'
+
+
+def test_benchmark_main(tmp_path: Path):
+    output = tmp_path / 'results.json'
+    args = ['--files', '10', '--branches', '2', '--repeat', '1', '-d', str(tmp_path / 'repo')]
+    assert main(args + ['-o', str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert results['config']['branches'] == 2
+
+
+def test_benchmark_slow_threshold(tmp_path: Path):
+    with pytest.raises(ValueError):
+        BenchmarkGitClient().set_slow_call_threshold(-1.0)
+    config = BenchmarkConfig(files=10, branches=2, repeat=1, ignored=0, slow_threshold=0.0)
+    results = run_benchmark(tmp_path / 'repo', config)
+    # all the calls are logged
+    assert results['logs'] >= sum(_['count'] for _ in results['calls'].values())
@@ -0,0 +1,80 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for branches.py."""
+
+from pathlib import Path
+
+from dulwich.repo import Repo
+
+from ansys.scade.git.extension.branches import BranchCache
+from test_utils import run_git
+
+
+def test_branch_cache(tmp_path: Path):
+    run_git('init', '-b', 'main', str(tmp_path))
+    (tmp_path / 'file.txt').write_text('content\n')
+    run_git('add', 'file.txt', dir=tmp_path)
+    run_git('commit', '-m', 'first\n\ndetails', dir=tmp_path)
+    for name in 'feature/a', 'feature/b', 'fix':
+        run_git('branch', name, dir=tmp_path)
+    run_git('update-ref', 'refs/remotes/origin/main', 'main', dir=tmp_path)
+    run_git('symbolic-ref', 'refs/remotes/origin/HEAD', 'refs/remotes/origin/main', dir=tmp_path)
+    repo = Repo(str(tmp_path))
+    cache = BranchCache()
+    # the nested directories are not checked again during the test, unless stated
+    cache.ttl = 3600
+    branches = cache.get(repo)
+    assert branches == ['feature/a', 'feature/b', 'fix', 'main', 'origin/main']
+    assert cache.get(repo, remotes=False) == ['feature/a', 'feature/b', 'fix', 'main']
+    # filter and pages
+    assert cache.filter(repo, 'f') == (['feature/a', 'feature/b', 'fix'], 3)
+    assert cache.filter(repo, 'feature/', 1, 1) == (['feature/b'], 2)
+    assert cache.filter(repo, 'o') == (['origin/main'], 1)
+    assert cache.filter(repo, 'o', remotes=False) == ([], 0)
+    # new branch in a new sub-directory: refs/heads is modified
+    run_git('branch', 'release/x', dir=tmp_path)
+    assert cache.filter(repo, 'release/') == (['release/x'], 1)
+    # new branch in an existing sub-directory: detected once the nested directories are checked
+    run_git('branch', 'feature/c', dir=tmp_path)
+    assert cache.filter(repo, 'feature/')[1] == 2
+    cache.ttl = 0
+    assert cache.filter(repo, 'feature/')[1] == 3
+    # new remote
+    cache.ttl = 3600
+    run_git('update-ref', 'refs/remotes/fork/main', 'main', dir=tmp_path)
+    assert 'fork/main' in cache.get(repo)
+    # packed references
+    run_git('pack-refs', '--all', dir=tmp_path)
+    run_git('branch', '-D', 'fix', dir=tmp_path)
+    # Dulwich does not read packed-refs again: RepoPool reopens the repository
+    repo.close()
+    repo = Repo(str(tmp_path))
+    assert 'fix' not in cache.get(repo)
+    # metadata
+    info = cache.get_info(repo, 'origin/main')
+    assert info is not None
+    assert info.summary == 'first'
+    assert info.sha == repo.refs[b'refs/heads/main'].decode('ascii')
+    assert cache.get_info(repo, 'unknown') is None
+    repo.close()
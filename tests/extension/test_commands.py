@@ -0,0 +1,125 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for commands.py."""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+from ansys.scade.git.extension.commands import CommandLoader, LazyCommand, command_data
+from ansys.scade.guitools.command import Command
+from ansys.scade.guitools.stubs import StubIde
+
+
+class ProjectIde(StubIde):
+    """IDE without project by default."""
+
+    def get_active_project(self):
+        """Return the project, if any."""
+        return self.project
+
+
+class RecordingCommand(Command):
+    """Command recording its activations."""
+
+    def __init__(self, ide, enabled: bool):
+        super().__init__(ide, **command_data['stage'])
+        self.enabled = enabled
+        self.activations = 0
+
+    def on_enable(self) -> bool:
+        return self.enabled
+
+    def on_activate(self):
+        self.activations += 1
+
+
+def test_lazy_commands():
+    ide = ProjectIde()
+    calls = []
+    commands = {'refresh': RecordingCommand(ide, False), 'stage': RecordingCommand(ide, True)}
+
+    def factory() -> Dict[str, Command]:
+        calls.append(True)
+        return commands
+
+    loader = CommandLoader(factory)
+    refresh = LazyCommand(ide, loader, 'refresh', enabled=True, load_with_project=True)
+    stage = LazyCommand(ide, loader, 'stage')
+    assert stage.name == 'Stage'
+    # not loaded while no project is loaded
+    assert refresh.on_enable()
+    assert not stage.on_enable()
+    assert not loader.loaded
+    # loaded with the first project: the actual commands are polled
+    ide.project = 'Model.etp'  # type: ignore
+    assert not refresh.on_enable()
+    assert stage.on_enable()
+    stage.on_activate()
+    assert commands['stage'].activations == 1
+    assert len(calls) == 1
+
+
+def test_lazy_commands_activation():
+    ide = ProjectIde()
+    loader = CommandLoader(lambda: {})
+    stage = LazyCommand(ide, loader, 'stage')
+    # the Git client can't be initialized: the commands are disabled
+    stage.on_activate()
+    assert loader.loaded
+    assert not stage.on_enable()
+
+
+def test_lazy_commands_error():
+    ide = ProjectIde()
+    ide.project = 'Model.etp'  # type: ignore
+    calls = []
+    logs = []
+
+    def factory() -> Dict[str, Command]:
+        calls.append(True)
+        raise ImportError('No module named dulwich')
+
+    loader = CommandLoader(factory, logs.append)
+    stage = LazyCommand(ide, loader, 'stage', load_with_project=True)
+    # the error is reported once and the commands are disabled
+    for _ in range(3):
+        assert not stage.on_enable()
+    stage.on_activate()
+    assert loader.loaded
+    assert len(calls) == 1
+    assert len(logs) == 1
+    assert 'No module named dulwich' in logs[0]
+
+
+def test_no_dulwich():
+    script = (
+        'import sys\n'
+        'import ansys.scade.git.extension.commands\n'
+        'assert "dulwich" not in sys.modules\n'
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    process = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True)
+    assert process.returncode == 0, process.stderr
@@ -0,0 +1,62 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for companions.py."""
+
+import os
+from pathlib import Path
+
+from ansys.scade.git.extension import companions
+from ansys.scade.git.extension.companions import CompanionFinder
+
+
+def test_companion_finder(tmp_path: Path, monkeypatch):
+    # consider all the modifications as old enough to be cached
+    monkeypatch.setattr(companions, 'RACY_DELAY', -(10**12))
+    model = tmp_path / 'Model'
+    model.mkdir()
+    for name in 'P.xscade', 'P.ann', 'Q.xscade', 'R.xscade', 'R.ann', 'R.txt':
+        (model / name).write_text('')
+    finder = CompanionFinder({'.xscade': ('.ann', '.txt')})
+    paths = [str(model / _) for _ in ('P.xscade', 'Q.xscade', 'R.xscade', 'Unknown.xscade')]
+    paths.append(str(tmp_path / 'Missing' / 'S.xscade'))
+    expected = {
+        paths[0]: [str(model / 'P.ann')],
+        paths[2]: [str(model / 'R.ann'), str(model / 'R.txt')],
+    }
+    assert finder.find(paths) == expected
+    assert list(finder.entries) == [str(model)]
+    # unmodified directory: cached entries
+    mtime, names = finder.entries[str(model)]
+    assert finder.find(paths) == expected
+    assert finder.entries[str(model)][1] is names
+    # new file: the directory is scanned again
+    (model / 'Q.ann').write_text('')
+    os.utime(model, ns=(mtime + 10**9, mtime + 10**9))
+    assert finder.find(paths[1:2]) == {paths[1]: [str(model / 'Q.ann')]}
+    # candidates, existing or not
+    assert finder.get_candidates(paths[3]) == [
+        str(model / 'Unknown.ann'),
+        str(model / 'Unknown.txt'),
+    ]
+    assert finder.get_candidates(str(model / 'Model.etp')) == []
@@ -0,0 +1,109 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for discovery.py."""
+
+from pathlib import Path
+import shutil
+
+from ansys.scade.git.extension.discovery import MAIN, SUBMODULE, WORKTREE, RepoDiscovery
+from ansys.scade.git.extension.gitclient import GitClient, GitStatus
+from test_utils import run_git
+
+
+class LogGitClient(GitClient):
+    def log(self, text):
+        """Print the logs to the standard output."""
+        print(text)
+
+
+def create_repo(path: Path) -> Path:
+    """Create a repository with a committed project."""
+    run_git('init', '-b', 'main', str(path))
+    model = path / 'Model'
+    model.mkdir()
+    (model / 'Model.etp').write_text('<Project/>\n')
+    run_git('add', '.', dir=path)
+    run_git('commit', '-m', 'first', dir=path)
+    return model / 'Model.etp'
+
+
+def test_discovery_main(tmp_path: Path):
+    repo = tmp_path / 'repo'
+    project = create_repo(repo)
+    discovery = RepoDiscovery()
+    location = discovery.find(str(project))
+    assert location is not None
+    assert (location.work_tree, location.kind) == (str(repo), MAIN)
+    assert location.git_dir == location.common_dir == str(repo / '.git')
+    # the result is memoized for the walked directories
+    assert discovery.dirs[str(project.parent)] is location
+    assert discovery.find(str(project.parent / 'Other.etp')) is location
+    # outside of any repository
+    assert discovery.find(str(tmp_path / 'none' / 'Model.etp')) is None
+    # the removal of the repository is detected
+    shutil.rmtree(repo / '.git')
+    assert discovery.find(str(project)) is None
+
+
+def test_discovery_worktree(tmp_path: Path):
+    repo = tmp_path / 'repo'
+    project = create_repo(repo)
+    worktree = tmp_path / 'worktree'
+    run_git('worktree', 'add', '-b', 'feature', str(worktree), dir=repo)
+    discovery = RepoDiscovery()
+    location = discovery.find(str(worktree / 'Model' / 'Model.etp'))
+    assert location is not None
+    assert (location.work_tree, location.kind) == (str(worktree), WORKTREE)
+    assert location.git_dir == str(repo / '.git' / 'worktrees' / 'worktree')
+    assert location.common_dir == str(repo / '.git')
+
+    # the status is available for the projects of a worktree
+    client = LogGitClient()
+    assert client.refresh(str(worktree / 'Model' / 'Model.etp'))
+    assert client.branch == 'feature'
+    assert client.files_status['Model/Model.etp'] == GitStatus.clean
+    assert str(repo / '.git' / 'refs' / 'heads' / 'feature') in client.get_watch_paths()
+    # the main worktree is not affected
+    assert client.refresh(str(project))
+    assert client.branch == 'main'
+
+
+def test_discovery_gitfile(tmp_path: Path):
+    # layout of a submodule: the Git directory is stored in the parent repository
+    git_dir = tmp_path / 'parent' / '.git' / 'modules' / 'sub'
+    git_dir.mkdir(parents=True)
+    sub = tmp_path / 'parent' / 'sub'
+    sub.mkdir()
+    (sub / '.git').write_text('gitdir: ../.git/modules/sub\n')
+    discovery = RepoDiscovery()
+    location = discovery.find(str(sub / 'Model.etp'))
+    assert location is not None
+    assert (location.work_tree, location.kind) == (str(sub), SUBMODULE)
+    assert location.git_dir == location.common_dir == str(git_dir)
+    # invalid .git file: the parent directories are considered
+    (sub / '.git').write_text('invalid\n')
+    discovery.invalidate()
+    location = discovery.find(str(sub / 'Model.etp'))
+    assert location is not None
+    assert (location.work_tree, location.kind) == (str(tmp_path / 'parent'), MAIN)
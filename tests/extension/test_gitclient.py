@@ -25,13 +25,25 @@
 # by cls_tmp_repo and cls_git_repo fixtures
 # workaround: use 'getattr', or add 'type: ignore' pragma --> too verbose
 
+import os
 from pathlib import Path
+import threading
+import time
 from typing import Tuple
 
+from dulwich.repo import Repo
 import pytest
 
-from ansys.scade.git.extension.gitclient import GitClient, GitStatus
-from test_utils import get_resources_dir as get_tests_dir
+import ansys.scade.git.extension.gitclient as gitclient
+from ansys.scade.git.extension.gitclient import (
+    GitClient,
+    GitStatus,
+    RefreshCancelledError,
+    classify_files,
+    get_unstaged_changes,
+)
+from ansys.scade.git.extension.untracked import UNTRACKED_ALL, UNTRACKED_NO, UNTRACKED_PROJECT
+from test_utils import get_resources_dir as get_tests_dir, run_git
 
 # local constants for conciseness
 ADDED = GitStatus.added
@@ -101,6 +113,29 @@ class TestGitClientNominal:
         _, status = self.git_client.get_file_status(path)
         assert status == expected
 
+    def test_get_file_statuses(self):
+        self.git_client.refresh(str(self.dir / 'Model.etp'))
+        untracked = self.dir / 'untracked_batch.txt'
+        untracked.open('w').write('some content\n')
+        paths = [
+            'Model.etp',
+            str(self.dir / 'Child' / 'Child.xscade'),
+            str(self.dir / 'Child' / '..' / 'Root.xscade'),
+            str(untracked),
+            'Unknown.txt',
+            str(self.dir.parent / 'Extern.txt'),
+        ]
+        statuses = self.git_client.get_file_statuses(paths)
+        untracked.unlink()
+        assert statuses == [
+            ('Model.etp', CLEAN),
+            ('Child/Child.xscade', CLEAN),
+            ('Root.xscade', CLEAN),
+            ('untracked_batch.txt', UNTRACKED),
+            ('Unknown.txt', ERROR),
+            (paths[-1], EXTERN),
+        ]
+
     def test_status_untracked(self):
         project_path = str(self.dir / 'Model.etp')
         # create a new file
@@ -111,6 +146,29 @@ class TestGitClientNominal:
         assert status == UNTRACKED
         path.unlink()
 
+    def test_untracked_mode(self):
+        project_path = str(self.dir / 'Model.etp')
+        path = self.dir / 'untracked_file.txt'
+        path.write_text('some content\n')
+        with pytest.raises(ValueError):
+            self.git_client.set_untracked_mode('unknown')
+        try:
+            # the status does not include the untracked files
+            self.git_client.set_untracked_mode(UNTRACKED_NO)
+            self.git_client.refresh(project_path)
+            assert path.name not in self.git_client.files_status
+            self.git_client.refresh(project_path, [project_path, str(path)])
+            assert path.name not in self.git_client.files_status
+            # the existing files are still found when queried
+            assert self.git_client.get_file_status(str(path))[1] == UNTRACKED
+            # the project is located at the root of the repository
+            self.git_client.set_untracked_mode(UNTRACKED_PROJECT)
+            self.git_client.refresh(project_path)
+            assert self.git_client.files_status[path.name] == UNTRACKED
+        finally:
+            self.git_client.set_untracked_mode(UNTRACKED_ALL)
+            path.unlink()
+
     def test_status_added(self):
         project_path = str(self.dir / 'Model.etp')
         # create a new file
@@ -176,7 +234,7 @@ class TestGitClientNominal:
         path = Path('removed_staged.txt')
         _, status = self.git_client.get_file_status(str(path))
         assert status == CLEAN
-        path.unlink()
+        (self.dir / path).unlink()
         self.git_client.stage([str(path)])
         self.git_client.refresh(project_path)
         _, status = self.git_client.get_file_status(str(path))
@@ -220,6 +278,318 @@ class TestGitClientNominal:
         _, status = self.git_client.get_file_status(str(path))
         assert status == CLEAN
 
+    def test_commit_error(self, monkeypatch, capsys):
+        def commit(*args, **kwargs):
+            raise gitclient.git.Error('commit failed')
+
+        monkeypatch.setattr(gitclient.git, 'commit', commit)
+        assert not self.git_client.commit('some text')
+        assert 'Error commit: commit failed' in capsys.readouterr().out
+
+    def test_update_status(self):
+        project_path = str(self.dir / 'Model.etp')
+        new = self.dir / 'model_new.txt'
+        new.write_text('new content\n')
+        modified = self.dir / 'Model.l4'
+        content = modified.read_text()
+        modified.write_text('new content\n')
+        paths = [project_path, str(new), str(modified)]
+        self.git_client.refresh(project_path, paths)
+        # stage
+        assert self.git_client.stage(paths[1:])
+        assert self.git_client.update_status('stage', paths[1:])
+        expected = dict(self.git_client.files_status)
+        self.git_client.invalidate([], git_changed=True)
+        assert not self.git_client.is_dirty()
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.files_status == expected
+        assert expected['Model.l4'] == MODIFIED_STAGED
+        # staged and unstaged changes
+        modified.write_text('other content\n')
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.unstaged == {'Model.l4': MODIFIED_UNSTAGED}
+        # the content of the working tree is unknown
+        assert not self.git_client.update_status('unstage', [str(modified)])
+        # commit
+        assert self.git_client.commit('update status')
+        assert self.git_client.update_status('commit', [])
+        expected = dict(self.git_client.files_status)
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.files_status == expected
+        assert expected == {
+            'Model.etp': CLEAN,
+            'model_new.txt': CLEAN,
+            'Model.l4': MODIFIED_UNSTAGED,
+        }
+        # unknown files
+        assert not self.git_client.update_status('stage', ['unknown.txt'])
+        # restore the initial content
+        modified.write_text(content)
+        new.unlink()
+        assert self.git_client.stage([str(modified), str(new)])
+        self.git_client.commit('restore')
+
+    def test_snapshot(self):
+        project_path = str(self.dir / 'Model.etp')
+        modified = self.dir / 'Model.l4'
+        content = modified.read_text()
+        modified.write_text('new content\n')
+        paths = [project_path, str(modified)]
+        self.git_client.refresh(project_path, paths)
+        self.git_client.save_snapshot(project_path)
+        # new session
+        client = type(self.git_client)()
+        status = client.load_snapshot(project_path)
+        assert status is not None
+        assert status.branch == self.git_client.branch
+        assert status.files_status == {'Model.etp': CLEAN, 'Model.l4': MODIFIED_UNSTAGED}
+        # no snapshot for the other projects
+        assert client.load_snapshot(str(self.dir / 'Other.etp')) is None
+        # the index changed: obsolete snapshot
+        assert self.git_client.stage([str(modified)])
+        assert client.load_snapshot(project_path) is None
+        # restore the initial content
+        modified.write_text(content)
+        assert self.git_client.stage([str(modified)])
+
+    def test_sibling_repository(self, tmp_path: Path):
+        # repository next to the one of the project
+        sibling = tmp_path / 'Sibling'
+        sibling.mkdir()
+        run_git('init', '-b', 'main', str(sibling))
+        modified = sibling / 'Lib.xscade'
+        modified.write_text('content\n')
+        clean = sibling / 'Clean.xscade'
+        clean.write_text('content\n')
+        run_git('add', str(sibling), dir=sibling)
+        run_git('commit', '-m', 'sibling', dir=sibling)
+        modified.write_text('new content\n')
+        untracked = sibling / 'New.xscade'
+        untracked.write_text('content\n')
+
+        project_path = str(self.dir / 'Model.etp')
+        paths = [project_path, str(modified), str(clean), str(untracked)]
+        assert self.git_client.refresh(project_path, paths)
+        assert list(self.git_client.siblings) == [str(sibling)]
+        assert self.git_client.get_file_statuses(paths) == [
+            ('Model.etp', CLEAN),
+            (str(modified), MODIFIED_UNSTAGED),
+            (str(clean), CLEAN),
+            (str(untracked), UNTRACKED),
+        ]
+        assert str(sibling / '.git' / 'index') in self.git_client.get_watch_paths()
+        # the files are staged in their repository
+        assert self.git_client.stage([str(modified), str(untracked)])
+        assert self.git_client.update_status('stage', [str(modified), str(untracked)])
+        expected = self.git_client.get_file_statuses(paths)
+        assert [_ for _, status in expected if status in {ADDED, MODIFIED_STAGED}] == [
+            str(modified),
+            str(untracked),
+        ]
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.get_file_statuses(paths) == expected
+        assert self.git_client.unstage([str(modified), str(untracked)])
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.get_file_statuses(paths)[1:] == [
+            (str(modified), MODIFIED_UNSTAGED),
+            (str(clean), CLEAN),
+            (str(untracked), UNTRACKED),
+        ]
+        # the other repositories are not considered without paths
+        self.git_client.refresh(project_path)
+        assert self.git_client.get_file_status(str(clean)) == (str(clean), EXTERN)
+
+    def test_snapshot_siblings(self, tmp_path: Path):
+        sibling = tmp_path / 'Sibling'
+        sibling.mkdir()
+        run_git('init', '-b', 'main', str(sibling))
+        modified = sibling / 'Lib.xscade'
+        modified.write_text('content\n')
+        run_git('add', str(sibling), dir=sibling)
+        run_git('commit', '-m', 'sibling', dir=sibling)
+        modified.write_text('new content\n')
+
+        project_path = str(self.dir / 'Model.etp')
+        assert self.git_client.refresh(project_path, [project_path, str(modified)])
+        self.git_client.save_snapshot(project_path)
+        # new session
+        client = type(self.git_client)()
+        status = client.load_snapshot(project_path)
+        assert status is not None
+        assert list(status.siblings) == [str(sibling)]
+        assert status.siblings[str(sibling)].branch == 'main'
+        assert status.siblings[str(sibling)].files_status == {'Lib.xscade': MODIFIED_UNSTAGED}
+        client.apply_status(status)
+        assert client.get_file_status(str(modified)) == (str(modified), MODIFIED_UNSTAGED)
+        # the index of the other repository changed: obsolete snapshot
+        run_git('add', str(modified), dir=sibling)
+        assert client.load_snapshot(project_path) is None
+        # the effect of an operation on the other repository is saved
+        run_git('reset', dir=sibling)
+        assert self.git_client.stage([str(modified)])
+        assert self.git_client.update_status('stage', [str(modified)])
+        self.git_client.save_snapshot(project_path)
+        client = type(self.git_client)()
+        status = client.load_snapshot(project_path)
+        assert status is not None
+        assert status.siblings[str(sibling)].files_status == {'Lib.xscade': MODIFIED_STAGED}
+        # the other repository has been removed
+        (sibling / '.git').rename(sibling / 'git')
+        assert client.load_snapshot(project_path) is None
+        # restore the snapshot of the project
+        self.git_client.refresh(project_path)
+        self.git_client.save_snapshot(project_path)
+
+    def test_refresh_paths(self):
+        project_path = str(self.dir / 'Model.etp')
+        # create new files
+        inside = self.dir / 'scope_untracked.txt'
+        inside.open('w').write('some content\n')
+        outside = self.dir / 'other_untracked.txt'
+        outside.open('w').write('some content\n')
+        # modify a file outside of the scope
+        modified = self.dir / 'Model.l4'
+        content = modified.read_text()
+        modified.open('a').write('new content\n')
+        paths = [project_path, str(inside), 'Root.xscade', 'Child/Unknown.txt']
+        self.git_client.refresh(project_path, paths)
+        assert self.git_client.files_status == {
+            'Model.etp': CLEAN,
+            'scope_untracked.txt': UNTRACKED,
+            'Root.xscade': CLEAN,
+        }
+        _, status = self.git_client.get_file_status('Child/Unknown.txt')
+        assert status == ERROR
+        inside.unlink()
+        outside.unlink()
+        modified.write_text(content)
+
+    def test_compute_status_cancelled(self):
+        project_path = str(self.dir / 'Model.etp')
+        cancel = threading.Event()
+        files_status = self.git_client.files_status
+        status = self.git_client.compute_status(project_path, cancel=cancel)
+        assert status.repo is not None
+        assert status.files_status['Model.etp'] == CLEAN
+        # the current status is not modified until applied
+        assert self.git_client.files_status is files_status
+        cancel.set()
+        with pytest.raises(RefreshCancelledError):
+            self.git_client.compute_status(project_path, cancel=cancel)
+
+    def test_compute_status_unlocked(self, monkeypatch):
+        project_path = str(self.dir / 'Model.etp')
+        compute_repo_status = self.git_client.compute_repo_status
+        acquired = []
+
+        def compute(*args, **kwargs):
+            # the commands, run from another thread, are not blocked by the computation
+            def command():
+                if self.git_client.lock.acquire(timeout=5):
+                    acquired.append(True)
+                    self.git_client.lock.release()
+
+            thread = threading.Thread(target=command)
+            thread.start()
+            thread.join()
+            return compute_repo_status(*args, **kwargs)
+
+        monkeypatch.setattr(self.git_client, 'compute_repo_status', compute)
+        status = self.git_client.compute_status(project_path)
+        assert status.files_status['Model.etp'] == CLEAN
+        assert acquired == [True]
+
+    def test_get_file_status_folded(self, monkeypatch):
+        project_path = str(self.dir / 'Model.etp')
+        self.git_client.refresh(project_path)
+        # emulate a case-insensitive platform
+        monkeypatch.setattr(os.path, 'normcase', str.lower)
+        assert self.git_client.get_file_status('MODEL.etp') == ('MODEL.etp', CLEAN)
+        # the folded index is built once and reused
+        folded = self.git_client.folded_tables
+        assert len(folded) == 1
+        table = next(iter(folded.values()))
+        assert self.git_client.get_file_status('model.ETP') == ('model.ETP', CLEAN)
+        assert next(iter(self.git_client.folded_tables.values())) is table
+        # a new status resets the index
+        self.git_client.refresh(project_path)
+        assert self.git_client.folded_tables == {}
+
+    def test_refresh_incremental(self):
+        project_path = str(self.dir / 'Model.etp')
+        self.git_client.refresh(project_path, [project_path, 'Root.xscade'])
+        assert self.git_client.files_status == {'Model.etp': CLEAN, 'Root.xscade': CLEAN}
+        modified = self.dir / 'Root.xscade'
+        content = modified.read_text()
+        modified.open('a').write('new content\n')
+        self.git_client.invalidate([str(modified)])
+        self.git_client.invalidate(['Root.xscade'])
+        full, paths = self.git_client.pop_dirty()
+        assert not full
+        assert paths == {str(modified), 'Root.xscade'}
+        assert self.git_client.pop_dirty() == (False, set())
+        status = self.git_client.compute_status(project_path, paths)
+        self.git_client.apply_status(status, incremental=True)
+        assert self.git_client.files_status == {
+            'Model.etp': CLEAN,
+            'Root.xscade': MODIFIED_UNSTAGED,
+        }
+        # the Git files invalidate the whole status
+        self.git_client.invalidate([], git_changed=True)
+        self.git_client.invalidate(['Root.xscade'])
+        assert self.git_client.pop_dirty() == (True, set())
+        # too many files
+        self.git_client.invalidate(None)
+        assert self.git_client.pop_dirty() == (True, set())
+        assert str(Path(self.git_client.repo_path) / '.git' / 'index') in (
+            self.git_client.get_watch_paths()
+        )
+        modified.write_text(content)
+
+    def test_batch_unstage_reset(self, capsys):
+        project_path = str(self.dir / 'Model.etp')
+        batch = self.dir / 'Batch'
+        (batch / 'Sub').mkdir(parents=True)
+        files = [batch / ('file%d.txt' % _) for _ in range(100)]
+        files += [batch / 'Sub' / ('file%d.txt' % _) for _ in range(100)]
+        for file in files:
+            file.write_text('content\n')
+        run_git('add', str(batch), dir=self.dir)
+        run_git('commit', '-m', 'batch', dir=self.dir)
+        for file in files:
+            file.write_text('new content\n')
+        added = batch / 'added.txt'
+        added.write_text('added\n')
+        run_git('add', str(batch), dir=self.dir)
+        paths = [str(_) for _ in files + [added]]
+        self.git_client.refresh(project_path, paths)
+        assert {_[1] for _ in map(self.git_client.get_file_status, paths)} == {
+            MODIFIED_STAGED,
+            ADDED,
+        }
+
+        # errors do not abort the batch
+        capsys.readouterr()
+        self.git_client.unstage(paths + ['Batch/unknown.txt', str(self.dir.parent / 'x.txt')])
+        lines = capsys.readouterr().out.strip().split('\n')
+        assert lines == [
+            'Error unstage: {0} is not in the repository'.format(self.dir.parent / 'x.txt'),
+            'Error unstage: Batch/unknown.txt: file not in index',
+        ]
+        self.git_client.refresh(project_path, paths)
+        statuses = [_[1] for _ in map(self.git_client.get_file_status, paths)]
+        assert statuses == [MODIFIED_UNSTAGED] * len(files) + [UNTRACKED]
+
+        # reset the modified files
+        self.git_client.reset_files(paths)
+        lines = capsys.readouterr().out.strip().split('\n')
+        assert lines == ['Error reset: Batch/added.txt: file not in HEAD']
+        self.git_client.refresh(project_path, paths)
+        statuses = [_[1] for _ in map(self.git_client.get_file_status, paths)]
+        assert statuses == [CLEAN] * len(files) + [UNTRACKED]
+        assert files[-1].read_text() == 'content\n'
+        added.unlink()
+
     def test_branch_list(self):
         self.git_client.refresh(str(self.dir / 'Model.etp'))
         # basic test: make sure the branch 'main' is present
@@ -341,3 +711,63 @@ class TestGitClientRobustnessWrongRepo:
     def test_branch_list(self):
         branches = self.git_client.get_branch_list()
         assert branches == []
+
+
+def test_classify_files_large_repo():
+    """Classify the files of a repository with 100k files."""
+    tracked = [('dir%d/file%d.xscade' % (i % 100, i)).encode('utf-8') for i in range(100000)]
+    staged = {'add': tracked[0:1000], 'modify': tracked[1000:2000], 'delete': [b'deleted.txt']}
+    modified = set(tracked[2000:3000])
+    removed = set(tracked[3000:4000])
+    untracked = ['untracked%d.txt' % i for i in range(1000)]
+
+    files_status = classify_files(tracked, staged, modified, removed, untracked)
+
+    assert len(files_status) == 100000 + 1 + 1000
+    assert files_status['dir0/file0.xscade'] == ADDED
+    assert files_status['dir0/file1000.xscade'] == MODIFIED_STAGED
+    assert files_status['dir0/file2000.xscade'] == MODIFIED_UNSTAGED
+    assert files_status['dir0/file3000.xscade'] == REMOVED_UNSTAGED
+    assert files_status['dir0/file4000.xscade'] == CLEAN
+    assert files_status['deleted.txt'] == REMOVED_STAGED
+    assert files_status['untracked0.txt'] == UNTRACKED
+
+
+def set_mtime(path: Path, age: float):
+    """Set the modification time of a file in the past, or in the future when negative."""
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_unstaged_changes_stat(tmp_path: Path, monkeypatch):
+    run_git('init', '-b', 'main', str(tmp_path))
+    names = ['clean.txt', 'modified.txt', 'touched.txt', 'racy.txt']
+    for name in names:
+        (tmp_path / name).write_text('content\n')
+        set_mtime(tmp_path / name, 60)
+    run_git('add', str(tmp_path), dir=tmp_path)
+    run_git('commit', '-m', 'initial', dir=tmp_path)
+
+    hashed = []
+
+    def blob_from_path_and_stat(path, st, *args):
+        hashed.append(os.path.basename(path).decode())
+        return blob_from_path_and_stat_ref(path, st, *args)
+
+    blob_from_path_and_stat_ref = gitclient.blob_from_path_and_stat
+    monkeypatch.setattr(gitclient, 'blob_from_path_and_stat', blob_from_path_and_stat)
+    repo = Repo(str(tmp_path))
+    # the files which stat data match their index entry are not hashed
+    assert get_unstaged_changes(repo, repo.open_index()) == (set(), set())
+    assert hashed == []
+
+    # same size, different modification time
+    (tmp_path / 'modified.txt').write_text('CONTENT\n')
+    set_mtime(tmp_path / 'modified.txt', 30)
+    set_mtime(tmp_path / 'touched.txt', 30)
+    # modified after the index
+    set_mtime(tmp_path / 'racy.txt', -10)
+    modified, removed = get_unstaged_changes(repo, repo.open_index())
+    assert modified == {b'modified.txt'}
+    assert not removed
+    assert sorted(hashed) == ['modified.txt', 'racy.txt', 'touched.txt']
@@ -21,8 +21,6 @@
 # SOFTWARE.
 
 from pathlib import Path
-import subprocess
-import tarfile
 from typing import Any, List
 
 import pytest
@@ -31,6 +29,7 @@ import scade.model.project.stdproject as std
 from ansys.scade.apitools import scade
 from ansys.scade.git.extension.gitclient import GitStatus
 import ansys.scade.git.extension.gitextcore as core
+from ansys.scade.git.extension.watcher import PollingWatcher
 from ansys.scade.guitools.command import Command
 from ansys.scade.guitools.stubs import StubIde
 from test_utils import cmp_file, get_resources_dir as get_tests_dir, run_git
@@ -188,92 +187,133 @@ def test_git_ext_core_diff(capsys):
     assert archive.exists()
 
 
-def test_safe_members(tmpdir_factory, capsys):
-    """
-    Create an archive with links, make sure they are filtered.
-
-    tree
-        extern.txt
-        root
-            root.txt
-            slk_child.txt
-            hlk_child.txt
-            slk_extern.txt
-            hlk_extern.txt
-            child
-                child.txt
-                slk_root.txt
-                hlk_root.txt
-                slk_sibling.txt
-                hlk_sibling.txt
-            sibling
-                sibling.txt
+@pytest.mark.usefixtures('model_repo')
+@pytest.mark.repo(get_resources_dir())
+def test_git_ext_core_background_refresh(capsys, tmpdir: Path):
+    core.set_background_refresh(True)
+    try:
+        cmd = core.CmdRefresh(_test_ide)
+        # several requests are coalesced, the browser is refreshing
+        cmd.on_activate()
+        cmd.on_activate()
+        assert [_['name'] for _ in _test_ide.browser['children']] == ['Refreshing...']
+        assert not core.CmdStage(_test_ide).on_enable()
+        core._background_refresh.wait()
+        # the pending result is displayed when the commands are polled
+        assert core.CmdStage(_test_ide).on_enable()
+    finally:
+        core.set_background_refresh(False)
+    ref = 'refresh.json'
+    result = tmpdir / ref
+    _test_ide.save_browser(result)
 
-    """
+    # read the outputs issued before the diff, if any
+    captured = capsys.readouterr()
+    diff = cmp_file(get_ref_dir() / ref, result, n=0)
+    for line in list(diff):
+        print(line, end='')
+    captured = capsys.readouterr()
+    assert captured.out == ''
+
+
+@pytest.mark.usefixtures('model_repo')
+@pytest.mark.repo(get_resources_dir())
+def test_git_ext_core_differential_update(model_repo: Path):
+    def get_names(category: str) -> List[str]:
+        branch = _test_ide.browser['children'][0]
+        entry = next(_ for _ in branch['children'] if _['name'] == category)
+        return [_['name'] for _ in entry['children']]
+
+    core.CmdRefresh(_test_ide).on_activate()
+    browser = _test_ide.browser
+    # unchanged status: the browser is not updated
+    core.refresh_browser(_test_ide)
+    assert _test_ide.browser is browser
+    # new companion file: added to the displayed browser
+    annotation = model_repo / 'Model' / 'Root.ann'
+    annotation.write_text('')
+    core.refresh_browser(_test_ide)
+    assert _test_ide.browser is browser
+    assert get_names('Unstaged files')[-1] == 'Model/Root.ann'
+    # modified status: the browser is created again
+    annotation.unlink()
+    core.refresh_browser(_test_ide)
+    assert _test_ide.browser is not browser
+    assert 'Model/Root.ann' not in get_names('Unstaged files')
+
+
+@pytest.mark.usefixtures('model_repo')
+@pytest.mark.repo(get_resources_dir())
+def test_git_ext_core_status_model(capsys, tmpdir: Path, monkeypatch):
+    # the status is trusted when the files are watched: a watcher not started is enough
+    monkeypatch.setattr(core, '_watcher', PollingWatcher(core.on_files_changed))
+    client = core._git_client
+    computations = []
+    compute_status = client.compute_status
+    monkeypatch.setattr(
+        client,
+        'compute_status',
+        lambda *args, **kwargs: computations.append(args) or compute_status(*args, **kwargs),
+    )
+    core.CmdRefresh(_test_ide).on_activate()
+    assert len(computations) == 1
+    # the effect of the command is applied without computing the status
+    core.CmdStageAll(_test_ide).on_activate()
+    assert len(computations) == 1
+    # the changes of the Git files made by the command are ignored
+    core.on_files_changed(set(), True)
+    assert not client.is_dirty()
+    # but not the files changed at the same time
+    project_file = str(tmpdir / 'Model' / 'Model.l4')
+    core.on_files_changed({project_file}, True)
+    assert client.pop_dirty() == (False, {project_file})
+    # nor a bulk change
+    core.on_files_changed(None, False)
+    assert client.pop_dirty() == (True, set())
+    ref = 'stage_all.json'
+    result = tmpdir / ref
+    _test_ide.save_browser(result)
 
-    def link_to(src_dir, target):
-        """create symbolic and hard links to target in src_dir."""
-        for prefix, flag in [('s', ''), ('h', ' /H')]:
-            src = src_dir / f'{prefix}lk_{target.name}'
-            cmd = f'mklink{flag} {str(src)} {str(target)}'
-            subprocess.run(['cmd.exe', '/C', cmd], capture_output=True, text=True)
-
-    tree_dir = Path(tmpdir_factory.mktemp('tree'))
-
-    # hierarchy
-    extern_txt = tree_dir / 'extern.txt'
-    extern_txt.write_text('extern.txt')
-    root_dir = tree_dir / 'root'
-    root_dir.mkdir()
-    root_txt = root_dir / 'root.txt'
-    root_txt.write_text('root.txt')
-    child_dir = root_dir / 'child'
-    child_dir.mkdir()
-    child_txt = child_dir / 'child.txt'
-    child_txt.write_text('child.txt')
-    sibling_dir = root_dir / 'sibling'
-    sibling_dir.mkdir()
-    sibling_txt = sibling_dir / 'sibling.txt'
-    sibling_txt.write_text('sibling.txt')
-    # links
-    link_to(root_dir, Path('child/child_txt'))
-    link_to(root_dir, Path('../extern_txt'))
-    link_to(child_dir, Path('../root_txt'))
-    link_to(child_dir, Path('../sibling/sibling_txt'))
-
-    # create an archive
-    archive = tree_dir / 'archive.zip'
-    tar_file = tarfile.open(archive, 'w:gz')
-    for path in root_dir.glob('*'):
-        tar_file.add(path, arcname=path.name)
-    tar_file.add(extern_txt, arcname='../extern.txt')
-    tar_file.close()
-
-    # read the outputs issued before the test, if any
     captured = capsys.readouterr()
+    diff = cmp_file(get_ref_dir() / ref, result, n=0)
+    for line in list(diff):
+        print(line, end='')
+    captured = capsys.readouterr()
+    assert captured.out == ''
 
-    # get the instance of GitClient
-    cmd = core.CmdDiff(_test_ide)
-    tar_file = tarfile.open(archive)
-    extract_dir = tree_dir / 'extract'
 
-    tar_file.extractall(extract_dir, members=cmd.safe_members(extract_dir, tar_file))
-    tar_file.close()
+@pytest.mark.usefixtures('model_repo')
+@pytest.mark.repo(get_resources_dir())
+def test_git_ext_core_startup(capsys, tmpdir: Path, monkeypatch):
+    # previous session: the status is saved when displayed
+    core.CmdRefresh(_test_ide).on_activate()
+    # new session
+    client = type(core._git_client)()
+    monkeypatch.setattr(core, '_git_client', client)
+    monkeypatch.setattr(core, '_started', False)
+    core._displayed.reset()
+    core.set_background_refresh(True)
+    try:
+        cmd = core.CmdRefresh(_test_ide)
+        # the saved status is displayed immediately and confirmed in the background
+        assert cmd.on_enable()
+        browser = _test_ide.browser
+        assert core._background_refresh.refreshing
+        assert not core.CmdStage(_test_ide).on_enable()
+        core._background_refresh.wait()
+        assert cmd.on_enable()
+        assert not core._background_refresh.refreshing
+    finally:
+        core.set_background_refresh(False)
+    # unchanged status: the browser is not updated
+    assert _test_ide.browser is browser
+    ref = 'refresh.json'
+    result = tmpdir / ref
+    _test_ide.save_browser(result)
 
-    # get the status of the command on stdout, must be two lines
     captured = capsys.readouterr()
-    print(captured.out)
-    lines = set(captured.out.strip().split('\n'))
-    if False:
-        # test correct on host, failure in a ci-cd context: deactivated for now
-        assert lines == {
-            r'slk_extern_txt is blocked: symlink to ..\extern_txt',
-            '../extern.txt is blocked: illegal path',
-            # can't have this test successful
-            # r'hlk_extern_txt is blocked: hard link to ..\extern_txt',
-        }
-    else:
-        # workaround: do not test links
-        assert lines >= {
-            '../extern.txt is blocked: illegal path',
-        }
+    diff = cmp_file(get_ref_dir() / ref, result, n=0)
+    for line in list(diff):
+        print(line, end='')
+    captured = capsys.readouterr()
+    assert captured.out == ''
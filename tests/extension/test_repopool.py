@@ -0,0 +1,50 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for repopool.py."""
+
+from pathlib import Path
+
+from ansys.scade.git.extension.repopool import RepoPool
+from test_utils import run_git
+
+
+def test_repo_pool(tmp_path: Path):
+    run_git('init', '-b', 'main', str(tmp_path))
+    (tmp_path / 'file.txt').write_text('content\n')
+    run_git('add', 'file.txt', dir=tmp_path)
+    run_git('commit', '-m', 'first', dir=tmp_path)
+    pool = RepoPool()
+    repo = pool.get(str(tmp_path))
+    # the handle is reused
+    assert pool.get(str(tmp_path)) is repo
+    # new references
+    run_git('branch', 'other', dir=tmp_path)
+    other = pool.get(str(tmp_path))
+    assert other is not repo
+    assert b'refs/heads/other' in other.refs.keys()
+    # new pack
+    run_git('gc', dir=tmp_path)
+    assert pool.get(str(tmp_path)) is not other
+    pool.invalidate()
+    assert pool.handles == {}
@@ -0,0 +1,75 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for snapshot.py."""
+
+from ansys.scade.git.extension.snapshot import MAX_PROJECTS, StatusSnapshots
+
+KEY = ('abcd', 'ef01')
+
+
+def test_snapshots_persistence(tmp_path):
+    snapshots = StatusSnapshots(str(tmp_path))
+    statuses = {'a.txt': 'clean', 'b.txt': 'modified_staged'}, {'b.txt': 'modified_unstaged'}
+    snapshots.set('Model.etp', KEY, 'main', statuses)
+
+    reloaded = StatusSnapshots(str(tmp_path))
+    reloaded.load()
+    assert reloaded.get('Model.etp', KEY) == ('main', statuses)
+    # the index or HEAD changed
+    assert reloaded.get('Model.etp', ('abcd', '0000')) is None
+    assert reloaded.get('Model.etp', ('', '')) is None
+    # unknown project
+    assert reloaded.get('Other.etp', KEY) is None
+
+
+def test_snapshots_siblings(tmp_path):
+    snapshots = StatusSnapshots(str(tmp_path))
+    statuses = {'a.txt': 'clean'}, {}
+    sibling = (
+        ('1234', '5678'),
+        'dev',
+        ({'b.txt': 'modified_staged'}, {'b.txt': 'modified_unstaged'}),
+    )
+    snapshots.set('Model.etp', KEY, 'main', statuses, {'/Sibling': sibling})
+
+    reloaded = StatusSnapshots(str(tmp_path))
+    reloaded.load()
+    assert reloaded.get('Model.etp', KEY) == ('main', statuses)
+    assert reloaded.get_siblings('Model.etp') == {'/Sibling': sibling}
+    assert reloaded.get_siblings('Other.etp') == {}
+
+
+def test_snapshots_most_recent(tmp_path):
+    snapshots = StatusSnapshots(str(tmp_path))
+    for i in range(MAX_PROJECTS + 1):
+        snapshots.set('P{0}.etp'.format(i), KEY, 'main', ({}, {}))
+    # saved again: most recent
+    snapshots.set('P0.etp', KEY, 'main', ({'a.txt': 'clean'}, {}))
+    snapshots.set('P{0}.etp'.format(MAX_PROJECTS), KEY, 'main', ({}, {}))
+
+    reloaded = StatusSnapshots(str(tmp_path))
+    reloaded.load()
+    assert reloaded.get('P0.etp', KEY) == ('main', ({'a.txt': 'clean'}, {}))
+    assert reloaded.get('P1.etp', KEY) is None
+    assert len(reloaded.projects) == MAX_PROJECTS
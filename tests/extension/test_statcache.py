@@ -0,0 +1,78 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for statcache.py."""
+
+import os
+from pathlib import Path
+import time
+
+from ansys.scade.git.extension.statcache import StatCache, get_index_checksum
+
+
+def create_file(path: Path, text: str, age: float) -> os.stat_result:
+    """Create a file and set its modification time in the past."""
+    path.write_text(text)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return os.lstat(path)
+
+
+def test_stat_cache_blob_ids(tmp_path):
+    cache = StatCache(str(tmp_path))
+    st = create_file(tmp_path / 'old.txt', 'old', 60)
+    cache.set_blob_id(b'old.txt', st, b'1234')
+    assert cache.get_blob_id(b'old.txt', st) == b'1234'
+    # modified file
+    st = create_file(tmp_path / 'old.txt', 'new content', 30)
+    assert cache.get_blob_id(b'old.txt', st) is None
+    # racy file: not cached
+    st = create_file(tmp_path / 'racy.txt', 'racy', 0)
+    cache.set_blob_id(b'racy.txt', st, b'5678')
+    assert cache.get_blob_id(b'racy.txt', st) is None
+
+
+def test_stat_cache_persistence(tmp_path):
+    cache = StatCache(str(tmp_path))
+    st = create_file(tmp_path / 'file.txt', 'content', 60)
+    cache.set_blob_id(b'file.txt', st, b'1234')
+    cache.set_blob_id(b'removed.txt', st, b'5678')
+    cache.prune({b'file.txt'})
+    staged = {'add': [b'a.txt'], 'delete': [], 'modify': [b'm.txt']}
+    cache.set_staged(('abcd', 'ef01'), staged)
+    cache.save()
+    assert not cache.modified
+
+    reloaded = StatCache(str(tmp_path))
+    reloaded.load()
+    assert reloaded.get_blob_id(b'file.txt', st) == b'1234'
+    assert reloaded.get_blob_id(b'removed.txt', st) is None
+    assert reloaded.get_staged(('abcd', 'ef01')) == staged
+    assert reloaded.get_staged(('abcd', '0000')) is None
+
+
+def test_index_checksum(tmp_path):
+    assert get_index_checksum(str(tmp_path / 'index')) == ''
+    path = tmp_path / 'index'
+    path.write_bytes(b'DIRC' + bytes(range(40)))
+    assert get_index_checksum(str(path)) == bytes(range(20, 40)).hex()
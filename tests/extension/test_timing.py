@@ -0,0 +1,67 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for timing.py."""
+
+import threading
+from typing import List
+
+from ansys.scade.git.extension.timing import Instrumentation
+
+
+def test_instrumentation():
+    logs: List[str] = []
+    instrumentation = Instrumentation(threshold=1.0, window=3, log=logs.append)
+    for duration in 0.0005, 0.003, 0.003, 1.5:
+        instrumentation.record('add', duration, 10)
+    with instrumentation.measure('commit', 2):
+        pass
+    # slow calls only
+    assert logs == ['slow call: add 1.500s, size 10']
+    stats = instrumentation.get_stats()
+    assert list(stats) == ['add', 'commit']
+    # rolling window: the first call is discarded
+    add = stats['add']
+    assert add['count'] == 3
+    assert add['max'] == 1.5
+    assert add['median'] == 0.003
+    assert add['max_size'] == 10
+    assert add['histogram'][2] == 2  # <=5ms
+    assert add['histogram'][10] == 1  # <=2s
+    lines = instrumentation.dump()
+    assert lines[0].startswith('add: 3 call(s)')
+    assert '<=5ms: 2, <=2s: 1' in lines[0]
+    instrumentation.reset()
+    assert instrumentation.dump() == []
+
+
+def test_instrumentation_thread():
+    logs: List[str] = []
+    instrumentation = Instrumentation(threshold=0.0, log=logs.append)
+    thread = threading.Thread(target=instrumentation.record, args=('status', 0.1))
+    thread.start()
+    thread.join()
+    # logged from the main thread only
+    assert logs == []
+    instrumentation.flush()
+    assert logs == ['slow call: status 0.100s, size 0']
@@ -0,0 +1,99 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Unit tests for the detection of the untracked files."""
+
+import os
+from pathlib import Path
+import time
+
+from dulwich.repo import Repo
+
+from ansys.scade.git.extension.untracked import IgnoreCache, find_untracked
+from test_utils import run_git
+
+
+def create_repo(path: Path) -> Repo:
+    """Create a repository with a tracked file and an ignored directory."""
+    run_git('init', '-b', 'main', str(path))
+    (path / '.gitignore').write_text('generated/\n')
+    (path / 'Model.etp').write_text('project\n')
+    run_git('add', str(path), dir=path)
+    run_git('commit', '-m', 'initial', dir=path)
+    return Repo(str(path))
+
+
+def write_file(path: Path, text: str = 'content\n'):
+    """Create a file and its parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_find_untracked(tmp_path: Path):
+    repo = create_repo(tmp_path)
+    write_file(tmp_path / 'Model' / 'New.xscade')
+    write_file(tmp_path / 'Other' / 'New.txt')
+    write_file(tmp_path / 'generated' / 'code' / 'root.c')
+    # nested repository
+    run_git('init', '-b', 'main', str(tmp_path / 'Nested'))
+    write_file(tmp_path / 'Nested' / 'file.txt')
+    index = repo.open_index()
+    ignores = IgnoreCache(repo)
+    assert sorted(find_untracked(repo.path, index, ignores)) == [
+        'Model/New.xscade',
+        'Other/New.txt',
+    ]
+    assert find_untracked(repo.path, index, ignores, ['Model']) == ['Model/New.xscade']
+    assert find_untracked(repo.path, index, ignores, []) == []
+    # the ignored directories are not walked
+    assert os.path.join(repo.path, 'generated', '.gitignore') not in ignores.signatures
+    assert os.path.join(repo.path, 'Model', '.gitignore') in ignores.signatures
+
+
+def test_ignore_cache_validate(tmp_path: Path):
+    repo = create_repo(tmp_path)
+    write_file(tmp_path / 'Model' / 'Model.log')
+    index = repo.open_index()
+    ignores = IgnoreCache(repo)
+    ignores.validate()
+    manager = ignores.manager
+    assert find_untracked(repo.path, index, ignores) == ['Model/Model.log']
+    # the rules are compiled once
+    ignores.validate()
+    assert ignores.manager is manager
+    # new ignore file in a sub-directory
+    gitignore = tmp_path / 'Model' / '.gitignore'
+    write_file(gitignore, '*.log\n')
+    ignores.validate()
+    assert ignores.manager is not manager
+    assert find_untracked(repo.path, index, ignores) == ['Model/.gitignore']
+    # modified ignore file
+    manager = ignores.manager
+    write_file(gitignore, '*.txt\n')
+    mtime = time.time() + 10
+    os.utime(gitignore, (mtime, mtime))
+    ignores.validate()
+    assert ignores.manager is not manager
+    assert sorted(find_untracked(repo.path, index, ignores)) == [
+        'Model/.gitignore',
+        'Model/Model.log',
+    ]
@@ -0,0 +1,154 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for watcher.py."""
+
+from pathlib import Path
+import threading
+
+import pytest
+
+import ansys.scade.git.extension.watcher as watcher_module
+from ansys.scade.git.extension.watcher import (
+    NOTIFY_HEADER,
+    Debouncer,
+    InotifyWatcher,
+    PollingWatcher,
+    _get_libc,
+    create_watcher,
+    parse_notifications,
+)
+
+
+class Clock:
+    """Manual clock for the debouncer."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_debouncer():
+    clock = Clock()
+    debouncer = Debouncer(delay=0.5, min_interval=2.0, max_paths=3, max_delay=5.0, clock=clock)
+    assert debouncer.pop() is None
+    # a burst of changes is notified once settled down
+    debouncer.add({'a'})
+    clock.now += 0.2
+    debouncer.add({'b'})
+    clock.now += 0.2
+    assert debouncer.pop() is None
+    clock.now += 0.5
+    assert debouncer.pop() == ({'a', 'b'}, False)
+    assert debouncer.pop() is None
+    # rate limit
+    debouncer.add({'c'})
+    clock.now += 0.6
+    assert debouncer.pop() is None
+    clock.now += 1.5
+    assert debouncer.pop() == ({'c'}, False)
+    # too many files: all the files are considered changed
+    debouncer.add({'a', 'b', 'c', 'd'})
+    clock.now += 3.0
+    assert debouncer.pop() == (None, False)
+    # the files are kept when a Git file changes
+    debouncer.add({'a'})
+    debouncer.add(set(), True)
+    clock.now += 3.0
+    assert debouncer.pop() == ({'a'}, True)
+    # continuous changes are notified after the maximum delay
+    for _ in range(20):
+        clock.now += 0.4
+        debouncer.add({'a'})
+        changes = debouncer.pop()
+        if changes:
+            break
+    assert changes == ({'a'}, False)
+    assert debouncer.first_event is None
+
+
+def test_polling_watcher(tmp_path: Path):
+    model = tmp_path / 'Model.xscade'
+    model.write_text('model')
+    ann = tmp_path / 'Model.ann'
+    index = tmp_path / 'index'
+    index.write_text('index')
+    watcher = PollingWatcher(lambda paths, full: None)
+    watcher.watch([str(model), str(ann)], [str(index)])
+    assert watcher.check() is None
+    # modification and creation
+    model.write_text('modified model')
+    ann.write_text('ann')
+    assert watcher.check() == ({str(model), str(ann)}, False)
+    assert watcher.check() is None
+    # Git file
+    index.unlink()
+    assert watcher.check() == (set(), True)
+
+
+@pytest.mark.skipif(_get_libc() is None, reason='inotify not available')
+def test_inotify_watcher(tmp_path: Path):
+    notified = threading.Event()
+    changes = []
+
+    def callback(paths, full):
+        changes.append((paths, full))
+        notified.set()
+
+    model = tmp_path / 'Model.xscade'
+    model.write_text('model')
+    other = tmp_path / 'Other.txt'
+    watcher = InotifyWatcher(callback, Debouncer(delay=0.1, min_interval=0.1))
+    watcher.watch([str(model)], [str(tmp_path / 'git' / 'index')])
+    watcher.start()
+    try:
+        # files not watched
+        other.write_text('other')
+        model.write_text('modified model')
+        assert notified.wait(5)
+    finally:
+        watcher.stop()
+    assert changes == [({str(model)}, False)]
+
+
+def test_parse_notifications():
+    data = b''
+    for index, name in enumerate(['Model.xscade', 'index']):
+        encoded = name.encode('utf-16-le')
+        # entries aligned on 4 bytes
+        size = (NOTIFY_HEADER.size + len(encoded) + 3) // 4 * 4
+        entry = NOTIFY_HEADER.pack(size if index == 0 else 0, 3, len(encoded)) + encoded
+        data += entry.ljust(size, b'\0')
+    assert parse_notifications(data) == ['Model.xscade', 'index']
+    assert parse_notifications(b'') == []
+
+
+def test_create_watcher_polling(monkeypatch):
+    # no notification mechanism available
+    monkeypatch.setattr(watcher_module, '_get_libc', lambda: None)
+    monkeypatch.setattr(watcher_module, '_get_kernel32', lambda: None)
+    watcher = create_watcher(lambda paths, full: None, interval=30.0)
+    assert isinstance(watcher, PollingWatcher)
+    assert watcher.interval == 30.0
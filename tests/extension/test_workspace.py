@@ -0,0 +1,191 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Unit tests for workspace.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ansys.scade.git.extension.workspace import (
+    MARKER_FILE_NAME,
+    WorkspaceCache,
+    get_file_refs,
+    get_project_tree_paths,
+    read_marker,
+)
+from test_utils import get_resources_dir as get_tests_dir, run_git
+
+
+def get_resources_dir() -> Path:
+    """Return the resources directory for these tests."""
+    return get_tests_dir() / 'extension' / 'resources'
+
+
+def test_get_project_tree_paths():
+    data = (get_resources_dir() / 'Model' / 'Model.etp').read_bytes()
+    paths = get_project_tree_paths('Model/Model.etp', get_file_refs(data))
+    assert paths == {
+        'Model/Model.etp',
+        'Model/Child/Child.xscade',
+        'Model/Child/Child.ann',
+        'Model/Root.xscade',
+        'Model/Root.ann',
+        'Model/P.xscade',
+        'Model/P.ann',
+        'Model/Model.l4',
+        'Sibling/Macros.h',
+        'Model/removed_unstaged.txt',
+        'Model/removed_staged.txt',
+        'Model/modified_unstaged.txt',
+        'Model/modified_staged.txt',
+        'Model/commit.txt',
+        'Model/reset.txt',
+        'Model/untracked.txt',
+        'Model/new.txt',
+    }
+    # files outside of the repository
+    assert get_project_tree_paths('Model.etp', ['../a.txt', 'C:\\a.txt', '/a.txt']) == {'Model.etp'}
+
+
+def test_workspace_cache_path(tmp_path: Path):
+    cache = WorkspaceCache(tmp_path)
+    main = cache.get_path('main')
+    assert main.parent == tmp_path
+    assert main.name.startswith('main-')
+    # names which readable part is empty or conflicting
+    paths = {cache.get_path(_) for _ in ['main', '///', '..', '.blobs', 'a/b', 'ab', 'a b']}
+    assert len(paths) == 7
+    assert tmp_path not in paths
+    assert cache.blob_store.directory not in paths
+    assert all(_.parent == tmp_path for _ in paths)
+
+
+@pytest.mark.repo(get_resources_dir())
+def test_materialize_project(git_repo, tmp_path: Path):
+    tmp_dir, client = git_repo
+    # modifications on another branch are not considered
+    run_git('checkout', '-b', 'other', dir=tmp_dir)
+    (tmp_dir / 'Model' / 'Root.xscade').write_text('modified')
+    run_git('commit', '-a', '-m', 'other', dir=tmp_dir)
+    assert client.refresh(str(tmp_dir / 'Model' / 'Model.etp'))
+    target = tmp_path / 'main'
+    project = client.materialize_project('main', str(tmp_dir / 'Model' / 'Model.etp'), str(target))
+    assert project == str(target / 'Model' / 'Model.etp')
+    files = {_.relative_to(target).as_posix() for _ in target.rglob('*') if _.is_file()}
+    assert files == {
+        MARKER_FILE_NAME,
+        'Model/Model.etp',
+        'Model/Child/Child.xscade',
+        'Model/Root.xscade',
+        'Model/P.xscade',
+        'Model/P.ann',
+        'Model/Model.l4',
+        'Sibling/Macros.h',
+        'Model/removed_unstaged.txt',
+        'Model/removed_staged.txt',
+        'Model/modified_unstaged.txt',
+        'Model/modified_staged.txt',
+        'Model/commit.txt',
+        'Model/reset.txt',
+    }
+    expected = (get_resources_dir() / 'Model' / 'Root.xscade').read_bytes()
+    assert (target / 'Model' / 'Root.xscade').read_bytes() == expected
+    # unknown branch
+    assert client.materialize_project('unknown', 'Model/Model.etp', str(tmp_path / 'x')) == ''
+
+
+@pytest.mark.repo(get_resources_dir())
+def test_workspace_cache(git_repo, tmp_path: Path):
+    tmp_dir, client = git_repo
+    project = str(tmp_dir / 'Model' / 'Model.etp')
+    assert client.refresh(project)
+    cache = WorkspaceCache(tmp_path / 'cache')
+    main = cache.get_path('main')
+    assert client.materialize_project('main', project, str(main), cache)
+    root = main / 'Model' / 'Root.xscade'
+    p = main / 'Model' / 'P.xscade'
+    # the files are linked to the blob store
+    assert root.stat().st_nlink == 2
+    inode = p.stat().st_ino
+
+    # the branch advances: only the modified files are written
+    run_git('branch', 'previous', 'main', dir=tmp_dir)
+    (tmp_dir / 'Model' / 'Root.xscade').write_text('modified')
+    run_git('rm', str(tmp_dir / 'Model' / 'Model.l4'), dir=tmp_dir)
+    run_git('commit', '-a', '-m', 'modified', dir=tmp_dir)
+    assert client.materialize_project('main', project, str(main), cache)
+    assert root.read_text() == 'modified'
+    assert not (main / 'Model' / 'Model.l4').exists()
+    assert p.stat().st_ino == inode
+    marker = read_marker(main)
+    assert marker is not None
+    assert 'Model/Model.l4' not in marker['files']
+
+    # a modified working copy is repaired
+    root.unlink()
+    assert client.materialize_project('main', project, str(main), cache)
+    assert root.read_text() == 'modified'
+
+    # eviction of the least recently used working copies
+    other = cache.get_path('other')
+    assert client.materialize_project('previous', project, str(other), cache)
+    assert (other / 'Model' / 'Model.l4').exists()
+    cache.max_size = 0
+    cache.evict(keep=other)
+    assert not main.exists()
+    assert other.exists()
+    # the blobs of the evicted working copies are removed
+    assert all(_.stat().st_nlink >= 2 for _ in cache.blob_store.directory.glob('*/*'))
+
+
+@pytest.mark.repo(get_resources_dir())
+def test_workspace_cache_no_hard_links(git_repo, tmp_path: Path, monkeypatch):
+    tmp_dir, client = git_repo
+    project = str(tmp_dir / 'Model' / 'Model.etp')
+    assert client.refresh(project)
+
+    def link(src, dst):
+        raise OSError('hard links not supported')
+
+    monkeypatch.setattr(os, 'link', link)
+    cache = WorkspaceCache(tmp_path / 'cache')
+    main = cache.get_path('main')
+    assert client.materialize_project('main', project, str(main), cache)
+    root = main / 'Model' / 'Root.xscade'
+    expected = (get_resources_dir() / 'Model' / 'Root.xscade').read_bytes()
+    # the files are written without the store
+    assert cache.blob_store.hard_links is False
+    assert root.read_bytes() == expected
+    assert root.stat().st_nlink == 1
+
+    run_git('branch', 'previous', 'main', dir=tmp_dir)
+    other = cache.get_path('other')
+    assert client.materialize_project('previous', project, str(other), cache)
+    # the working copy in use is preserved while its size exceeds the limit
+    cache.max_size = 0
+    cache.evict(keep=other)
+    assert not main.exists()
+    assert (other / 'Model' / 'Root.xscade').read_bytes() == expected
+    assert not list(cache.blob_store.directory.glob('*/*'))